@@ -0,0 +1,47 @@
+"""Serial session captures: written by the controller when
+serial.capture_file is set, read back by replay.py and thermalid.py."""
+import json
+import re
+import threading
+
+LOG_LINE = re.compile(r"^Raw serial data: '(.*)'$")
+
+
+def load_session(path, line_interval=0.5):
+    """Return [(t, kind, value)] sorted by time; kind is rx, tx, state, job, order or stop."""
+    events = []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        lines = [line.rstrip("\n") for line in f if line.strip()]
+    if lines and lines[0].startswith("{"):
+        for line in lines:
+            record = json.loads(line)
+            t = record.pop("t")
+            for kind, value in record.items():
+                events.append((t, kind, value))
+    else:
+        for line in lines:
+            match = LOG_LINE.match(line)
+            if match:
+                events.append((len(events) * line_interval, "rx", match.group(1)))
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+class SessionCapture:
+    """Timestamped JSON-lines record of serial traffic and controller state,
+    the richer input format for replay.py."""
+
+    def __init__(self, path, clock):
+        self.file = open(path, "a")
+        self.clock = clock
+        self.start = clock.now()
+        self.lock = threading.Lock()
+
+    def write(self, kind, value, now=None):
+        t = (now if now is not None else self.clock.now()) - self.start
+        with self.lock:
+            self.file.write(json.dumps({"t": round(t, 3), kind: value}) + "\n")
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+
+class CookCheckpoint:
+    """State of the running cook in a small JSON file, so a restart after a
+    crash knows what is still in the oil.
+
+    save() replaces the file atomically (temp file, fsync, rename) and is
+    used on every phase change. heartbeat() rewrites it at most once per
+    interval without the fsync, to keep the remaining time fresh cheaply.
+    """
+
+    def __init__(self, path, clock, heartbeat_interval=5.0):
+        self.path = path
+        self.clock = clock
+        self.heartbeat_interval = heartbeat_interval
+        self.state = None
+        self.last_write = float("-inf")
+
+    def _write(self, sync):
+        self.state["updated_at"] = self.clock.wall()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        if sync:
+            directory = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        self.last_write = self.clock.now()
+
+    def save(self, **state):
+        self.state = state
+        try:
+            self._write(sync=True)
+        except OSError as e:
+            log.error("Failed to write cook checkpoint: %s", e)
+
+    def heartbeat(self, **changes):
+        if self.state is None or self.clock.now() - self.last_write < self.heartbeat_interval:
+            return
+        self.state.update(changes)
+        try:
+            self._write(sync=False)
+        except OSError as e:
+            log.error("Failed to write cook checkpoint heartbeat: %s", e)
+
+    def clear(self):
+        self.state = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.error("Failed to clear cook checkpoint: %s", e)
+
+    def load(self):
+        """The checkpoint left by a previous run, or None."""
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warning("Ignoring unreadable cook checkpoint: %s", e)
+            return None
+        return state if isinstance(state, dict) and "schedule" in state else None
+
+
+def basket_checkpoint_path(path, basket):
+    """The configured file for the first basket, name.basketN.ext for the others."""
+    if basket == 0:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.basket{basket + 1}{ext}"
@@ -0,0 +1,269 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+def interval(period):
+    """Periods may be a number or a callable returning the next period."""
+    return period() if callable(period) else period
+
+
+def next_deadline(deadline, period, now):
+    """Advance an absolute deadline by one period, skipping any ticks already missed."""
+    deadline += period
+    if deadline <= now:
+        deadline += ((now - deadline) // period + 1) * period
+    return deadline
+
+
+class MonotonicClock:
+    """Production clock: monotonic time for durations, wall time for records."""
+
+    def now(self):
+        return time.monotonic()
+
+    def wall(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, event, timeout):
+        return event.wait(timeout)
+
+    def spawn(self, target, *args, name=None):
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        return thread
+
+
+class TkScheduler:
+    """Periodic callbacks on the Tk event loop, scheduled on absolute deadlines
+    so the period doesn't stretch by however long each callback takes."""
+
+    def __init__(self, root, clock):
+        self.root = root
+        self.clock = clock
+        self.jobs = {}
+        self.ids = itertools.count()
+
+    def call_every(self, period, fn):
+        job = next(self.ids)
+        deadline = self.clock.now() + interval(period)
+
+        def run():
+            nonlocal deadline
+            try:
+                fn()
+            except Exception:
+                log.exception("Scheduled task failed")
+            finally:
+                # A failing callback must not end the loop (taskbar, menu watch, memory samples).
+                now = self.clock.now()
+                deadline = next_deadline(deadline, interval(period), now)
+                if job in self.jobs:
+                    self.jobs[job] = self.root.after(max(0, int((deadline - now) * 1000)), run)
+
+        self.jobs[job] = self.root.after(int(interval(period) * 1000), run)
+        return job
+
+    def cancel(self, job):
+        after_id = self.jobs.pop(job, None)
+        if after_id:
+            self.root.after_cancel(after_id)
+
+
+class ThreadScheduler:
+    """Same deadline scheduling on a background thread, for headless use."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.queue = []
+        self.cond = threading.Condition()
+        self.ids = itertools.count()
+        self.cancelled = set()
+        self.running = False
+        self.thread = None
+
+    def call_every(self, period, fn):
+        job = next(self.ids)
+        with self.cond:
+            heapq.heappush(self.queue, (self.clock.now() + interval(period), job, period, fn))
+            self.cond.notify()
+        return job
+
+    def cancel(self, job):
+        with self.cond:
+            self.cancelled.add(job)
+
+    def start(self):
+        self.running = True
+        self.thread = self.clock.spawn(self._run, name="scheduler")
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running and (not self.queue or self.queue[0][0] > self.clock.now()):
+                    timeout = self.queue[0][0] - self.clock.now() if self.queue else None
+                    self.cond.wait(timeout)
+                if not self.running:
+                    return
+                deadline, job, period, fn = heapq.heappop(self.queue)
+                if job in self.cancelled:
+                    self.cancelled.discard(job)
+                    continue
+            try:
+                fn()
+            except Exception:
+                log.exception("Scheduled task failed")
+            with self.cond:
+                heapq.heappush(self.queue, (next_deadline(deadline, interval(period), self.clock.now()), job, period, fn))
+
+
+class VirtualWorker:
+    """A spawned target on a thread of its own that only runs while the
+    clock has handed it control, so workers still take turns with the
+    scheduler and with each other, one at a time and in a fixed order."""
+
+    def __init__(self, clock, target, args, name):
+        self.clock = clock
+        self.go = threading.Event()
+        self.parked = threading.Event()
+        self.generation = 0
+        self.thread = threading.Thread(target=self._run, args=(target, args), name=name, daemon=True)
+
+    def _run(self, target, args):
+        self.go.wait()
+        self.go.clear()
+        try:
+            target(*args)
+        finally:
+            self.clock.waiters.pop(self, None)
+            self.clock.workers.pop(self.thread, None)
+            self.generation = None
+            self.parked.set()
+
+    def resume(self, generation=0):
+        """Run the worker until it sleeps again or ends; stale wake-ups are ignored."""
+        if generation != self.generation:
+            return
+        self.generation += 1
+        self.parked.clear()
+        if self.thread.ident is None:
+            self.thread.start()
+        self.go.set()
+        self.parked.wait()
+
+    def park(self, until):
+        """Give control back until virtual time until (or an earlier wake)."""
+        self.clock.call_at(until, lambda generation=self.generation: self.resume(generation))
+        self.parked.set()
+        self.go.wait()
+        self.go.clear()
+
+
+class VirtualClock:
+    """Clock and scheduler in one, where time only moves when advanced.
+
+    sleep() and run_until() advance virtual time, running every callback
+    that falls due on the way. Spawned targets run as VirtualWorkers: their
+    sleep() and wait() park the worker until it is due again, so several
+    workers (one per basket) and the periodic control tick interleave as
+    they would in real time, yet only one of them runs at any moment. With
+    pace set, advancing also sleeps for real (pace=1 is real time, pace=10
+    is 10x).
+    """
+
+    def __init__(self, start=0.0, wall_start=None, pace=0.0):
+        self.t = start
+        self.wall_offset = (time.time() if wall_start is None else wall_start) - start
+        self.pace = pace
+        self.queue = []
+        self.ids = itertools.count()
+        self.cancelled = set()
+        self.workers = {}
+        self.waiters = {}
+
+    def now(self):
+        return self.t
+
+    def wall(self):
+        return self.t + self.wall_offset
+
+    def _advance(self, t):
+        if t > self.t:
+            if self.pace:
+                time.sleep((t - self.t) / self.pace)
+            self.t = t
+
+    def call_at(self, deadline, fn, period=None):
+        job = next(self.ids)
+        heapq.heappush(self.queue, (deadline, job, period, fn))
+        return job
+
+    def call_every(self, period, fn):
+        return self.call_at(self.t + interval(period), fn, period)
+
+    def cancel(self, job):
+        self.cancelled.add(job)
+
+    def run_until(self, t):
+        while self.queue and self.queue[0][0] <= t:
+            deadline, job, period, fn = heapq.heappop(self.queue)
+            if job in self.cancelled:
+                self.cancelled.discard(job)
+                continue
+            self._advance(deadline)
+            fn()
+            self._wake_waiters()
+            # Reschedule after the callback, so the next period reflects any
+            # change it made and a callback that sleeps never re-enters itself.
+            if period is not None:
+                heapq.heappush(self.queue, (next_deadline(deadline, interval(period), self.t), job, period, fn))
+        self._advance(t)
+
+    def _wake_waiters(self):
+        for worker, event in list(self.waiters.items()):
+            if event.is_set():
+                del self.waiters[worker]
+                self.call_at(self.t, lambda worker=worker, generation=worker.generation: worker.resume(generation))
+
+    def sleep(self, seconds):
+        worker = self.workers.get(threading.current_thread())
+        if worker:
+            worker.park(self.t + max(seconds, 0))
+            return
+        self.run_until(self.t + max(seconds, 0))
+
+    def wait(self, event, timeout):
+        end = self.t + (timeout if timeout is not None else 0)
+        worker = self.workers.get(threading.current_thread())
+        if worker:
+            if not event.is_set() and self.t < end:
+                self.waiters[worker] = event
+                worker.park(end)
+                self.waiters.pop(worker, None)
+            return event.is_set()
+        # Nothing else can set the event while this thread holds virtual time,
+        # except callbacks that run while we advance.
+        while not event.is_set() and self.t < end:
+            due = self.queue[0][0] if self.queue else end
+            self.run_until(min(due, end))
+        return event.is_set()
+
+    def spawn(self, target, *args, name=None):
+        """Start target as a VirtualWorker at the current virtual time."""
+        worker = VirtualWorker(self, target, args, name)
+        self.workers[worker.thread] = worker
+        self.call_at(self.t, worker.resume)
+        return worker.thread
@@ -0,0 +1,189 @@
+import copy
+import json
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+CONFIG_FILE = "fryer_config.json"
+
+DEFAULT_CONFIG = {
+    "serial": {
+        "port": "/dev/serial0",
+        "baudrate": 9600,
+        "initial_backoff": 0.5,
+        "max_backoff": 8.0,
+        "poll_interval": 0.5,
+        "settle_time": 2.0,
+        "stale_timeout": 5.0,
+        "command_delay": 0.1,  # pause after each command write
+        "log_file": "serial_log.txt",
+        "capture_file": "",  # timestamped JSON-lines session capture for replay.py
+        "driver": "text",  # firmware dialect: "text", "numeric" or "auto" (handshake at connect)
+        "fallback_driver": "text",  # used by "auto" until (or unless) the handshake answers
+        "handshake_timeout": 1.0,
+        "estop_log": "estop_latency.csv",  # wall time, press-to-wire ms, sent
+    },
+    "logging": {
+        "level": "INFO",  # DEBUG adds every serial line, parsed reading and command; switchable in the admin panel
+        "file": "",  # empty for stdout (journald)
+        "format": "%(asctime)s %(levelname)s %(name)s: %(message)s",
+        "repeat_window": 10.0,  # seconds an identical message is held back after it was logged
+        "queue_size": 10000,  # records waiting for the writer thread; more are dropped
+    },
+    "sensors": {
+        "filter": "median",  # "median", "kalman" or "none"
+        "median_window": 5,
+        "kalman_process_variance": 0.05,
+        "kalman_measurement_variance": 1.0,
+        "probe_order": ["oil", "element", "ambient"],
+        "labels": {
+            "OIL": "oil", "T1": "oil",
+            "ELEM": "element", "ELEMENT": "element", "T2": "element",
+            "AMB": "ambient", "AMBIENT": "ambient", "T3": "ambient",
+        },
+        "valid_range": [0, 300],
+        "max_step": {"oil": 15.0, "element": 40.0, "ambient": 10.0},
+        "max_rejections": 3,
+    },
+    "heaters": {
+        "elements": {"H1": 1500, "H2": 1500},  # element -> watts
+        "peak_budget_watts": 3000,  # shared by every fryer on the same feed
+        "feed": "default",
+        "shared_budget_file": "",  # set to coordinate the budget across processes
+        "lease_ttl": 5.0,
+        "period": 10.0,  # rotation period when elements have to take turns
+        "proportional_band": 2.0,
+        "refresh_interval": 5.0,
+    },
+    "baskets": {
+        "count": 2,  # baskets sharing the vat's oil and setpoint, each with its own cook
+        "setpoint_tolerance": 5,  # °C a new cook may differ from the running one to share the vat
+        "double_tap": 3.0,  # seconds in which a repeated Start of the same item joins its cook
+        "drop_feedforward": 0.5,  # extra heater demand, below setpoint, for drop_window after a basket drops next to another
+    },
+    "history": {
+        "dir": "cook_history",
+        "compact_after": 64,  # merge chunk files once there are more than this
+    },
+    "eco": {
+        "enabled": True,
+        "standby_after": 300,  # seconds idle after a cook before holding standby_temp
+        "standby_temp": 150,
+        "standby_power": 0.5,  # share of element power used to hold standby
+        "off_after": 2700,  # seconds idle before the heaters go off altogether
+        "boost_time": 180,  # seconds an order being entered keeps the boost going without a Start
+        # Per-category overrides of the settings above, e.g. {"NON-VEG": {"standby_temp": 165}}
+        "categories": {},
+    },
+    "forecast": {
+        "file": "preheat_schedule.json",  # written by forecast.py; empty disables
+        "weeks": 8,  # history the forecast learns from
+        "slot_minutes": 15,
+        "preheat_orders": 2.0,  # expected orders in a slot to have the oil at setpoint
+        "standby_orders": 0.5,  # expected orders in a slot to hold standby
+        "lead": 900,  # seconds to start ahead of a window without a thermal model
+        "lead_margin": 120,
+    },
+    "thermal_model": {
+        "file": "thermal_model.json",  # per-unit fit written by thermalid.py; empty disables
+        "resample": 1.0,  # seconds between samples for the fit
+        "max_dead_time": 30.0,
+    },
+    "conformance": {
+        "dir": "golden_curves",  # per-item curves of past cooks, aligned at basket drop
+        "keep": 100,  # cooks per item the golden curve is built from
+        "learn": True,  # add completed cooks to the golden curves; off for replays
+        "min_cooks": 5,  # no alerts for an item until it has this many
+        "max_length": 600,  # seconds of each cook kept
+        "sigmas": 3.0,  # robust spreads below the golden curve that count as abnormal
+        "drop_window": 60,
+        "drop_margin": 8.0,  # °C below the usual dip
+        "recovery_band": 3.0,  # the usual cook counts as recovered within this of setpoint
+        "recovery_margin": 5.0,
+        "recovery_hold": 30,
+        "rate_window": 20,  # seconds over which heating rates are compared
+        "min_rise": 2.0,  # °C the usual cook rises in rate_window before rates are compared
+        "min_rate_ratio": 0.5,
+    },
+    "cook_timing": {
+        "mode": "clock",  # "clock" or "dose" (thermal dose above reference_temp)
+        "reference_temp": 100.0,
+        "max_stretch": 1.5,
+    },
+    "telemetry": {
+        "url": "",  # collector endpoint, e.g. http://fleet.example:8750/ingest; empty disables
+        "site": "",
+        "fryer": "",  # defaults to the hostname
+        "spool_dir": "telemetry_spool",
+        "spool_max_bytes": 5000000,
+        "backpressure_fill": 0.8,  # above this spool fill, metrics are dropped at the source
+        "batch_size": 500,
+        "flush_interval": 60.0,
+        "metrics_interval": 30.0,
+        "timeout": 10.0,
+        "initial_backoff": 5.0,
+        "max_backoff": 300.0,
+    },
+    "menu": {
+        "file": "menu_data.json",
+        "watch": "auto",  # "auto"/"inotify" (polling where inotify is missing) or "poll"
+        "watch_interval": 1.0,  # seconds between checks for a changed menu file
+        "swipe_threshold": 12,  # pixels a press must travel before it scrolls (resistive touch jitter)
+        "frame_rate": 30,  # inertia animation frames per second
+        "swipe_decay": 0.05,  # fraction of fling speed left after one second
+        "min_fling_speed": 200,  # pixels/second; slower releases just stop
+    },
+    "memory": {
+        "interval": 300,  # seconds between memory samples
+        "history": 2016,  # samples kept for the trend (a week at the default interval)
+        "rss_budget_mb": 350,  # over this the image cache is dropped
+        "image_budget_mb": 40,
+        "tracemalloc_frames": 1,
+    },
+    "process": {
+        "mode": "process",  # "process": controller in its own process; "thread": inside the GUI
+        "ui_poll_interval": 0.25,  # how often the GUI reads the shared state
+        "stale_after": 3.0,  # seconds without a controller heartbeat before the taskbar warns
+    },
+    "checkpoint": {
+        "file": "cook_checkpoint.json",  # empty to disable crash recovery
+        "heartbeat_interval": 5.0,
+        "max_resume_gap": 60.0,  # seconds; a cook down for longer is finished safely instead
+    },
+    "control": {
+        # Control loop period in seconds for each process phase.
+        "rates": {"idle": 2.0, "heating": 1.0, "approach": 0.25, "drop": 0.25, "stable": 1.0},
+        "approach_band": 5.0,  # within this many °C of setpoint counts as a crossing
+        "stable_band": 2.0,
+        "stable_hold": 30.0,  # seconds inside stable_band before slowing down
+        "drop_window": 60.0,  # seconds after basket drop to keep the fast rate
+        # Sent when the phase changes so the firmware samples at the loop rate,
+        # e.g. "SAMPLE_MS {ms}". Empty for firmware without a rate command.
+        "sample_command": "",
+        # Commands for baskets after the first, as {"lowered": ..., "raised": ...}
+        # templates with {n} for the basket number. Empty for the driver's own.
+        "extra_basket_commands": {},
+    },
+}
+
+
+def merge_config(defaults, overrides):
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_config(path=CONFIG_FILE):
+    """Load fryer_config.json on top of DEFAULT_CONFIG."""
+    try:
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return merge_config(DEFAULT_CONFIG, json.load(f))
+    except Exception as e:
+        log.warning("Failed to load %s, using the defaults: %s", path, e)
+    return copy.deepcopy(DEFAULT_CONFIG)
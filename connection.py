@@ -0,0 +1,158 @@
+import logging
+import os
+import threading
+
+import serial
+
+from clock import MonotonicClock
+from logs import fields
+
+log = logging.getLogger(__name__)
+
+
+class SerialSupervisor:
+    """Owns the serial link and keeps it up from a background thread.
+
+    Link loss is reported by the reader/writer through mark_lost(), noticed
+    when the device node disappears (USB unplug), or inferred when no bytes
+    arrive for stale_timeout seconds. Reconnects back off exponentially, and
+    a missing device node is polled so a re-plugged adapter is picked up as
+    soon as it reappears. Receive and restore times are on clock.
+    """
+
+    def __init__(self, port, baudrate, config, lock=None, on_connect=None, on_disconnect=None, clock=None):
+        self.port = port
+        self.clock = clock or MonotonicClock()
+        self.baudrate = baudrate
+        self.initial_backoff = config.get("initial_backoff", 0.5)
+        self.max_backoff = config.get("max_backoff", 8.0)
+        self.poll_interval = config.get("poll_interval", 0.5)
+        self.settle_time = config.get("settle_time", 2.0)
+        self.stale_timeout = config.get("stale_timeout", 5.0)
+        self.lock = lock or threading.RLock()
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+
+        self.ser = None
+        self.connected = False
+        self.ever_connected = False
+        self.disconnects = 0
+        self.last_error = None
+        self.last_rx = 0.0
+        self.restored_at = 0.0
+        self._lost = threading.Event()
+        self._stop = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="serial-supervisor", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+
+    def mark_lost(self, reason):
+        self.last_error = reason
+        self._lost.set()
+
+    def note_rx(self):
+        self.last_rx = self.clock.now()
+
+    def _port_present(self):
+        # Only device nodes can be hot-plugged; URLs like loop:// always "exist".
+        return not self.port.startswith("/dev/") or os.path.exists(self.port)
+
+    def _open(self):
+        ser = serial.serial_for_url(self.port, self.baudrate, timeout=0, write_timeout=1)
+        # Opening the port resets the Arduino; give it time to boot before use.
+        if self._stop.wait(self.settle_time):
+            ser.close()
+            return None
+        ser.reset_input_buffer()
+        return ser
+
+    def _drop(self, reason):
+        with self.lock:
+            old, self.ser = self.ser, None
+            self.connected = False
+        try:
+            if old:
+                old.close()
+        except serial.SerialException:
+            pass
+        self.disconnects += 1
+        self.last_error = reason
+        log.error("Serial link lost (%s); reconnecting", reason)
+        if self.on_disconnect:
+            self.on_disconnect(reason)
+
+    def _run(self):
+        backoff = self.initial_backoff
+        while not self._stop.is_set():
+            if self.connected:
+                reason = None
+                if self._lost.is_set():
+                    reason = self.last_error or "I/O error"
+                elif not self._port_present():
+                    reason = f"{self.port} removed"
+                elif self.clock.now() - self.last_rx > self.stale_timeout:
+                    reason = f"no data for {self.stale_timeout:.0f}s"
+                if reason is None:
+                    self._stop.wait(self.poll_interval)
+                    continue
+                self._drop(reason)
+                backoff = self.initial_backoff
+
+            if not self._port_present():
+                self._stop.wait(self.poll_interval)
+                continue
+
+            try:
+                ser = self._open()
+            except serial.SerialException as e:
+                self.last_error = str(e)
+                log.warning("Failed to connect to serial port %s: %s", self.port, e, extra=fields(retry_in=round(backoff, 1)))
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            if ser is None:
+                break
+
+            with self.lock:
+                self.ser = ser
+                self.connected = True
+            self._lost.clear()
+            self.last_rx = self.clock.now()
+            backoff = self.initial_backoff
+            log.info("Connected to serial port %s", self.port)
+            if self.ever_connected:
+                self.restored_at = self.clock.now()
+            self.ever_connected = True
+            if self.on_connect:
+                self.on_connect(ser)
+
+
+class StaticLink:
+    """Supervisor stand-in for a fixed transport (replay, tests of the control loop)."""
+
+    def __init__(self, transport):
+        self.ser = transport
+        self.connected = True
+        self.ever_connected = True
+        self.disconnects = 0
+        self.restored_at = 0.0
+        self.last_error = None
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def mark_lost(self, reason):
+        self.last_error = reason
+
+    def note_rx(self):
+        pass
@@ -0,0 +1,792 @@
+import logging
+import threading
+
+import serial
+
+from captures import SessionCapture
+from clock import MonotonicClock
+from checkpoint import CookCheckpoint, basket_checkpoint_path
+from connection import SerialSupervisor, StaticLink
+from cooktime import ClockTimer, make_cook_timer
+from curves import ALERTS, ConformanceMonitor, GoldenCurves
+from drivers import detect_driver, make_driver
+from eco import IdlePolicy
+from forecast import PreheatSchedule
+from heaters import HeaterScheduler, make_power_budget, proportional_demand
+from history import CookHistoryStore, CookTracker
+from jobs import JobManager
+from logs import RAW_LOGGER, fields, set_level
+from recipes import Step, compile_stages
+from sensors import TemperatureIngest
+from telemetry import make_telemetry
+from thermalid import load_model
+
+log = logging.getLogger(__name__)
+raw_log = logging.getLogger(RAW_LOGGER)
+
+class Basket:
+    """One basket in the vat: where it is and the cook running in it.
+
+    Each basket has its own job lane, checkpoint, timer and status line;
+    the oil and its temperature control are shared by all of them.
+    """
+
+    def __init__(self, index, checkpoint=None):
+        self.index = index
+        self.lane = f"basket{index + 1}"
+        self.checkpoint = checkpoint
+        self.position = "raised"
+        self.active = False
+        self.item = None
+        self.setpoint = None  # of the step this basket's cook is in
+        self.frying_time = 0
+        self.dropped_at = None
+        self.tracker = None
+        self.conformance = None
+        self.shared_load = False  # another basket was in the oil during this cook
+        self.alert = None
+        self.status = ""
+        self.status_seq = 0
+
+    def view(self):
+        return {"item": self.item, "active": self.active, "position": self.position,
+                "setpoint": self.setpoint, "frying_time": self.frying_time,
+                "status": self.status, "status_seq": self.status_seq}
+
+
+class FryerController:
+    """Temperature control, actuation and the frying worker, without any UI.
+
+    SmartFryerGUI drives control_tick() from the Tk loop and shows
+    on_status messages; replay.py drives the same controller headless
+    through a stand-in transport.
+
+    All timing goes through self.clock: durations use its monotonic now(),
+    cook records its wall() time. Pass a VirtualClock to run cooks in
+    virtual time.
+
+    The vat has baskets.count baskets, each running its own cook on its
+    own job lane. They share one setpoint: a cook only starts next to
+    another if its temperature is within setpoint_tolerance, and the vat
+    holds the hottest setpoint any running basket asks for.
+    """
+
+    def __init__(self, config, transport=None, clock=None):
+        self.config = config
+        self.clock = clock or MonotonicClock()
+        self.current_temp = 25.0
+        self.frying_active = False
+        self.target_temperature = 180
+        self.temp_ingest = TemperatureIngest(config["sensors"])
+        self.probe_temps = {}
+        self.on_status = None
+
+        self.history = CookHistoryStore(config["history"]["dir"], config["history"]["compact_after"])
+        conformance = config["conformance"]
+        self.golden_curves = GoldenCurves(conformance["dir"], conformance["keep"], conformance["max_length"])
+
+        checkpoint_config = config["checkpoint"]
+        self.baskets = []
+        for index in range(config["baskets"]["count"]):
+            checkpoint = None
+            if checkpoint_config.get("file"):
+                checkpoint = CookCheckpoint(basket_checkpoint_path(checkpoint_config["file"], index), self.clock,
+                                            checkpoint_config["heartbeat_interval"])
+            self.baskets.append(Basket(index, checkpoint))
+        self.recovery = []
+
+        # Per-unit thermal model from thermalid.py, for preheat ETAs.
+        model_file = config["thermal_model"].get("file")
+        self.thermal_model = load_model(model_file) if model_file else None
+
+        self.telemetry = make_telemetry(config["telemetry"], self.clock)
+        self.last_metrics = float("-inf")
+
+        # Relay states
+        self.heating1_state = False
+        self.heating2_state = False
+        self.manual_heat = False
+        heater_config = config["heaters"]
+        self.heater_scheduler = HeaterScheduler(heater_config["elements"], make_power_budget(heater_config),
+                                                heater_config["period"])
+        self.last_heater_refresh = float("-inf")
+        # One frying worker per basket; a repeated Start joins the running cook.
+        self.jobs = JobManager(self.clock, on_finish=self.job_finished)
+        self.start_lock = threading.Lock()
+        forecast_file = config["forecast"].get("file")
+        self.idle_policy = IdlePolicy(config["eco"], PreheatSchedule(forecast_file, self.clock) if forecast_file else None,
+                                      self.preheat_lead)
+        self.order_category = None
+
+        # Emergency stop: bumping the generation preempts sends already in
+        # progress, and while latched only safe commands go out until reset().
+        self.stop_generation = 0
+        self.estopped = False
+        self.estop_latencies = []
+
+        # Process phase drives the control loop and firmware sampling rate.
+        self.phase = "idle"
+        self.stable_since = None
+        self.basket_dropped_at = None
+
+        serial_config = config["serial"]
+        self.capture = SessionCapture(serial_config["capture_file"], self.clock) if serial_config.get("capture_file") else None
+        self.captured_state = None
+
+        # Firmware dialect; "auto" starts on the fallback and probes at connect.
+        driver_name = serial_config.get("driver", "text")
+        self.detect = driver_name == "auto"
+        self.driver = make_driver(serial_config["fallback_driver"] if self.detect else driver_name,
+                                  self.send_serial_command, self.config["control"], len(self.baskets))
+
+        self.ser = None
+        self.serial_lock = threading.RLock()
+        if transport is not None:
+            self.ser = transport
+            self.supervisor = StaticLink(transport)
+        else:
+            self.supervisor = SerialSupervisor(serial_config["port"], serial_config["baudrate"], serial_config,
+                                               lock=self.serial_lock,
+                                               on_connect=self.on_serial_connect,
+                                               on_disconnect=self.on_serial_disconnect,
+                                               clock=self.clock)
+
+    def start(self):
+        self.recover()
+        self.supervisor.start()
+
+    def recover(self):
+        """Resume, or safely finish, the cooks left behind by a crash.
+
+        A cook interrupted for at most max_resume_gap seconds carries on from
+        the step it was in with the time it had left. Anything else gets its
+        basket up, and the heaters off unless another basket resumes; either
+        way the commands go out as soon as the link is up, via the driver's
+        restore on connect. Returns one entry per basket that had a cook.
+        """
+        found = [(basket, basket.checkpoint.load()) for basket in self.baskets if basket.checkpoint]
+        found = [(basket, state) for basket, state in found if state]
+        resumes, finishes = [], []
+        for basket, state in found:
+            step = state["schedule"][state["step"]]
+            gap = self.clock.wall() - state["updated_at"]
+            if Step(*step).action != "raise" and gap <= self.config["checkpoint"]["max_resume_gap"]:
+                resumes.append((basket, state, gap))
+            else:
+                finishes.append((basket, state, gap))
+        if finishes and not resumes:
+            self.driver.stop_commands()
+        for basket, state, gap in finishes:
+            log.warning("Finishing %s safely after a %.0fs outage", state["item"], gap,
+                        extra=fields(basket=basket.index + 1))
+            self.driver.state[("basket", basket.index)] = self.driver.basket_command("raised", basket.index)
+            basket.position = "raised"
+            tracker = CookTracker(state["item"], state["target"], state["frying_time"], now=state["started_at"])
+            self.record_cook(tracker.finish(aborted=True))
+            basket.checkpoint.clear()
+            self.recovery.append({"action": "finished", "item": state["item"], "gap": gap, "basket": basket.index})
+            self.alarm("crash_recovery", **self.recovery[-1])
+        if finishes and self.ser and self.ser.is_open:
+            self.driver.restore()
+        for basket, state, gap in resumes:
+            schedule = [Step(*step) for step in state["schedule"]]
+            index = state["step"]
+            step = schedule[index]
+            if step.action in ("fry", "heat", "rest"):
+                step = step._replace(duration=max(int(round(state["remaining"])), 0))
+            if state["basket"] == "lowered":
+                self.driver.state[("basket", basket.index)] = self.driver.basket_command("lowered", basket.index)
+                basket.position = "lowered"
+            log.warning("Resuming %s at step %d/%d after a %.0fs outage", state["item"], index + 1, len(schedule),
+                        gap, extra=fields(basket=basket.index + 1))
+            self.recovery.append({"action": "resumed", "item": state["item"], "gap": gap, "basket": basket.index})
+            self.alarm("crash_recovery", **self.recovery[-1])
+            self.start_frying(state["item"], state["target"], state["frying_time"], [step] + schedule[index + 1:],
+                              basket=basket.index)
+        return self.recovery
+
+    def save_checkpoint(self, basket, schedule, index):
+        if not basket.checkpoint:
+            return
+        basket.checkpoint.save(item=basket.item, schedule=[list(step) for step in schedule], step=index,
+                               remaining=schedule[index].duration, target=basket.setpoint,
+                               frying_time=basket.frying_time, basket=basket.position,
+                               started_at=basket.tracker.record["started_at"])
+
+    def on_serial_connect(self, ser):
+        self.ser = ser
+        if self.detect:
+            self.detect_driver(ser)
+        # Put the actuators back the way they were commanded before the drop.
+        self.driver.restore()
+
+    def detect_driver(self, ser):
+        with self.serial_lock:
+            name, received = detect_driver(ser, self.clock, self.config["serial"]["handshake_timeout"])
+        self.temp_ingest.feed(received)
+        if name is None:
+            log.warning("No driver answered the handshake, staying on '%s'", self.driver.name)
+        elif name != self.driver.name:
+            driver = make_driver(name, self.send_serial_command, self.config["control"], len(self.baskets))
+            driver.adopt(self.driver)
+            self.driver = driver
+            log.info("Detected firmware driver '%s'", name)
+        self.detect = False
+
+    def on_serial_disconnect(self, reason):
+        self.ser = None
+        self.alarm("link_lost", reason=reason)
+
+    def alarm(self, name, **data):
+        if self.telemetry:
+            self.telemetry.emit("alarm", dict(data, alarm=name))
+
+    def emit_metrics(self, now):
+        if not self.telemetry or now - self.last_metrics < self.config["telemetry"]["metrics_interval"]:
+            return
+        self.last_metrics = now
+        self.telemetry.emit("metrics", {
+            "temp": self.current_temp, "probes": self.probe_temps, "target": self.target_temperature,
+            "phase": self.phase, "frying": self.frying_active,
+            "baskets": [basket.position for basket in self.baskets],
+            "idle_mode": self.idle_policy.mode,
+            "heaters": {"H1": self.heating1_state, "H2": self.heating2_state},
+            "link_drops": self.supervisor.disconnects,
+        })
+
+    def update_status(self, message, basket):
+        basket.status = message
+        basket.status_seq += 1
+        if self.on_status:
+            self.on_status(message, basket.index)
+
+    def basket_states(self):
+        return [basket.view() for basket in self.baskets]
+
+    def control_tick(self, now=None):
+        """Read pending serial bytes, update the temperature and drive the heaters."""
+        now = self.clock.now() if now is None else now
+        try:
+            if self.ser and self.ser.is_open:
+                with self.serial_lock:
+                    waiting = self.ser.in_waiting
+                    data = self.ser.read(waiting) if waiting else b""
+                lines = self.temp_ingest.feed(data)
+                if data:
+                    self.supervisor.note_rx()
+                if lines:
+                    self.log_lines(lines, now)
+                    oil_temp = self.temp_ingest.value("oil")
+                    if oil_temp is not None:
+                        self.current_temp = oil_temp
+                        self.probe_temps = self.temp_ingest.values()
+                        log.debug("Parsed temp %.1f°C", self.current_temp)
+                else:
+                    log.debug("No serial data received")
+                self.capture_state(now)
+                self.update_phase(now)
+                self.control_heaters(now)
+                for basket in self.baskets:
+                    if basket.tracker:
+                        basket.tracker.sample(self.current_temp, self.target_temperature, now)
+                    if basket.conformance and not basket.shared_load:
+                        self.check_conformance(basket, now)
+                self.current_temp = min(max(self.current_temp, 20), 250)
+                self.emit_metrics(now)
+            elif not self.supervisor.ever_connected:
+                log.warning("Serial port not open, using fallback temperature")
+                self.current_temp += 0.1 if self.frying_active else -0.1
+                self.current_temp = min(max(self.current_temp, 20), 250)
+                self.update_phase(now)
+        except serial.SerialException as e:
+            log.error("Error reading serial: %s", e)
+            self.supervisor.mark_lost(str(e))
+        except Exception:
+            log.exception("Control tick failed")
+
+    def classify_phase(self, now):
+        control = self.config["control"]
+        # Positive below setpoint: oil above it (an overshoot, a lowered setpoint)
+        # is never "heating", it is approaching from above or already stable.
+        error = self.target_temperature - self.current_temp
+        active = self.frying_active or self.manual_heat
+        if not active or abs(error) > control["stable_band"]:
+            self.stable_since = None
+        elif self.stable_since is None:
+            self.stable_since = now
+        if not active:
+            return "idle"
+        if self.basket_dropped_at is not None and now - self.basket_dropped_at < control["drop_window"]:
+            return "drop"
+        if error > control["approach_band"]:
+            return "heating"
+        if self.stable_since is not None and now - self.stable_since >= control["stable_hold"]:
+            return "stable"
+        return "approach"
+
+    def update_phase(self, now):
+        phase = self.classify_phase(now)
+        if phase == self.phase:
+            return
+        log.info("Control phase %s -> %s", self.phase, phase)
+        self.phase = phase
+        self.driver.set_sample_period(self.control_period() * 1000)
+
+    def control_period(self):
+        """Seconds until the next control tick for the current phase."""
+        return self.config["control"]["rates"][self.phase]
+
+    def log_lines(self, lines, now):
+        for line, readings in lines:
+            raw_log.info("Raw serial data: '%s'", line)
+            log.debug("Raw serial data %r", line)
+            if not readings:
+                log.info("Failed to parse temperature from %r", line)
+            if self.capture:
+                self.capture.write("rx", line, now)
+
+    def capture_state(self, now):
+        if not self.capture:
+            return
+        state = {"frying_active": self.frying_active, "target": self.target_temperature}
+        if state != self.captured_state:
+            self.captured_state = state
+            self.capture.write("state", state, now)
+
+    def control_heaters(self, now=None):
+        now = self.clock.now() if now is None else now
+        heater_config = self.config["heaters"]
+        demand = 0.0
+        if self.frying_active or self.manual_heat:
+            self.idle_policy.busy(now, self.order_category)
+            demand = proportional_demand(self.target_temperature, self.current_temp,
+                                         heater_config["proportional_band"])
+            if demand > 0:
+                # Oil already at or above setpoint needs no help, whatever went in.
+                demand = min(demand + self.drop_feedforward(now), 1.0)
+        elif not self.estopped:
+            idle = self.idle_policy.plan(now, self.clock.wall())
+            if idle:
+                setpoint, max_demand = idle
+                demand = min(proportional_demand(setpoint, self.current_temp,
+                                                 heater_config["proportional_band"]), max_demand)
+        plan = self.heater_scheduler.plan(demand, now)
+        refresh = now - self.last_heater_refresh >= heater_config["refresh_interval"]
+        if refresh:
+            self.last_heater_refresh = now
+        self.driver.set_heaters(plan, refresh)
+        self.heating1_state = plan.get("H1", False)
+        self.heating2_state = plan.get("H2", False)
+
+    def drop_feedforward(self, now):
+        """Extra demand for a basket dropped in the last drop_window next to
+        one already in the oil, so the second load gets full heat straight
+        away. A single basket is left to the proportional band, as before."""
+        window = self.config["control"]["drop_window"]
+        lowered = [basket for basket in self.baskets if basket.active and basket.dropped_at is not None]
+        recent = sum(1 for basket in lowered if now - basket.dropped_at < window)
+        return min(recent, len(lowered) - 1) * self.config["baskets"]["drop_feedforward"] if recent else 0.0
+
+    def send_serial_command(self, command, retries=None):
+        """Raw transmit used by the driver; retries defaults to the driver's resend count."""
+        retries = self.driver.resends if retries is None else retries
+        generation = self.stop_generation
+        safe = command in self.driver.safe_commands()
+        if self.estopped and not safe:
+            log.warning("Dropped '%s': emergency stop is active", command)
+            return False
+        if not self.ser or not self.ser.is_open:
+            log.warning("Serial port is not open", extra=fields(command=command))
+            return False
+        success = True
+        for i in range(retries):
+            try:
+                with self.serial_lock:
+                    # The latch too: a sender may have read the generation the stop just set.
+                    if generation != self.stop_generation or (self.estopped and not safe):
+                        log.info("Preempted '%s' by emergency stop", command)
+                        return False
+                    if not self.ser:
+                        return False
+                    self.ser.write(f"{command}\n".encode())
+                    self.ser.flush()
+                if self.capture:
+                    self.capture.write("tx", command)
+                log.debug("Sent command %s", command, extra=fields(attempt=i + 1, of=retries))
+                self.clock.sleep(self.config["serial"].get("command_delay", 0.1))
+            except serial.SerialException as e:
+                log.error("Serial write failed for '%s': %s", command, e, extra=fields(attempt=i + 1, of=retries))
+                self.supervisor.mark_lost(str(e))
+                success = False
+                break
+        if success and command in self.driver.basket_lookup:
+            index = self.driver.basket_lookup[command][0]
+            self.baskets[index].position = self.driver.basket_position(index)
+        return success
+
+    def set_manual_heat(self, on, target=None):
+        """Hold the oil at target outside a cook (manual screen); the next
+        control tick switches the heaters accordingly."""
+        if target is not None:
+            self.target_temperature = target
+        self.manual_heat = on
+
+    def set_log_level(self, level):
+        set_level(level)
+
+    def order_tapped(self, category, setpoint):
+        """An order is being entered: start heating towards its setpoint now."""
+        if self.capture:
+            self.capture.write("order", {"category": category, "temp": setpoint})
+        self.idle_policy.order_tapped(category, setpoint, self.clock.now())
+
+    def start_frying(self, item_name, target_temp, fry_time, schedule=None, category=None, basket=None):
+        """Start a cook in basket (an index), or in the first free one.
+
+        Returns its job id: the running cook's for a repeated Start of the
+        same item, None if no basket is free or the vat is held at a
+        temperature this cook cannot share."""
+        if self.estopped:
+            log.warning("Refused '%s': emergency stop is active", item_name)
+            return None
+        if schedule is None:
+            schedule = compile_stages([{"temp": target_temp, "time": fry_time}])
+        key = (item_name, target_temp, fry_time)
+        baskets_config = self.config["baskets"]
+        candidates = self.baskets if basket is None else [self.baskets[basket]]
+        with self.start_lock:
+            free = None
+            for candidate in candidates:
+                running = self.jobs.active(candidate.lane)
+                if not running:
+                    free = free or candidate
+                elif running.key == key and not running.token.cancelled and (
+                        basket is not None or self.clock.now() - running.started < baskets_config["double_tap"]):
+                    return running.id
+            if free is None:
+                log.warning("Refused '%s': no free basket", item_name)
+                return None
+            others = [other for other in self.baskets if other.active]
+            if others and abs(schedule[0].setpoint - self.target_temperature) > baskets_config["setpoint_tolerance"]:
+                log.warning("Refused '%s': the vat is held at %s°C for %s", item_name, self.target_temperature,
+                            ", ".join(other.item for other in others))
+                return None
+            self.order_category = category
+            if not others:
+                self.basket_dropped_at = None
+            free.item = item_name
+            free.frying_time = fry_time
+            free.alert = None
+            free.shared_load = False
+            free.active = True
+            self.set_basket_setpoint(free, schedule[0].setpoint)
+            self.frying_active = True
+            job = self.jobs.submit(free.lane, key, self.frying_process, free, schedule)
+        if self.capture:
+            self.capture.write("job", {"item": item_name, "category": category, "temp": target_temp, "time": fry_time,
+                                       "basket": free.index, "schedule": [list(step) for step in schedule]})
+        return job.id
+
+    def set_basket_setpoint(self, basket, setpoint):
+        basket.setpoint = setpoint
+        setpoints = [other.setpoint for other in self.baskets if other.active]
+        if setpoints:
+            self.target_temperature = max(setpoints)
+
+    def basket_finished(self, basket):
+        """Take basket out of the vat's cooks; True once no basket is cooking."""
+        basket.active = False
+        self.frying_active = any(other.active for other in self.baskets)
+        self.set_basket_setpoint(basket, None)
+        return not self.frying_active
+
+    def job_finished(self, job):
+        basket = self.baskets[int(job.lane[len("basket"):]) - 1]
+        if job.status == "failed":
+            log.error("Cook job %d (%s) failed: %s", job.id, job.key[0], job.error, extra=fields(lane=job.lane))
+            if self.basket_finished(basket):
+                self.driver.all_off()
+            self.update_status(f"Error: {job.error}", basket)
+            self.alarm("cook_failed", item=job.key[0], error=job.error, basket=basket.index)
+        elif job.status == "cancelled":
+            log.info("Cook job %d (%s) cancelled: %s", job.id, job.key[0], job.token.reason, extra=fields(lane=job.lane))
+        elif not job.result:
+            log.warning("Cook job %d (%s) stopped before completing", job.id, job.key[0], extra=fields(lane=job.lane))
+
+    def cancel_cook(self, reason="cancelled", basket=None):
+        """Cancel the cook in basket, or in every basket."""
+        baskets = self.baskets if basket is None else [self.baskets[basket]]
+        cancelled = 0
+        for target in baskets:
+            cancelled += self.jobs.cancel(target.lane, reason)
+            self.basket_finished(target)
+        return cancelled
+
+    def frying_process(self, token, basket, schedule):
+        item = basket.item
+        tracker = CookTracker(item, basket.setpoint, basket.frying_time, now=self.clock.wall())
+        basket.tracker = tracker
+        conformance = self.config["conformance"]
+        monitor = ConformanceMonitor(item, self.golden_curves.golden(item, conformance["min_cooks"]),
+                                     conformance, conformance["max_length"])
+        basket.conformance = monitor
+        # Resumed after a restart with the basket already in the oil: sample
+        # it as from a drop, but keep its curve (aligned mid-cook) out of the golden ones.
+        resumed = basket.position == "lowered" and schedule[0].action != "lower"
+        if resumed:
+            self.basket_dropped(basket)
+        completed = False
+        try:
+            completed = self.run_schedule(token, basket, schedule)
+        finally:
+            basket.tracker = None
+            basket.conformance = None
+            basket.dropped_at = None
+            # Golden curves are single-basket loads; a shared cook would skew them.
+            if (conformance["learn"] and completed and monitor.started is not None
+                    and not basket.shared_load and not resumed):
+                try:
+                    self.golden_curves.append(item, monitor.curve())
+                except OSError as e:
+                    log.error("Failed to store cook curve: %s", e)
+            if basket.checkpoint:
+                basket.checkpoint.clear()
+            self.record_cook(tracker.finish(aborted=not completed))
+            self.basket_finished(basket)
+        return completed
+
+    def run_schedule(self, token, basket, schedule):
+        tracker = basket.tracker
+        for index, step in enumerate(schedule):
+            if token.cancelled:
+                return False
+            self.set_basket_setpoint(basket, step.setpoint)
+            final = index == len(schedule) - 1
+            self.save_checkpoint(basket, schedule, index)
+            if step.action == "preheat":
+                self.update_status(f"Heating Oil to {step.setpoint}°C...", basket)
+                preheat_start = self.clock.now()
+                tracker.preheat_started(preheat_start)
+                while self.current_temp < step.setpoint - 5 and not token.wait(1):
+                    eta = self.preheat_eta(step.setpoint - 5, self.clock.now() - preheat_start)
+                    self.update_status(f"Heating... {self.current_temp:.1f}°C{eta}", basket)
+                    if basket.checkpoint:
+                        basket.checkpoint.heartbeat()
+                tracker.preheat_finished(self.clock.now())
+            elif step.action == "lower":
+                self.basket_dropped(basket)
+                if not self.lower_basket(token, basket):
+                    self.update_status("Error: Failed to lower basket", basket)
+                    return False
+            elif step.action == "raise":
+                if final:
+                    self.basket_finished(basket)
+                    self.update_status("Frying Done! Raising the basket...", basket)
+                if not self.raise_basket(token, basket):
+                    self.update_status("Error: Failed to raise basket", basket)
+                    return False
+            else:
+                elapsed = self.run_timed_step(token, basket, step)
+                if step.action == "fry":
+                    tracker.fried(elapsed)
+
+        self.update_status("Process Complete!", basket)
+        if self.basket_finished(basket):
+            self.driver.all_off()
+        return True
+
+    def basket_dropped(self, basket):
+        now = self.clock.now()
+        basket.dropped_at = now
+        self.basket_dropped_at = now
+        basket.tracker.basket_lowered(self.current_temp, now)
+        basket.conformance.start(now)
+        for other in self.baskets:
+            if other is not basket and other.active and other.dropped_at is not None:
+                other.shared_load = basket.shared_load = True
+
+    def preheat_eta(self, target, heating_for):
+        """Preheat time left as " (about m:ss left)", or "" without a thermal model."""
+        if not self.thermal_model:
+            return ""
+        # The dead time only applies until the heat has had time to reach the probe.
+        dead_time = max(self.thermal_model.dead_time - heating_for, 0.0)
+        seconds = self.thermal_model.time_to_reach(self.current_temp, target, dead_time=dead_time)
+        if seconds is None:
+            return ""
+        mins, secs = divmod(int(round(seconds)), 60)
+        return f" (about {mins}:{secs:02} left)"
+
+    def preheat_lead(self, temp):
+        """Seconds to start heating ahead of a forecast window at temp."""
+        lead = self.config["forecast"]["lead"]
+        if self.thermal_model:
+            needed = self.thermal_model.time_to_reach(self.current_temp, temp)
+            if needed is not None:
+                lead = needed
+        return lead + self.config["forecast"]["lead_margin"]
+
+    def check_conformance(self, basket, now):
+        monitor = basket.conformance
+        full_heat = self.heating1_state and self.heating2_state
+        for alert in monitor.sample(self.current_temp, self.target_temperature, now, full_heat):
+            log.warning("Cook curve alert for %s: %s", monitor.item, ALERTS[alert],
+                        extra=fields(kind=alert, basket=basket.index + 1))
+            basket.alert = ALERTS[alert]
+            self.alarm("cook_curve", item=monitor.item, kind=alert, temp=self.current_temp,
+                       setpoint=self.target_temperature, basket=basket.index)
+
+    def record_cook(self, record):
+        if self.telemetry:
+            self.telemetry.emit("cook", record)
+        try:
+            self.history.append(record)
+        except Exception as e:
+            log.error("Failed to record cook history: %s", e)
+
+    def run_timed_step(self, token, basket, step):
+        heading = f"{basket.item} - {step.label}" if step.label else basket.item
+        if step.action == "fry":
+            self.update_status(f"{heading}\nFrying...", basket)
+            timer = make_cook_timer(self.config["cook_timing"], step.setpoint, step.duration)
+        else:
+            timer = ClockTimer(step.duration)
+        timer.update(self.current_temp, self.clock.now())
+        while not timer.done() and not token.cancelled:
+            mins, secs = divmod(int(round(timer.remaining())), 60)
+            if step.action == "rest":
+                self.update_status(f"{heading}\nResting, next stage in {mins:02}:{secs:02}\nTemp: {self.current_temp:.1f}°C", basket)
+            elif basket.alert:
+                self.update_status(f"{heading}\n{mins:02}:{secs:02}\nTemp: {self.current_temp:.1f}°C\nWarning: {basket.alert}", basket)
+            else:
+                self.update_status(f"{heading}\n{mins:02}:{secs:02}\nTemp: {self.current_temp:.1f}°C", basket)
+            token.wait(1)
+            timer.update(self.current_temp, self.clock.now())
+            if basket.checkpoint:
+                basket.checkpoint.heartbeat(remaining=timer.remaining())
+        return timer.elapsed
+
+    def lower_basket(self, token, basket):
+        self.update_status("Lowering the basket...", basket)
+        if not self.driver.lower_basket(basket=basket.index):
+            return False
+        start_time = self.clock.now()
+        while self.clock.now() - start_time < 30 and not token.cancelled:
+            for _ in range(self.driver.travel_resends):
+                self.driver.lower_basket(basket=basket.index)
+            self.update_status("Lowering the basket...", basket)
+            token.wait(1)
+        return True
+
+    def raise_basket(self, token, basket):
+        if not self.driver.raise_basket(basket=basket.index):
+            return False
+        start_time = self.clock.now()
+        # A cancelled cook still gets its basket all the way up; only an
+        # emergency stop, which sends its own raises, cuts the travel short.
+        while self.clock.now() - start_time < 30 and not self.estopped:
+            for _ in range(self.driver.travel_resends):
+                self.driver.raise_basket(basket=basket.index)
+            self.update_status("Raising the basket...", basket)
+            self.clock.sleep(1)
+        return True
+
+    def emergency_stop(self, pressed_at=None):
+        """Preempt all other traffic and put one all-off frame on the wire
+        straight away; the usual resends follow on a worker."""
+        pressed_at = self.clock.now() if pressed_at is None else pressed_at
+        # Latch before bumping the generation, so no sender sees the new
+        # generation without the latch.
+        self.estopped = True
+        self.stop_generation += 1
+        self.frying_active = False
+        self.jobs.cancel(reason="emergency stop")
+        for basket in self.baskets:
+            self.basket_finished(basket)
+        self.manual_heat = False
+        self.idle_policy.stop()
+        commands = self.driver.stop_commands()
+        sent = self.write_frame(commands)
+        latency = self.clock.now() - pressed_at
+        self.estop_latencies.append(latency)
+        if sent:
+            log.warning("Emergency stop on the wire after %.1f ms", latency * 1000)
+        else:
+            log.error("Emergency stop frame not sent")
+        self.log_estop(latency, sent)
+        self.alarm("emergency_stop", latency_ms=latency * 1000, sent=sent)
+        if self.capture:
+            self.capture.write("stop", "emergency")
+        # A crash from here on must not resume the stopped cooks.
+        for basket in self.baskets:
+            if basket.checkpoint:
+                basket.checkpoint.clear()
+        self.clock.spawn(self.repeat_stop, name="estop")
+        return sent
+
+    def write_frame(self, commands):
+        """Write several commands in one go, ahead of anything queued."""
+        try:
+            with self.serial_lock:
+                if not self.ser or not self.ser.is_open:
+                    return False
+                self.ser.write("".join(f"{command}\n" for command in commands).encode())
+                self.ser.flush()
+        except serial.SerialException as e:
+            log.error("Serial write failed for emergency stop: %s", e)
+            self.supervisor.mark_lost(str(e))
+            return False
+        if self.capture:
+            for command in commands:
+                self.capture.write("tx", command)
+        return True
+
+    def repeat_stop(self):
+        # Firmware without ACKs gets the usual resends, as safe commands.
+        self.driver.all_off()
+        self.driver.raise_baskets()
+
+    def log_estop(self, latency, sent):
+        path = self.config["serial"].get("estop_log")
+        if not path:
+            return
+        try:
+            with open(path, "a") as f:
+                f.write(f"{self.clock.wall():.3f},{latency * 1000:.2f},{int(sent)}\n")
+        except OSError as e:
+            log.error("Failed to log emergency stop latency: %s", e)
+
+    def reset(self):
+        self.cancel_cook("reset")
+        if self.capture:
+            self.capture.write("stop", "reset")
+        self.manual_heat = False
+        self.estopped = False
+        raised = self.driver.raise_baskets()
+        self.driver.all_off()
+        return raised
+
+    def link_status(self):
+        sup = self.supervisor
+        if not sup.connected and sup.ever_connected:
+            return {"text": f"SERIAL LINK DOWN - reconnecting (drop #{sup.disconnects})", "fg": "red"}
+        if not sup.connected:
+            return {"text": "No serial link", "fg": "orange"}
+        if sup.restored_at and self.clock.now() - sup.restored_at < 10:
+            return {"text": f"Link restored ({sup.disconnects} drops)", "fg": "orange"}
+        return {"text": ""}
+
+    def shutdown(self):
+        if self.telemetry:
+            self.telemetry.stop()
+        self.heater_scheduler.release()
+        self.supervisor.stop()
+        try:
+            if self.ser and self.ser.is_open:
+                self.driver.all_off()
+                self.driver.raise_baskets()
+                self.ser.close()
+        except serial.SerialException as e:
+            log.error("Error during cleanup: %s", e)
+        if self.capture:
+            self.capture.close()
@@ -0,0 +1,373 @@
+import logging
+import multiprocessing
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from clock import MonotonicClock, ThreadScheduler
+from controller import FryerController
+from logs import set_level, setup_logging
+
+log = logging.getLogger(__name__)
+
+PHASES = ("idle", "heating", "approach", "drop", "stable")
+
+# seq, heartbeat, temp, target, frying_active, heating1, heating2, estopped,
+# manual_heat, phase, link fg, link text
+LAYOUT = struct.Struct("<I d d d ? ? ? ? ? B 8s 96s")
+# Then one record per basket: active, lowered, setpoint, frying_time, status_seq, item, status
+BASKET = struct.Struct("<? ? d I I 48s 256s")
+MAX_BASKETS = 4
+SIZE = LAYOUT.size + MAX_BASKETS * BASKET.size
+SEQ = struct.Struct("<I")
+# Torn copies a reader tries before it settles for the last good one.
+READ_RETRIES = 100
+
+
+def _text(raw):
+    return raw.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+
+def _decode(fields, baskets):
+    (_, heartbeat, temp, target, active, h1, h2, estopped, manual_heat, phase, fg, link) = fields
+    return {
+        "heartbeat": heartbeat, "current_temp": temp, "target_temperature": target,
+        "frying_active": active, "heating1_state": h1, "heating2_state": h2,
+        "estopped": estopped, "manual_heat": manual_heat, "phase": PHASES[phase],
+        "link": {"text": _text(link), "fg": _text(fg) or "red"},
+        "baskets": [{"active": cooking, "position": "lowered" if lowered else "raised",
+                     "setpoint": setpoint if cooking else None, "frying_time": frying_time,
+                     "status_seq": status_seq, "item": _text(item) or None, "status": _text(status)}
+                    for cooking, lowered, setpoint, frying_time, status_seq, item, status in baskets],
+    }
+
+
+class StateBoard:
+    """Controller state in a shared-memory segment, guarded by a seqlock.
+
+    The controller process is the only writer: it makes the sequence number
+    odd, writes the record, then makes it even again. Readers retry until
+    they see the same even number before and after copying the record, so
+    neither side ever waits on the other. A writer that dies mid-publish
+    leaves the number odd; readers then give up after READ_RETRIES and
+    keep the last good copy, whose heartbeat goes stale.
+    """
+
+    def __init__(self, name=None):
+        if name:
+            self.shm = shared_memory.SharedMemory(name=name)
+        else:
+            self.shm = shared_memory.SharedMemory(create=True, size=SIZE)
+            self.shm.buf[:SIZE] = bytes(SIZE)
+        self.name = self.shm.name
+        self.write_lock = threading.Lock()
+        self.last = None
+
+    def reset(self):
+        """Make the sequence number even again; only while no writer is attached."""
+        seq = SEQ.unpack_from(self.shm.buf)[0]
+        if seq % 2:
+            SEQ.pack_into(self.shm.buf, 0, seq + 1)
+
+    def publish(self, controller, now):
+        link = controller.link_status()
+        with self.write_lock:
+            seq = SEQ.unpack_from(self.shm.buf)[0]
+            SEQ.pack_into(self.shm.buf, 0, seq + 1)
+            LAYOUT.pack_into(
+                self.shm.buf, 0, seq + 1, now,
+                controller.current_temp, controller.target_temperature,
+                controller.frying_active, controller.heating1_state, controller.heating2_state,
+                controller.estopped, controller.manual_heat, PHASES.index(controller.phase),
+                link.get("fg", "").encode()[:8], link["text"].encode()[:96])
+            for basket in controller.baskets[:MAX_BASKETS]:
+                BASKET.pack_into(
+                    self.shm.buf, LAYOUT.size + basket.index * BASKET.size,
+                    basket.active, basket.position == "lowered", basket.setpoint or 0.0, basket.frying_time,
+                    basket.status_seq, (basket.item or "").encode()[:48], basket.status.encode()[:256])
+            SEQ.pack_into(self.shm.buf, 0, seq + 2)
+
+    def read(self):
+        """The current record, or the last good one (None before any) when
+        every try in READ_RETRIES found it mid-write."""
+        for _ in range(READ_RETRIES):
+            before = SEQ.unpack_from(self.shm.buf)[0]
+            if before % 2:
+                time.sleep(0)
+                continue
+            fields = LAYOUT.unpack_from(self.shm.buf)
+            baskets = [BASKET.unpack_from(self.shm.buf, LAYOUT.size + index * BASKET.size)
+                       for index in range(MAX_BASKETS)]
+            if SEQ.unpack_from(self.shm.buf)[0] == before:
+                self.last = _decode(fields, baskets)
+                break
+        return self.last
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def serve(config, conn, shm_name):
+    """Controller process main: tick on a deadline scheduler, publish state
+    after every tick and carry out commands arriving on the pipe."""
+    logs = setup_logging(config, serial=True)
+    clock = MonotonicClock()
+    controller = FryerController(config, clock=clock)
+    board = StateBoard(shm_name)
+    controller.start()
+    board.publish(controller, clock.now())
+    conn.send(("recovery", None, controller.recovery))
+
+    def tick():
+        controller.control_tick()
+        board.publish(controller, clock.now())
+
+    scheduler = ThreadScheduler(clock)
+    scheduler.call_every(controller.control_period, tick)
+    scheduler.start()
+    send_lock = threading.Lock()
+
+    def run(request_id, name, args):
+        if name in ("driver", "history"):
+            result = getattr(getattr(controller, name), args[0])(*args[1:])
+        else:
+            result = getattr(controller, name)(*args)
+        # Publish before replying, so the caller's next read sees the effect.
+        board.publish(controller, clock.now())
+        with send_lock:
+            conn.send(("reply", request_id, result))
+
+    while True:
+        try:
+            request_id, name, args = conn.recv()
+        except (EOFError, OSError):
+            break
+        if name == "shutdown":
+            break
+        if name == "emergency_stop":
+            # Handled right here, never behind another command.
+            run(request_id, name, args)
+        else:
+            threading.Thread(target=run, args=(request_id, name, args), daemon=True).start()
+
+    scheduler.stop()
+    controller.shutdown()
+    board.close()
+    logs.stop()
+
+
+class DriverProxy:
+    def __init__(self, client):
+        self.client = client
+
+    def lower_basket(self, retries=None, basket=0):
+        return self.client.call("driver", "lower_basket", retries, basket)
+
+    def raise_basket(self, retries=None, basket=0):
+        return self.client.call("driver", "raise_basket", retries, basket)
+
+
+class HistoryProxy:
+    """Cook history read through the controller process, which owns the
+    store and compacts it; reading the files from here could race that."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def load(self):
+        df = self.client.call("history", "load", timeout=30.0)
+        if df is False:
+            raise OSError("the controller process did not return the cook history")
+        return df
+
+
+class PendingCall:
+    """A request sent to the controller process, waiting for its reply."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.done = threading.Event()
+        self.result = False
+        self.lost = False
+
+
+class ControllerClient:
+    """Stands in for FryerController inside the GUI process while the real
+    one runs in its own process, so nothing the UI does (menu rebuilds, Excel
+    imports, GC pauses) can delay a control tick.
+
+    control_tick() here only reads the shared state and hands new status
+    messages to on_status, on the Tk thread.
+
+    Calls only hold the lock while they send. One reader thread hands each
+    reply to the call waiting for it, so an emergency stop goes out at once
+    while a slow reset is still waiting for its answer.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.on_status = None
+        self.recovery = []
+        self.driver = DriverProxy(self)
+        self.history = HistoryProxy(self)
+        self.context = multiprocessing.get_context("spawn")
+        self.board = StateBoard()
+        self.lock = threading.Lock()
+        self.ids = 0
+        self.pending = {}
+        self.ready = threading.Event()
+        self.process = None
+        self.conn = None
+        self.current_temp = 25.0
+        self.target_temperature = 180
+        self.frying_active = False
+        self.baskets = [{"active": False, "position": "raised", "setpoint": None, "frying_time": 0,
+                         "status_seq": 0, "item": None, "status": ""}
+                        for _ in range(min(config["baskets"]["count"], MAX_BASKETS))]
+        self.estopped = False
+        self.phase = "idle"
+        self.heartbeat = None
+        self.link = {"text": ""}
+
+    def start(self):
+        self.launch()
+        self.ready.wait(30)
+        self.control_tick()
+
+    def launch(self):
+        """Start the controller process without waiting for it; ready is
+        set once it has recovered and sent the recovery list."""
+        # A controller that died mid-publish left the sequence number odd.
+        self.board.reset()
+        self.conn, child = self.context.Pipe()
+        self.process = self.context.Process(target=serve, args=(self.config, child, self.board.name),
+                                            name="fryer-controller", daemon=True)
+        self.process.start()
+        child.close()
+        self.listen(self.conn)
+
+    def listen(self, conn):
+        self.ready.clear()
+        threading.Thread(target=self.read_replies, args=(conn,), name="controller-replies", daemon=True).start()
+
+    def read_replies(self, conn):
+        while True:
+            try:
+                kind, reply_id, result = conn.recv()
+            except (EOFError, OSError):
+                break
+            if kind == "recovery":
+                self.recovery = result
+                self.ready.set()
+                continue
+            with self.lock:
+                waiting = self.pending.get(reply_id)
+            if waiting:
+                waiting.result = result
+                waiting.done.set()
+        # The process is gone; fail the calls still waiting on it.
+        with self.lock:
+            for waiting in self.pending.values():
+                if waiting.conn is conn and not waiting.done.is_set():
+                    waiting.lost = True
+                    waiting.done.set()
+
+    def call(self, name, *args, timeout=5.0):
+        with self.lock:
+            self.ids += 1
+            request_id = self.ids
+            waiting = self.pending[request_id] = PendingCall(self.conn)
+            try:
+                self.conn.send((request_id, name, args))
+            except (EOFError, OSError) as e:
+                del self.pending[request_id]
+                log.error("Controller process unreachable for '%s': %s", name, e)
+                return False
+        answered = waiting.done.wait(timeout)
+        with self.lock:
+            del self.pending[request_id]
+        if not answered:
+            log.error("Controller process did not answer '%s'", name)
+            return False
+        if waiting.lost:
+            log.error("Controller process exited before answering '%s'", name)
+            return False
+        return waiting.result
+
+    def control_tick(self, now=None):
+        if self.process and not self.process.is_alive():
+            log.error("Controller process exited (%s), restarting", self.process.exitcode)
+            # On the Tk thread: launch only, the taskbar shows the outage until it is ready.
+            self.launch()
+        state = self.board.read()
+        if state is None:
+            return
+        for name in ("current_temp", "frying_active", "estopped", "phase"):
+            setattr(self, name, state[name])
+        if state["frying_active"]:
+            self.target_temperature = state["target_temperature"]
+        self.link = state["link"]
+        self.heartbeat = state["heartbeat"]
+        for index, basket in enumerate(state["baskets"][:len(self.baskets)]):
+            changed = basket["status_seq"] != self.baskets[index]["status_seq"]
+            self.baskets[index] = basket
+            if changed and self.on_status:
+                self.on_status(basket["status"], index)
+
+    def control_period(self):
+        return self.config["process"]["ui_poll_interval"]
+
+    def link_status(self):
+        stale = self.config["process"]["stale_after"]
+        if not self.ready.is_set() or self.heartbeat and time.monotonic() - self.heartbeat > stale:
+            return {"text": "CONTROLLER NOT RESPONDING", "fg": "red"}
+        return self.link
+
+    def order_tapped(self, category, setpoint):
+        return self.call("order_tapped", category, setpoint)
+
+    def basket_states(self):
+        return self.baskets
+
+    def start_frying(self, item_name, target_temp, fry_time, schedule=None, category=None, basket=None):
+        job_id = self.call("start_frying", item_name, target_temp, fry_time, schedule, category, basket)
+        if job_id:
+            # The controller publishes before it replies, so this read already shows the new cook.
+            self.control_tick()
+        return job_id
+
+    def emergency_stop(self, pressed_at=None):
+        return self.call("emergency_stop", time.monotonic() if pressed_at is None else pressed_at)
+
+    def reset(self):
+        return self.call("reset", timeout=10.0)
+
+    def set_manual_heat(self, on, target=None):
+        return self.call("set_manual_heat", on, target)
+
+    def set_log_level(self, level):
+        set_level(level)
+        return self.call("set_log_level", level)
+
+    def shutdown(self):
+        if self.process and self.process.is_alive():
+            try:
+                with self.lock:
+                    self.conn.send((0, "shutdown", ()))
+            except OSError:
+                pass
+            self.process.join(timeout=10)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.process = None
+        self.board.close(unlink=True)
+
+
+def make_controller(config, clock):
+    """The controller the GUI talks to: in-process, or a client of its own process."""
+    if config["process"]["mode"] == "process":
+        return ControllerClient(config)
+    return FryerController(config, clock=clock)
@@ -0,0 +1,68 @@
+class ClockTimer:
+    """Plain wall-clock countdown; the default cook timing."""
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.start = None
+        self.elapsed = 0.0
+
+    def update(self, temp, now):
+        if self.start is None:
+            self.start = now
+        self.elapsed = now - self.start
+
+    def done(self):
+        return self.start is not None and self.elapsed >= self.duration
+
+    def remaining(self):
+        return max(self.duration - self.elapsed, 0)
+
+
+class ThermalDoseTimer:
+    """Ends a fry on accumulated heat instead of elapsed time.
+
+    The dose is the integral of (oil temp - reference) over time, and the
+    target is what a cook at setpoint for the nominal duration would get.
+    A load that drags the oil down therefore cooks longer, up to
+    max_stretch times the nominal duration.
+    """
+
+    def __init__(self, setpoint, duration, reference=100.0, max_stretch=1.5):
+        self.duration = duration
+        self.reference = reference
+        self.nominal_rate = max(setpoint - reference, 1.0)
+        self.target = self.nominal_rate * duration
+        self.limit = duration * max_stretch
+        self.dose = 0.0
+        self.start = None
+        self.last_time = None
+        self.last_excess = 0.0
+        self.elapsed = 0.0
+
+    def update(self, temp, now):
+        excess = max(temp - self.reference, 0.0)
+        if self.start is None:
+            self.start = now
+        else:
+            # Trapezoidal step between samples.
+            self.dose += (excess + self.last_excess) / 2.0 * (now - self.last_time)
+        self.last_time = now
+        self.last_excess = excess
+        self.elapsed = now - self.start
+
+    def done(self):
+        return self.start is not None and (self.dose >= self.target or self.elapsed >= self.limit)
+
+    def remaining(self):
+        deficit = max(self.target - self.dose, 0.0)
+        # Assume the oil keeps recovering towards setpoint: average the current
+        # and nominal rates rather than extrapolating today's dip.
+        rate = max((self.last_excess + self.nominal_rate) / 2.0, 1.0)
+        return min(deficit / rate, max(self.limit - self.elapsed, 0))
+
+
+def make_cook_timer(config, setpoint, duration):
+    if config.get("mode") == "dose":
+        return ThermalDoseTimer(setpoint, duration, config.get("reference_temp", 100.0),
+                                config.get("max_stretch", 1.5))
+    return ClockTimer(duration)
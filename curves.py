@@ -0,0 +1,147 @@
+import os
+import re
+import threading
+import warnings
+
+import numpy as np
+
+ALERTS = {
+    "drop": "Oil dropped further than usual at basket drop",
+    "recovery": "Oil is recovering slower than usual",
+    "element": "Heating slower than usual - check the elements",
+}
+
+
+class GoldenCurves:
+    """Temperature curves of past cooks, one .npy file per menu item.
+
+    Each curve is oil temperature minus setpoint, one sample per second
+    from basket drop, NaN-padded to max_length, so the curves of one item
+    stack into a (cooks, max_length) array. The golden curve is the
+    per-second median of the last `keep` completed cooks, with a robust
+    spread (scaled MAD) next to it.
+    """
+
+    def __init__(self, directory="golden_curves", keep=100, max_length=600):
+        self.directory = directory
+        self.keep = keep
+        self.max_length = max_length
+        self.lock = threading.Lock()
+        self.cache = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, item):
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9]+", "_", item).strip("_") + ".npy")
+
+    def load(self, item):
+        try:
+            return np.load(self.path(item))
+        except (OSError, ValueError):
+            return np.empty((0, self.max_length), dtype=np.float32)
+
+    def append(self, item, trace):
+        with self.lock:
+            curves = np.vstack([self.load(item), trace[np.newaxis, :self.max_length]])[-self.keep:]
+            tmp = self.path(item) + ".tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, curves.astype(np.float32))
+            os.replace(tmp, self.path(item))
+            self.cache.pop(item, None)
+
+    def golden(self, item, min_cooks=5):
+        """(median, spread) arrays for item, or None with too few cooks."""
+        with self.lock:
+            if item not in self.cache:
+                curves = self.load(item)
+                counts = np.sum(~np.isnan(curves), axis=0)
+                if len(curves) < min_cooks or not counts.any():
+                    self.cache[item] = None
+                else:
+                    with warnings.catch_warnings():
+                        # Seconds no cook reached yet are all-NaN columns and stay NaN.
+                        warnings.simplefilter("ignore", RuntimeWarning)
+                        median = np.nanmedian(np.where(counts >= min_cooks, curves, np.nan), axis=0)
+                        spread = 1.4826 * np.nanmedian(np.abs(curves - median), axis=0)
+                    self.cache[item] = (median, spread)
+            return self.cache[item]
+
+
+class ConformanceMonitor:
+    """Compares one cook with its item's golden curve while it runs.
+
+    It records this cook's curve from start() (the basket drop) onward.
+    With a golden curve, sample() also returns the alerts that just fired,
+    each at most once per cook:
+      drop      in the drop window the oil fell well below the usual dip
+      recovery  the usual cook is back near setpoint but this one has stayed
+                well below it for recovery_hold seconds
+      element   all elements on, yet the oil rose less than min_rate_ratio
+                of the usual rise over rate_window seconds
+    "Well below" is the larger of the configured margin and `sigmas`
+    robust spreads of the golden curve at that second.
+    """
+
+    def __init__(self, item, golden, config, max_length=600):
+        self.item = item
+        self.golden = golden
+        self.config = config
+        self.trace = np.full(max_length, np.nan)
+        self.started = None
+        self.low_since = None
+        self.fired = set()
+
+    def start(self, now):
+        if self.started is None:
+            self.started = now
+
+    def sample(self, temp, setpoint, now, full_heat):
+        if self.started is None:
+            return []
+        index = int(now - self.started)
+        if index >= len(self.trace):
+            return []
+        self.trace[index] = temp - setpoint
+        if self.golden is None:
+            return []
+        median, spread = self.golden
+        if index >= len(median) or np.isnan(median[index]):
+            return []
+        config = self.config
+        deviation = self.trace[index] - median[index]
+        alerts = []
+
+        if index < config["drop_window"] and deviation < -max(config["drop_margin"], config["sigmas"] * spread[index]):
+            alerts.append("drop")
+
+        if (median[index] > -config["recovery_band"]
+                and deviation < -max(config["recovery_margin"], config["sigmas"] * spread[index])):
+            if self.low_since is None:
+                self.low_since = now
+            if now - self.low_since >= config["recovery_hold"]:
+                alerts.append("recovery")
+        else:
+            self.low_since = None
+
+        window = config["rate_window"]
+        if full_heat and index >= window:
+            # The sample a window back may fall between control ticks; take the last one before it.
+            earlier = self.trace[:index - window + 1]
+            earlier = earlier[~np.isnan(earlier)]
+            usual = median[index] - median[index - window]
+            if (len(earlier) and usual >= config["min_rise"]
+                    and self.trace[index] - earlier[-1] < config["min_rate_ratio"] * usual):
+                alerts.append("element")
+
+        new = [alert for alert in alerts if alert not in self.fired]
+        self.fired.update(new)
+        return new
+
+    def curve(self):
+        """This cook's curve with gaps between control ticks interpolated."""
+        known = np.flatnonzero(~np.isnan(self.trace))
+        if len(known) < 2:
+            return self.trace
+        curve = self.trace.copy()
+        span = np.arange(known[0], known[-1] + 1)
+        curve[span] = np.interp(span, known, self.trace[known])
+        return curve
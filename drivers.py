@@ -0,0 +1,212 @@
+import re
+
+# Capabilities a driver can declare:
+#   separate_heaters  - H1 and H2 can be switched independently
+#   basket_feedback   - firmware reports when the basket reaches the end stop
+#   acks              - firmware acknowledges commands, so no blind resends
+#   sample_period     - firmware accepts a sample-rate command
+#
+# Baskets are numbered from 0. The first basket keeps the single-basket
+# commands; the others use extra_basket_commands with {n} = basket + 1.
+
+
+class FryerDriver:
+    """One firmware dialect behind the common actuator API.
+
+    send(command, retries) is the controller's raw transmit. The driver
+    decides which frames go out for each action and keeps the last commanded
+    state of every actuator, so restore() can put them back after a reconnect.
+    """
+
+    name = None
+    capabilities = frozenset()
+    resends = 1          # attempts per command
+    travel_resends = 1   # repeats per second while the basket travels
+    heater_commands = {}  # element -> (on, off)
+    basket_commands = {}  # "lowered"/"raised" -> command
+    extra_basket_commands = {}  # the same as "{n}" templates, for baskets after the first
+    all_off_command = None  # single frame that switches every heater off
+    sample_command = None  # e.g. "SAMPLE_MS {ms}"
+    probe = None  # (command, reply regex) for auto-detection
+
+    def __init__(self, send, config=None, baskets=1):
+        self.send = send
+        self.config = config or {}
+        self.baskets = baskets
+        self.state = {}
+        # Command -> (basket, position), to tell which basket a frame moved.
+        self.basket_lookup = {self.basket_command(position, basket): (basket, position)
+                              for basket in range(baskets) for position in self.basket_commands}
+
+    def supports(self, capability):
+        return capability in self.capabilities
+
+    def set_heater(self, element, on, refresh=False):
+        command = self.heater_commands[element][0 if on else 1]
+        if self.state.get(element) != command:
+            self.state[element] = command
+            return self.send(command, self.resends)
+        if refresh:
+            return self.send(command, 1)
+        return True
+
+    def set_heaters(self, plan, refresh=False):
+        """Apply {element: on}; offs go out before ons so a hand-over never overlaps."""
+        if not self.supports("separate_heaters") and plan:
+            on = any(plan.values())
+            plan = {element: on for element in self.heater_commands}
+        ok = True
+        for element, on in sorted(plan.items(), key=lambda kv: kv[1]):
+            ok = self.set_heater(element, on, refresh) and ok
+        return ok
+
+    def heaters_on(self):
+        return {element: self.state.get(element) == commands[0]
+                for element, commands in self.heater_commands.items()}
+
+    def basket_command(self, position, basket=0):
+        if basket == 0:
+            return self.basket_commands[position]
+        templates = self.config.get("extra_basket_commands") or self.extra_basket_commands
+        return templates[position].format(n=basket + 1)
+
+    def move_basket(self, position, retries=None, basket=0):
+        command = self.basket_command(position, basket)
+        self.state[("basket", basket)] = command
+        return self.send(command, self.resends if retries is None else retries)
+
+    def lower_basket(self, retries=None, basket=0):
+        return self.move_basket("lowered", retries, basket)
+
+    def raise_basket(self, retries=None, basket=0):
+        return self.move_basket("raised", retries, basket)
+
+    def raise_baskets(self, retries=None):
+        ok = True
+        for basket in range(self.baskets):
+            ok = self.raise_basket(retries, basket) and ok
+        return ok
+
+    def basket_position(self, basket=0):
+        command = self.state.get(("basket", basket))
+        if command in self.basket_lookup:
+            return self.basket_lookup[command][1]
+        return "raised"
+
+    def all_off(self):
+        for element, commands in self.heater_commands.items():
+            self.state[element] = commands[1]
+        if self.all_off_command:
+            return self.send(self.all_off_command, self.resends)
+        ok = True
+        for element, commands in self.heater_commands.items():
+            ok = self.send(commands[1], self.resends) and ok
+        return ok
+
+    def stop_commands(self):
+        """Frames for an emergency stop: every heater off, then every basket up.
+        Marks them as the commanded state without sending anything."""
+        commands = [self.all_off_command] if self.all_off_command else []
+        for element, (on, off) in self.heater_commands.items():
+            self.state[element] = off
+            if not self.all_off_command:
+                commands.append(off)
+        for basket in range(self.baskets):
+            command = self.basket_command("raised", basket)
+            self.state[("basket", basket)] = command
+            commands.append(command)
+        return commands
+
+    def safe_commands(self):
+        """Commands still allowed while an emergency stop is latched."""
+        safe = {off for _, off in self.heater_commands.values()}
+        safe.update(self.basket_command("raised", basket) for basket in range(self.baskets))
+        if self.all_off_command:
+            safe.add(self.all_off_command)
+        return safe
+
+    def set_sample_period(self, ms):
+        template = self.config.get("sample_command") or self.sample_command
+        if not template:
+            return False
+        return self.send(template.format(ms=int(ms)), 1)
+
+    def adopt(self, other):
+        """Take over the commanded state of another driver, in this dialect."""
+        for element, on in other.heaters_on().items():
+            if element in other.state and element in self.heater_commands:
+                self.state[element] = self.heater_commands[element][0 if on else 1]
+        for basket in range(min(self.baskets, other.baskets)):
+            if ("basket", basket) in other.state:
+                self.state[("basket", basket)] = self.basket_command(other.basket_position(basket), basket)
+
+    def restore(self):
+        for command in list(self.state.values()):
+            self.send(command, self.resends)
+
+
+class TextDriver(FryerDriver):
+    """fryer.py firmware: HEATING_n_ON/OFF and LOWER/RAISE_BASKET
+    (LOWER/RAISE_BASKET_n for the other baskets), no ACKs."""
+
+    name = "text"
+    capabilities = frozenset({"separate_heaters"})
+    resends = 4
+    travel_resends = 2
+    heater_commands = {"H1": ("HEATING_1_ON", "HEATING_1_OFF"), "H2": ("HEATING_2_ON", "HEATING_2_OFF")}
+    basket_commands = {"lowered": "LOWER_BASKET", "raised": "RAISE_BASKET"}
+    extra_basket_commands = {"lowered": "LOWER_BASKET_{n}", "raised": "RAISE_BASKET_{n}"}
+    probe = ("ID?", r"FRYER[-_ ]?TEXT")
+
+
+class NumericDriver(FryerDriver):
+    """trash_1.py firmware: "2" heaters off, "3" basket up, "4" basket down,
+    plus H1_ON/H2_ON for the individual elements and Bn_DOWN/Bn_UP for
+    the other baskets."""
+
+    name = "numeric"
+    capabilities = frozenset({"separate_heaters"})
+    heater_commands = {"H1": ("H1_ON", "H1_OFF"), "H2": ("H2_ON", "H2_OFF")}
+    basket_commands = {"lowered": "4", "raised": "3"}
+    extra_basket_commands = {"lowered": "B{n}_DOWN", "raised": "B{n}_UP"}
+    all_off_command = "2"
+    probe = ("ID?", r"FRYER[-_ ]?NUM")
+
+
+DRIVERS = {driver.name: driver for driver in (TextDriver, NumericDriver)}
+
+
+def make_driver(name, send, config=None, baskets=1):
+    if name not in DRIVERS:
+        raise ValueError(f"Unknown fryer driver '{name}' (known: {', '.join(sorted(DRIVERS))})")
+    return DRIVERS[name](send, config, baskets)
+
+
+def match_reply(received):
+    for name, driver in DRIVERS.items():
+        if driver.probe and re.search(driver.probe[1].encode(), received):
+            return name
+    return None
+
+
+def detect_driver(ser, clock, timeout=1.0):
+    """Send each distinct probe and return (name, bytes read) for the first
+    dialect whose reply comes back, or (None, bytes read)."""
+    received = bytearray()
+    sent = set()
+    for driver in DRIVERS.values():
+        if not driver.probe or driver.probe[0] in sent:
+            continue
+        sent.add(driver.probe[0])
+        ser.write(f"{driver.probe[0]}\n".encode())
+        ser.flush()
+        deadline = clock.now() + timeout
+        while clock.now() < deadline:
+            waiting = ser.in_waiting
+            if waiting:
+                received += ser.read(waiting)
+                name = match_reply(received)
+                if name:
+                    return name, bytes(received)
+            clock.sleep(0.05)
+    return None, bytes(received)
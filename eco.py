@@ -0,0 +1,77 @@
+class IdlePolicy:
+    """What the heaters do while no cook or manual heat is running.
+
+    After a cook the oil first cools freely. Once it has been idle for
+    standby_after seconds it is held at standby_temp on part power
+    (standby_power of the elements), and after off_after seconds idle the
+    heaters go off. Until the first cook the fryer stays off.
+
+    An order being entered (order_tapped) boosts the oil towards that
+    order's setpoint on every element for up to boost_time seconds, so the
+    preheat is mostly done by the time Start is pressed. Every threshold
+    can be overridden per menu category.
+
+    With a forecast (forecast.PreheatSchedule) the oil is also brought to
+    temperature ahead of the expected rushes, lead_for(temp) seconds early.
+    """
+
+    def __init__(self, config, forecast=None, lead_for=None):
+        self.config = config
+        self.forecast = forecast
+        self.lead_for = lead_for or (lambda temp: 0.0)
+        self.category = None
+        self.idle_since = None
+        self.boost = None  # (setpoint, until)
+        self.mode = "off"
+
+    def settings(self, category=None):
+        settings = {k: v for k, v in self.config.items() if k not in ("enabled", "categories")}
+        settings.update(self.config.get("categories", {}).get(category or self.category, {}))
+        return settings
+
+    def busy(self, now, category=None):
+        """Called on every tick with a cook or manual heat running."""
+        if category:
+            self.category = category
+        self.idle_since = now
+        self.boost = None
+        self.mode = "busy"
+
+    def stop(self):
+        """Heaters stay off until the next cook (emergency stop)."""
+        self.idle_since = None
+        self.boost = None
+        self.mode = "off"
+
+    def order_tapped(self, category, setpoint, now):
+        if not self.config.get("enabled", True):
+            return
+        self.category = category or self.category
+        self.boost = (setpoint, now + self.settings(category)["boost_time"])
+
+    def plan(self, now, wall=None):
+        """(setpoint, max demand) for this idle tick, or None for heaters off."""
+        if not self.config.get("enabled", True):
+            self.mode = "off"
+            return None
+        if self.boost and now < self.boost[1]:
+            self.mode = "boost"
+            return self.boost[0], 1.0
+        self.boost = None
+        settings = self.settings()
+        window = self.forecast.target(wall, self.lead_for) if self.forecast and wall is not None else None
+        if window and window[0] == "preheat":
+            self.mode = "preheat"
+            return window[1], 1.0
+        if window:
+            self.mode = "standby"
+            return settings["standby_temp"], settings["standby_power"]
+        idle = now - self.idle_since if self.idle_since is not None else None
+        if idle is None or idle >= settings["off_after"]:
+            self.mode = "off"
+            return None
+        if idle >= settings["standby_after"]:
+            self.mode = "standby"
+            return settings["standby_temp"], settings["standby_power"]
+        self.mode = "cooling"
+        return None
@@ -0,0 +1,177 @@
+"""Forecast demand from cook history and write a preheat schedule.
+
+    python forecast.py [--weeks 8] [--output preheat_schedule.json]
+
+Counts the cooks of every item in each 15-minute slot of each weekday
+over the last --weeks weeks and divides by how many of that weekday the
+history covers, giving expected orders per slot. Slots busy enough to
+expect forecast.preheat_orders orders become preheat windows at the
+setpoint of their most ordered item. Quieter slots with at least
+forecast.standby_orders become standby windows. Run it nightly (cron);
+the controller picks up the new file by itself and follows it while idle.
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from clock import MonotonicClock
+from config import load_config
+from history import CookHistoryStore
+
+log = logging.getLogger(__name__)
+
+WEEK = 7 * 24 * 3600
+
+
+def local_times(started_at):
+    """History timestamps (naive UTC) in this unit's local time."""
+    local = datetime.datetime.now().astimezone().tzinfo
+    return started_at.dt.tz_localize("UTC").dt.tz_convert(local)
+
+
+def demand_profile(df, slot_minutes=15, weeks=None):
+    """Expected orders per (weekday, slot, item), plus each item's usual setpoint."""
+    if weeks:
+        df = df[df["started_at"] >= df["started_at"].max() - pd.Timedelta(weeks=weeks)]
+    if df.empty:
+        return pd.DataFrame(columns=["weekday", "slot", "item", "orders", "setpoint"])
+    started = local_times(df["started_at"])
+    orders = pd.DataFrame({
+        "weekday": started.dt.weekday.to_numpy(),
+        "slot": ((started.dt.hour * 60 + started.dt.minute) // slot_minutes).to_numpy(),
+        "item": df["item"].to_numpy(),
+    })
+    counts = orders.groupby(["weekday", "slot", "item"]).size().rename("orders").reset_index()
+    # Average over every occurrence of the weekday in the covered span,
+    # including the days nothing was cooked.
+    days = pd.date_range(started.min().normalize(), started.max().normalize(), freq="D")
+    per_weekday = np.bincount(days.weekday, minlength=7)
+    counts["orders"] = counts["orders"] / per_weekday[counts["weekday"].to_numpy()]
+    setpoints = df.groupby("item")["setpoint"].median()
+    counts["setpoint"] = setpoints.reindex(counts["item"]).to_numpy()
+    return counts
+
+
+def build_schedule(profile, slot_minutes=15, preheat_orders=2.0, standby_orders=0.5):
+    """Merge busy slots into [{weekday, start, end, mode, temp}] windows (minutes of the day).
+
+    A slot counts at least as busy as the mean of itself and its neighbours,
+    so one quiet quarter hour doesn't split a rush in two.
+    """
+    if profile.empty:
+        return []
+    slots_per_day = 24 * 60 // slot_minutes
+    weekday = profile["weekday"].to_numpy(dtype=int)
+    slot = profile["slot"].to_numpy(dtype=int)
+    totals = np.zeros((7, slots_per_day))
+    np.add.at(totals, (weekday, slot), profile["orders"].to_numpy(dtype=float))
+    padded = np.pad(totals, ((0, 0), (1, 1)))
+    level = np.maximum(totals, (padded[:, :-2] + padded[:, 1:-1] + padded[:, 2:]) / 3.0)
+
+    # Each slot heads for the usual setpoint of its most ordered item; slots
+    # that only became busy by smoothing borrow it from their neighbours.
+    top = profile.loc[profile.groupby(["weekday", "slot"])["orders"].idxmax()]
+    temps = np.full((7, slots_per_day), np.nan)
+    temps[top["weekday"].to_numpy(dtype=int), top["slot"].to_numpy(dtype=int)] = top["setpoint"].to_numpy()
+    temps = pd.DataFrame(temps).ffill(axis=1).bfill(axis=1).to_numpy()
+
+    modes = np.where(level >= preheat_orders, "preheat", np.where(level >= standby_orders, "standby", ""))
+    windows = []
+    for day, index in zip(*np.nonzero(modes != "")):
+        mode, temp, orders = str(modes[day, index]), int(round(temps[day, index])), float(totals[day, index])
+        start = int(index) * slot_minutes
+        last = windows[-1] if windows else None
+        if (last and last["weekday"] == day and last["end"] == start and last["mode"] == mode
+                and (mode == "standby" or last["temp"] == temp)):
+            last["end"] = start + slot_minutes
+            last["orders"] = round(last["orders"] + orders, 2)
+            continue
+        windows.append({"weekday": int(day), "start": start, "end": start + slot_minutes,
+                        "mode": mode, "temp": temp, "orders": round(orders, 2)})
+    return windows
+
+
+class PreheatSchedule:
+    """The forecast windows, checked against the controller's wall clock.
+
+    The file is re-read when it changes (looked at once a minute on
+    clock), so a nightly retrain takes effect without a restart.
+    """
+
+    def __init__(self, path, clock=None):
+        self.path = path
+        self.clock = clock or MonotonicClock()
+        self.windows = []
+        self.mtime = None
+        self.checked = float("-inf")
+
+    def refresh(self):
+        now = self.clock.now()
+        if now - self.checked < 60:
+            return
+        self.checked = now
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self.mtime:
+                return
+            with open(self.path, "r") as f:
+                self.windows = json.load(f)["windows"]
+            self.mtime = mtime
+        except FileNotFoundError:
+            self.windows = []
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("Ignoring unreadable preheat schedule %s: %s", self.path, e)
+
+    def target(self, wall, lead_for):
+        """(mode, temp) of the window that is on, or due within lead_for(temp)
+        seconds, at wall time; None outside every window. A preheat wins over
+        a standby window it overlaps with."""
+        self.refresh()
+        local = time.localtime(wall)
+        now = local.tm_wday * 86400 + local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec
+        found = None
+        for window in self.windows:
+            start = window["weekday"] * 86400 + window["start"] * 60
+            length = (window["end"] - window["start"]) * 60
+            if (now - start) % WEEK < length or (start - now) % WEEK <= lead_for(window["temp"]):
+                found = (window["mode"], window["temp"])
+                if found[0] == "preheat":
+                    break
+        return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the preheat schedule from cook history")
+    parser.add_argument("--config", default="fryer_config.json")
+    parser.add_argument("--weeks", type=int, help="weeks of history to learn from")
+    parser.add_argument("--output", help="schedule file (default: forecast.file from the config)")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    forecast = config["forecast"]
+    history = config["history"]
+    df = CookHistoryStore(history["dir"], history["compact_after"]).load()
+    profile = demand_profile(df, forecast["slot_minutes"], args.weeks or forecast["weeks"])
+    windows = build_schedule(profile, forecast["slot_minutes"], forecast["preheat_orders"],
+                             forecast["standby_orders"])
+    output = args.output or forecast["file"]
+    with open(output + ".tmp", "w") as f:
+        json.dump({"built_at": time.time(), "cooks": int(len(df)), "windows": windows}, f, indent=4)
+    os.replace(output + ".tmp", output)
+    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    for w in windows:
+        print(f"{days[w['weekday']]} {w['start'] // 60:02}:{w['start'] % 60:02}-{w['end'] // 60:02}:{w['end'] % 60:02}"
+              f"  {w['mode']:8} {w['temp']}°C  ~{w['orders']:.1f} orders")
+    print(f"{len(windows)} windows from {len(df)} cooks -> {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,29 @@
+import logging
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import time
 import json
 import os
-from PIL import Image, ImageTk
+from PIL import Image
 import pandas as pd
 import shutil
-import serial
-import threading
-import re
 import sys
+from clock import MonotonicClock, TkScheduler
+from config import load_config
+from controlproc import make_controller
+from history import throughput_report
+from keypads import NumericKeypad, OnScreenKeyboard
+from logs import LEVELS, get_level, setup_logging
+from memwatch import ImageCache, MemoryWatchdog
+from menuwatch import diff_menu, make_watcher
+from touchscroll import SwipeScroller
+from recipes import compile_menu, compile_stages, profile_from_stages, stages_from_params, validate_stage
+
+# Run as a script, so __name__ would be __main__
+log = logging.getLogger("fryer")
 
 class SmartFryerGUI:
-    def __init__(self, root):
+    def __init__(self, root, driver=None):
         self.root = root
         self.root.title("Smart Induction Fryer")
         self.root.geometry("800x480")
@@ -24,107 +35,66 @@ class SmartFryerGUI:
         self.root.bind_all("<Control-q>", lambda e: "break")
         self.root.bind_all("<Alt-F4>", lambda e: "break")
 
-        self.current_temp = 25.0
-        self.frying_active = False
-        self.target_temperature = 180
-        self.frying_time = 0
-        self.basket_state = "raised"
+        self.config = load_config()
+        if driver:
+            self.config["serial"]["driver"] = driver
+        # In thread mode the controller shares this process, raw serial log included
+        self.logs = setup_logging(self.config, serial=self.config["process"]["mode"] != "process")
 
         self.menu_data = self.load_menu_data()
+        self.schedules = compile_menu(self.menu_data)
         self.image_dir = "images"
+        self.image_cache = ImageCache(self.config["memory"]["image_budget_mb"] * 1024 * 1024)
         if not os.path.exists(self.image_dir):
             os.makedirs(self.image_dir)
 
-        # Serial config
-        self.ser_port = '/dev/serial0'  # RPi GPIO serial
-        self.baudrate = 9600
-        
-        # Relay states
-        self.heating1_state = False
-        self.heating2_state = False
-        
-        # Initialize serial
-        self.ser = None
-        self.connect_serial()
+        # Serial, heaters and the frying worker live in the controller,
+        # normally in a process of its own (process.mode)
+        self.clock = MonotonicClock()
+        self.scheduler = TkScheduler(self.root, self.clock)
+        self.controller = make_controller(self.config, self.clock)
+        self.controller.on_status = self.update_frying_status
+        self.controller.start()
         
         # GUI Setup
         self.create_widgets()
+        # Built once and shown inside whichever screen needs them; clear_root leaves these alone
+        self.keyboard = OnScreenKeyboard(self.root)
+        self.keypad = NumericKeypad(self.root)
+        self.persistent = {self.keyboard.frame, self.keypad.frame}
         self.running = True
         self.start_temp_monitoring()
+        self.start_menu_watch()
+        self.start_memory_watch()
         self.show_category()
-
-    def connect_serial(self):
-        try:
-            self.ser = serial.Serial(self.ser_port, self.baudrate, timeout=1)
-            print(f"Connected to serial port {self.ser_port}")
-            time.sleep(2)  # Allow time for Arduino to initialize
-        except serial.SerialException as e:
-            print(f"Failed to connect to serial port {self.ser_port}: {e}")
+        self.show_recovery()
+
+    def show_recovery(self):
+        """Tell the operator about the cooks picked up from the crash checkpoints."""
+        recovery = self.controller.recovery
+        if any(entry["action"] == "resumed" for entry in recovery):
+            self.show_frying_screen()
+        for entry in recovery:
+            if entry["action"] == "resumed":
+                self.update_frying_status(f"Resumed after restart ({entry['gap']:.0f}s outage)", entry["basket"])
+            else:
+                messagebox.showwarning("Cook interrupted",
+                                       f"{entry['item']} in basket {entry['basket'] + 1} was interrupted by a "
+                                       f"restart ({entry['gap']:.0f}s). The basket has been raised; "
+                                       "check the food before serving.")
 
     def start_temp_monitoring(self):
         def update_temp():
-            try:
-                if self.ser and self.ser.is_open:
-                    self.ser.flushInput()
-                    line = self.ser.readline().decode('utf-8', errors='ignore').strip()
-                    if line:
-                        print(f"Raw serial data: '{line}'")
-                        with open("serial_log.txt", "a") as f:
-                            f.write(f"Raw serial data: '{line}'\n")
-                        match = re.search(r"[\d]+\.?\d*\s*°?C", line)
-                        if match:
-                            temp_str = match.group(0).replace("°C", "").strip()
-                            self.current_temp = float(temp_str)
-                            print(f"Parsed Temp: {self.current_temp:.1f}°C")
-                        else:
-                            print(f"Failed to parse temperature from: '{line}'")
-                    else:
-                        print("No serial data received")
-                    # Control heating
-                    if self.frying_active:
-                        if self.current_temp < self.target_temperature - 2:
-                            self.send_serial_command("HEATING_1_ON")
-                            self.send_serial_command("HEATING_2_ON")
-                        else:
-                            self.send_serial_command("HEATING_1_OFF")
-                            self.send_serial_command("HEATING_2_OFF")
-                    else:
-                        self.send_serial_command("HEATING_1_OFF")
-                        self.send_serial_command("HEATING_2_OFF")
-                    self.current_temp = min(max(self.current_temp, 20), 250)
-                else:
-                    print("Serial port not open, using fallback temperature")
-                    self.current_temp += 0.1 if self.frying_active else -0.1
-                    self.current_temp = min(max(self.current_temp, 20), 250)
-            except Exception as e:
-                print(f"Error reading serial: {e}")
+            if not self.running:
+                self.scheduler.cancel(self.temp_job)
+                return
+            self.controller.control_tick()
             self.update_taskbar()
-            if self.running:
-                self.root.after(500, update_temp)
-        self.root.after(500, update_temp)
-
-    def send_serial_command(self, command, retries=4):
-        if not self.ser or not self.ser.is_open:
-            print("Serial port is not open")
-            return False
-        success = True
-        for i in range(retries):
-            try:
-                self.ser.flushInput()
-                self.ser.write(f"{command}\n".encode())
-                print(f"Sent command: {command} (Attempt {i+1}/{retries})")
-                self.ser.flush()
-                time.sleep(0.1)
-            except serial.SerialException as e:
-                print(f"Serial write failed for '{command}' (Attempt {i+1}/{retries}): {e}")
-                success = False
-        if success and command == "LOWER_BASKET":
-            self.basket_state = "lowered"
-        elif success and command == "RAISE_BASKET":
-            self.basket_state = "raised"
-        return success
-
-    def load_menu_data(self):
+        # The controller picks the period: its phase-adaptive loop rate in
+        # thread mode, the UI poll interval in process mode
+        self.temp_job = self.scheduler.call_every(self.controller.control_period, update_temp)
+
+    def load_menu_data(self, fallback=True):
         default_menu = {
             "VEG": {
                 "Samosa": {"temp": 170, "time": 90},
@@ -166,8 +136,8 @@ class SmartFryerGUI:
             }
         }
         try:
-            if os.path.exists("menu_data.json"):
-                with open("menu_data.json", "r") as f:
+            if os.path.exists(self.config["menu"]["file"]):
+                with open(self.config["menu"]["file"], "r") as f:
                     data = json.load(f)
                     for cat in default_menu:
                         if cat not in data:
@@ -177,28 +147,95 @@ class SmartFryerGUI:
                                 data[cat][item] = params
                     return data
         except Exception as e:
-            print(f"Failed to load menu_data.json: {e}")
+            log.error("Failed to load %s: %s", self.config['menu']['file'], e)
+            if not fallback:
+                return None
         return default_menu
 
     def save_menu_data(self):
         try:
-            with open("menu_data.json", "w") as f:
+            path = self.config["menu"]["file"]
+            with open(path + ".tmp", "w") as f:
                 json.dump(self.menu_data, f, indent=4)
+            os.replace(path + ".tmp", path)
         except Exception as e:
-            print(f"Failed to save menu_data.json: {e}")
+            log.error("Failed to save %s: %s", self.config['menu']['file'], e)
+
+    def start_menu_watch(self):
+        """Pick up edits to the menu file (fleet pushes, manual edits) while running."""
+        menu = self.config["menu"]
+        self.menu_watcher = make_watcher(menu["file"], menu["watch"])
+        self.menu_view = None
+        self.menu_retry = False
+
+        def check_menu():
+            if self.menu_watcher.changed() or self.menu_retry:
+                self.reload_menu()
+        self.menu_watch_job = self.scheduler.call_every(menu["watch_interval"], check_menu)
+
+    def reload_menu(self):
+        """Apply the menu file item by item: only changed catalog entries are
+        recompiled and only their cards touched. A cook already running keeps
+        the schedule it started with."""
+        self.menu_retry = False
+        if not os.path.exists(self.config["menu"]["file"]):
+            return
+        new_menu = self.load_menu_data(fallback=False)
+        if new_menu is None:
+            # Most likely caught mid-write; try again on the next check.
+            self.menu_retry = True
+            return
+        added, removed, changed = diff_menu(self.menu_data, new_menu)
+        if not (added or removed or changed):
+            return
+        for category, item in removed:
+            del self.menu_data[category][item]
+            self.schedules.pop((category, item), None)
+        for category, item in added + changed:
+            params = new_menu[category][item]
+            self.menu_data.setdefault(category, {})[item] = params
+            self.schedules.pop((category, item), None)
+            self.schedules.update(compile_menu({category: {item: params}}))
+        log.info("Menu reloaded: %d added, %d removed, %d changed", len(added), len(removed), len(changed))
+        self.patch_menu_view(added, removed, changed)
+
+    def patch_menu_view(self, added, removed, changed):
+        """Bring the menu screen on display in line with the catalog, card by card."""
+        view = self.menu_view
+        if not view or not view["frame"].winfo_exists():
+            return
+        category, cards = view["category"], view["cards"]
+        for cat, item in removed:
+            if cat == category and item in cards:
+                cards.pop(item)["card"].destroy()
+        for cat, item in changed:
+            if cat == category and item in cards:
+                self.fill_menu_card(cards[item], category, item, self.menu_data[category][item])
+        for cat, item in added:
+            if cat == category:
+                cards[item] = self.build_menu_card(view["frame"], category, item,
+                                                   self.menu_data[category][item], len(cards))
+        if any(cat == category for cat, _ in added + removed):
+            for column, item in enumerate(self.menu_data[category]):
+                cards[item]["card"].grid_configure(column=column)
+            view["refresh"]()
 
     def create_taskbar(self, back_command=None, show_emergency=False):
         taskbar = tk.Frame(self.root, bg="#111")
         taskbar.pack(side="top", fill="x")
 
-        self.temp_label = tk.Label(taskbar, text=f"Current Temp: {self.current_temp:.1f}°C",
+        self.temp_label = tk.Label(taskbar, text=f"Current Temp: {self.controller.current_temp:.1f}°C",
                                    font=("Arial", 14), bg="#111", fg="white")
         self.temp_label.pack(side="left", padx=10)
 
+        self.link_label = tk.Label(taskbar, text="", font=("Arial", 12, "bold"), bg="#111", fg="red")
+        self.link_label.pack(side="left", padx=10)
+
         if show_emergency:
             self.emergency_button = tk.Button(taskbar, text="EMERGENCY STOP", font=("Arial", 12, "bold"),
-                                             bg="red", fg="white", activebackground="#990000",
-                                             command=self.emergency_stop_handler)
+                                             bg="red", fg="white", activebackground="#990000")
+            # Fire on press rather than release; every millisecond counts here.
+            self.emergency_button.bind("<ButtonPress-1>", lambda e: self.emergency_stop_handler())
             self.emergency_button.pack(side="right", padx=10)
 
         if back_command:
@@ -231,54 +268,21 @@ class SmartFryerGUI:
         self.long_press_job = None
         self.press_start_time = None
 
-    def create_keyboard(self, parent, entry):
-        keyboard_frame = tk.Frame(parent, bg="black")
-        keyboard_frame.pack(pady=10)
-
-        buttons = [
-            '1', '2', '3', '4', '5', '6', '7', '8', '9', '0',
-            'q', 'w', 'e', 'r', 't', 'y', 'u', 'i', 'o', 'p',
-            'a', 's', 'd', 'f', 'g', 'h', 'j', 'k', 'l', '/',
-            'z', 'x', 'c', 'v', 'b', 'n', 'm', '.', '_', ' ',
-            'Clear', 'Del', 'Enter'
-        ]
-
-        def on_key_click(value):
-            if value == 'Clear':
-                entry.delete(0, tk.END)
-            elif value == 'Del':
-                current = entry.get()
-                entry.delete(0, tk.END)
-                entry.insert(0, current[:-1])
-            elif value == 'Enter':
-                entry.event_generate('<Return>')
-            else:
-                entry.insert(tk.END, value)
-
-        row = 0
-        col = 0
-        for button in buttons:
-            cmd = lambda val=button: on_key_click(val)
-            btn = tk.Button(keyboard_frame, text=button, font=("Arial", 12),
-                            width=4 if button not in ['Clear', 'Del', 'Enter'] else 8,
-                            height=2, bg="#333", fg="white", activebackground="#555",
-                            command=cmd)
-            btn.grid(row=row, column=col, padx=2, pady=2)
-            btn.bind("<ButtonPress-1>", lambda e, b=btn: b.config(bg="#555"))
-            btn.bind("<ButtonRelease-1>", lambda e, b=btn: b.config(bg="#333"))
-            col += 1
-            if col > 9:
-                col = 0
-                row += 1
-
-        return keyboard_frame
+    def open_overlay(self):
+        """Full-screen panel over the current screen. Unlike a Toplevel it
+        can host the shared keyboards, and the screen under it stays intact."""
+        win = tk.Frame(self.root, bg="black")
+        win.place(x=0, y=0, relwidth=1, relheight=1)
+        win.lift()
+        return win
+
+    def close_overlay(self, win):
+        self.keyboard.hide()
+        self.keypad.hide()
+        win.destroy()
 
     def show_admin_password_prompt(self):
-        win = tk.Toplevel(self.root)
-        win.geometry("800x480")
-        win.attributes('-fullscreen', True)
-        win.config(cursor="none")
-        win.configure(bg="black")
+        win = self.open_overlay()
 
         tk.Label(win, text="Enter Admin Password", font=("Arial", 22, "bold"),
                  bg="black", fg="white").pack(pady=20)
@@ -287,11 +291,11 @@ class SmartFryerGUI:
         password_entry.pack(pady=10)
         password_entry.focus_set()
 
-        keyboard_frame = self.create_keyboard(win, password_entry)
+        self.keyboard.show(win, [password_entry], pady=10)
 
         def verify_password(event=None):
             if password_entry.get() == "admin123":
-                win.destroy()
+                self.close_overlay(win)
                 self.show_admin_panel()
             else:
                 messagebox.showerror("Error", "Incorrect password")
@@ -308,7 +312,7 @@ class SmartFryerGUI:
 
         tk.Button(button_frame, text="Cancel", font=("Arial", 16),
                   bg="red", fg="white", activebackground="#990000",
-                  width=10, height=2, command=win.destroy).pack(side="left", padx=5)
+                  width=10, height=2, command=lambda: self.close_overlay(win)).pack(side="left", padx=5)
 
     def show_admin_panel(self):
         self.clear_root()
@@ -327,7 +331,7 @@ class SmartFryerGUI:
         file_entry = tk.Entry(frame, font=("Arial", 14), width=30)
         file_entry.pack(pady=5)
 
-        self.create_keyboard(frame, file_entry)
+        self.keyboard.show(frame, [file_entry], pady=10)
 
         def select_file():
             file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
@@ -351,6 +355,105 @@ class SmartFryerGUI:
                   bg="#00cc66", fg="white", activebackground="#009900",
                   width=10, height=2, command=lambda: upload_file()).pack(side="left", padx=5)
 
+        tk.Button(button_frame, text="Reports", font=("Arial", 14),
+                  bg="#555", fg="white", activebackground="#777",
+                  width=10, height=2, command=self.show_cook_reports).pack(side="left", padx=5)
+
+        tk.Button(button_frame, text="Memory", font=("Arial", 14),
+                  bg="#555", fg="white", activebackground="#777",
+                  width=10, height=2, command=self.show_memory_report).pack(side="left", padx=5)
+
+        self.log_button = tk.Button(button_frame, text=f"Log: {get_level()}", font=("Arial", 14),
+                                    bg="#555", fg="white", activebackground="#777",
+                                    width=10, height=2, command=self.cycle_log_level)
+        self.log_button.pack(side="left", padx=5)
+
+    def cycle_log_level(self):
+        level = LEVELS[(LEVELS.index(get_level()) + 1) % len(LEVELS)]
+        self.controller.set_log_level(level)
+        self.log_button.config(text=f"Log: {level}")
+
+    def start_memory_watch(self):
+        self.memory_watch = MemoryWatchdog(self.root, self.image_cache, self.config["memory"])
+        self.memory_watch.sample()
+        self.memory_watch_job = self.scheduler.call_every(self.config["memory"]["interval"], self.memory_watch.sample)
+
+    def show_memory_report(self, snapshot=None):
+        self.clear_root()
+        self.create_taskbar(self.show_admin_panel)
+        self.root.configure(bg="#f0f0f0")
+
+        tk.Label(self.root, text="Memory", font=("Arial", 22),
+                 fg="#222", bg="#f0f0f0").pack(pady=10)
+
+        self.memory_watch.sample()
+        report = self.memory_watch.report()
+        summary = (f"Resident: {report['rss_mb']:.0f} MB of {report['budget_mb']:.0f} MB budget    "
+                   f"Trend: {report['rss_mb_per_hour']:+.1f} MB/h over {report['hours']:.1f} h\n"
+                   f"Tk widgets: {report['widgets']}  ({report['widgets_per_hour']:+.0f}/h)    "
+                   f"Image cache: {report['images']} photos, {report['image_mb']:.1f} MB    "
+                   f"Budget evictions: {report['evictions']}")
+        tk.Label(self.root, text=summary, font=("Arial", 14), fg="#222", bg="#f0f0f0",
+                 justify="left").pack(pady=5)
+
+        button_frame = tk.Frame(self.root, bg="#f0f0f0")
+        button_frame.pack(pady=5)
+
+        def release_caches():
+            self.image_cache.clear()
+            self.show_memory_report()
+
+        tk.Button(button_frame, text="Snapshot", font=("Arial", 14),
+                  bg="#3366cc", fg="white", activebackground="#224488", width=12, height=2,
+                  command=lambda: self.show_memory_report(self.memory_watch.snapshot())).pack(side="left", padx=5)
+        tk.Button(button_frame, text="Clear Caches", font=("Arial", 14),
+                  bg="#555", fg="white", activebackground="#777", width=12, height=2,
+                  command=release_caches).pack(side="left", padx=5)
+
+        if snapshot:
+            tk.Label(self.root, text="\n".join(snapshot), font=("Courier", 9), fg="#222", bg="#f0f0f0",
+                     justify="left", wraplength=780).pack(pady=5)
+
+    def show_cook_reports(self):
+        self.clear_root()
+        self.create_taskbar(self.show_admin_panel)
+        self.root.configure(bg="#f0f0f0")
+
+        tk.Label(self.root, text="Cook Reports", font=("Arial", 22),
+                 fg="#222", bg="#f0f0f0").pack(pady=10)
+
+        try:
+            report = throughput_report(self.controller.history.load())
+        except Exception as e:
+            tk.Label(self.root, text=f"Failed to load cook history: {e}", font=("Arial", 14),
+                     fg="red", bg="#f0f0f0").pack(pady=10)
+            return
+        if not report["cooks"]:
+            tk.Label(self.root, text="No cooks recorded yet", font=("Arial", 16),
+                     fg="#222", bg="#f0f0f0").pack(pady=10)
+            return
+
+        summary = (f"Cooks: {report['cooks']}  (aborted {report['aborted']})    "
+                   f"Items/hour: {report['items_per_hour']:.1f}  (peak {report['peak_items_per_hour']})\n"
+                   f"Mean preheat: {report['mean_preheat']:.0f}s    "
+                   f"Preheat share of busy time: {report['preheat_share'] * 100:.0f}%")
+        tk.Label(self.root, text=summary, font=("Arial", 14), fg="#222", bg="#f0f0f0",
+                 justify="left").pack(pady=5)
+
+        table = tk.Frame(self.root, bg="#f0f0f0")
+        table.pack(pady=5)
+        headers = ["Item", "Cooks", "Time", "Std", "Overrun", "Drop °C", "Recovery"]
+        for col, header in enumerate(headers):
+            tk.Label(table, text=header, font=("Arial", 12, "bold"), fg="#222",
+                     bg="#f0f0f0").grid(row=0, column=col, padx=6)
+        for row, (item, stats) in enumerate(report["per_item"].head(10).iterrows(), start=1):
+            values = [item, f"{stats['cooks']:.0f}", f"{stats['mean_time']:.0f}s", f"{stats['time_std']:.1f}s",
+                      f"{stats['overrun']:+.0f}s", f"{stats['mean_drop']:.1f}",
+                      f"{stats['mean_recovery']:.0f}±{stats['recovery_std']:.0f}s"]
+            for col, value in enumerate(values):
+                tk.Label(table, text=value, font=("Arial", 12), fg="#222",
+                         bg="#f0f0f0").grid(row=row, column=col, padx=6)
+
     def upload_excel(self, file_path):
         if not file_path or not os.path.exists(file_path):
             messagebox.showerror("Error", "Please select a valid Excel file")
@@ -363,12 +466,18 @@ class SmartFryerGUI:
                 messagebox.showerror("Error", "Excel file must contain columns: Category, Item Name, Temperature (°C), Time (seconds)")
                 return
 
+            # Optional "Stage" column: several rows for one item build a multi-stage profile,
+            # with optional "Rest (seconds)" and "Basket" (down/up) per stage.
+            staged_items = {}
             for index, row in df.iterrows():
                 try:
                     category = str(row["Category"]).strip().upper()
                     item_name = str(row["Item Name"]).strip()
                     temp = int(float(row["Temperature (°C)"]))
                     time_secs = int(float(row["Time (seconds)"]))
+                    stage_no = None
+                    if "Stage" in df.columns and pd.notna(row["Stage"]):
+                        stage_no = int(float(row["Stage"]))
 
                     if category not in ["VEG", "NON-VEG"]:
                         messagebox.showerror("Error", f"Invalid category '{category}' for item '{item_name}'. Must be VEG or NON-VEG.")
@@ -391,17 +500,31 @@ class SmartFryerGUI:
                                 img = img.resize((80, 80), Image.LANCZOS)
                                 img.save(image_path)
                             except Exception as e:
-                                print(f"Failed to process image for {item_name}: {e}")
+                                log.error("Failed to process image for %s: %s", item_name, e)
                         else:
-                            print(f"Image path {src_image} does not exist for {item_name}")
+                            log.warning("Image path %s does not exist for %s", src_image, item_name)
 
                     if category not in self.menu_data:
                         self.menu_data[category] = {}
-                    self.menu_data[category][item_name] = {"temp": temp, "time": time_secs}
+                    if stage_no is None:
+                        self.menu_data[category][item_name] = {"temp": temp, "time": time_secs}
+                        continue
+                    stage = {"temp": temp, "time": time_secs}
+                    if "Rest (seconds)" in df.columns and pd.notna(row["Rest (seconds)"]):
+                        stage["rest"] = int(float(row["Rest (seconds)"]))
+                    if "Basket" in df.columns and pd.notna(row["Basket"]):
+                        stage["basket"] = str(row["Basket"]).strip().lower()
+                    staged_items.setdefault((category, item_name), []).append((stage_no, validate_stage(stage)))
                 except (ValueError, TypeError) as e:
                     messagebox.showerror("Error", f"Invalid data for row {index + 2}: {e}")
                     continue
 
+            for (category, item_name), stages in staged_items.items():
+                stages.sort(key=lambda s: s[0])
+                self.menu_data[category][item_name] = profile_from_stages([stage for _, stage in stages])
+
+            self.schedules = compile_menu(self.menu_data)
+            self.image_cache.clear()  # item photos may have been replaced
             self.save_menu_data()
             messagebox.showinfo("Success", "Items uploaded successfully!")
             self.show_category()
@@ -410,20 +533,15 @@ class SmartFryerGUI:
             messagebox.showerror("Error", f"Failed to process Excel file: {e}")
 
     def emergency_stop_handler(self):
-        self.frying_active = False
-        self.send_serial_command("HEATING_1_OFF")
-        self.send_serial_command("HEATING_2_OFF")
-        
-        if not self.send_serial_command("RAISE_BASKET"):
-            print("Failed to send RAISE_BASKET command")
-            self.update_frying_status("Warning: Basket raising command failed")
+        if not self.controller.emergency_stop():
+            log.error("Failed to send emergency stop frame")
+            self.update_frying_status("Warning: Emergency stop command failed")
         
         if hasattr(self, 'emergency_button'):
             self.emergency_button.config(state='disabled')
         
-        if hasattr(self, 'frying_window') and self.frying_window.winfo_exists():
-            self.frying_window.destroy()
-            self.show_emergency_window()
+        # frying_window is the root window itself; swap the screen rather than destroying it.
+        self.show_emergency_window()
 
     def show_emergency_window(self):
         self.clear_root()
@@ -443,23 +561,26 @@ class SmartFryerGUI:
                   padx=15, pady=5, command=self.reset_system).pack(pady=20)
 
     def reset_system(self):
-        self.frying_active = False
-        if not self.send_serial_command("RAISE_BASKET"):
-            print("Failed to send RAISE_BASKET command")
-        self.send_serial_command("HEATING_1_OFF")
-        self.send_serial_command("HEATING_2_OFF")
+        if not self.controller.reset():
+            log.error("Failed to send RAISE_BASKET command")
         self.show_category()
 
     def clear_root(self):
+        self.menu_view = None
+        self.keyboard.reset()
+        self.keypad.reset()
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if widget not in self.persistent:
+                widget.destroy()
 
     def update_taskbar(self):
         try:
             if hasattr(self, 'temp_label') and self.temp_label.winfo_exists():
-                self.temp_label.config(text=f"Current Temp: {self.current_temp:.1f}°C")
+                self.temp_label.config(text=f"Current Temp: {self.controller.current_temp:.1f}°C")
+            if hasattr(self, 'link_label') and self.link_label.winfo_exists():
+                self.link_label.config(**self.controller.link_status())
         except tk.TclError as e:
-            print(f"Tkinter error in update_taskbar: {e}")
+            log.warning("Tkinter error in update_taskbar: %s", e)
 
     def create_widgets(self):
         pass  # Placeholder; widgets created in show_category
@@ -477,13 +598,18 @@ class SmartFryerGUI:
 
         veg_button = tk.Button(button_frame, text="VEG", font=("Arial", 28, "bold"),
                                bg="green", fg="white", activebackground="#009900",
-                               width=20, height=10, command=lambda: self.show_menu("VEG"))
-        veg_button.pack(side="left", padx=20, pady=20)
+                               width=15, height=8, command=lambda: self.show_menu("VEG"))
+        veg_button.pack(side="left", padx=10, pady=20)
 
         non_veg_button = tk.Button(button_frame, text="NON-VEG", font=("Arial", 28, "bold"),
                                    bg="red", fg="white", activebackground="#990000",
-                                   width=20, height=10, command=lambda: self.show_menu("NON-VEG"))
-        non_veg_button.pack(side="right", padx=20, pady=20)
+                                   width=15, height=8, command=lambda: self.show_menu("NON-VEG"))
+        non_veg_button.pack(side="left", padx=10, pady=20)
+
+        manual_button = tk.Button(button_frame, text="MANUAL", font=("Arial", 28, "bold"),
+                                  bg="blue", fg="white", activebackground="#224488",
+                                  width=15, height=8, command=self.show_manual_controls)
+        manual_button.pack(side="left", padx=10, pady=20)
 
     def show_menu(self, category):
         self.clear_root()
@@ -501,86 +627,34 @@ class SmartFryerGUI:
         scroll_frame = tk.Frame(canvas, bg="#1e1e2f")
         canvas.create_window((0, 0), window=scroll_frame, anchor='nw')
 
-        self.images = []
-        x = 0
-        for item, data in self.menu_data[category].items():
-            card = tk.Frame(scroll_frame, bd=5, relief=tk.RIDGE, bg="#2e2e40", width=200, height=360)
-            card.grid(row=0, column=x, padx=10, pady=10)
-            card.grid_propagate(False)
+        cards = {}
+        for x, (item, data) in enumerate(self.menu_data[category].items()):
+            cards[item] = self.build_menu_card(scroll_frame, category, item, data, x)
 
-            image_filename = item.replace(" ", "_") + ".png"
-            image_path = os.path.join(self.image_dir, image_filename)
-            try:
-                img = Image.open(image_path)
-                img = img.resize((150, 150), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                image_label = tk.Label(card, image=photo, bg="#2e2e40")
-                image_label.pack(pady=3)
-                self.images.append(photo)
-            except Exception as e:
-                print(f"Failed to load image {image_path}: {e}")
-                placeholder_label = tk.Label( card, text="[No Image]", font=("Arial", 10), bg="#2e2e40", fg="white")
-                placeholder_label.pack(pady=100)
-
-            tk.Label(card, text=item, font=("Arial", 20, "bold"), fg="white", bg="#2e2e40", wraplength=160).pack(pady=2)
-            tk.Label(card, text=f"TEMP: {data['temp']}°C", font=("Arial", 16), fg="white", bg="#2e2e40").pack(pady=1)
-            minutes, seconds = divmod(data['time'], 60)
-            tk.Label(card, text=f"Time: {minutes}m {seconds}s", font=("Arial", 16), fg="white", bg="#2e2e40").pack(pady=1)
-
-            button_frame = tk.Frame(card, bg="#2e2e40")
-            button_frame.pack(pady=2)
-            start_cmd = lambda i=item, t=data['temp'], d=data['time']: self.start_frying(i, t, d)
-            custom_cmd = lambda i=item, t=data['temp'], d=data['time']: self.custom_settings(i, t, d)
-
-            start_button = tk.Button(button_frame, text="Start", font=("Arial", 16), bg="#00cc66", fg="white",
-                                    activebackground="#009900", width=6, height=1, command=start_cmd)
-            start_button.pack(side="left", padx=2)
-            custom_button = tk.Button(button_frame, text="Customize", font=("Arial", 16), bg="#3366cc", fg="white",
-                                     activebackground="#224488", width=7, height=1, command=custom_cmd)
-            custom_button.pack(side="left", padx=2)
-
-            def on_button_press(button, original_bg, pressed_bg):
-                button.config(bg=pressed_bg)
-            def on_button_release(button, original_bg):
-                button.config(bg=original_bg)
-
-            start_button.bind("<ButtonPress-1>", lambda e: on_button_press(start_button, "#00cc66", "#009900"))
-            start_button.bind("<ButtonRelease-1>", lambda e: on_button_release(start_button, "#00cc66"))
-            custom_button.bind("<ButtonPress-1>", lambda e: on_button_press(custom_button, "#3366cc", "#224488"))
-            custom_button.bind("<ButtonRelease-1>", lambda e: on_button_release(custom_button, "#3366cc"))
-
-            card.bind("<ButtonPress-1>", lambda e: "break")
-            card.bind("<B1-Motion>", lambda e: "break")
-            for child in card.winfo_children():
-                if child not in (start_button, custom_button):
-                    child.bind("<ButtonPress-1>", lambda e: "break")
-                    child.bind("<B1-Motion>", lambda e: "break")
-
-            x += 1
-
-        canvas.update_idletasks()
-        scroll_region = canvas.bbox("all")
-        canvas.config(scrollregion=scroll_region)
-
-        total_items = len(self.menu_data[category])
-        items_per_page = 4
         self.current_item_index = 0
 
-        def update_button_states():
-            scroll_left_button.config(state=tk.NORMAL if self.current_item_index > 0 else tk.DISABLED)
-            scroll_right_button.config(state=tk.NORMAL if self.current_item_index < total_items - items_per_page else tk.DISABLED)
+        def on_scroll(offset):
+            self.current_item_index = int(round(offset / 200))
+            scroll_left_button.config(state=tk.NORMAL if offset > 0 else tk.DISABLED)
+            scroll_right_button.config(state=tk.NORMAL if offset < scroller.max_offset() else tk.DISABLED)
+
+        # Drag/fling the strip; the arrow buttons stay for one-card steps
+        scroller = SwipeScroller(canvas, self.scheduler, self.config["menu"], on_scroll)
+
+        def refresh():
+            """Re-measure the strip after cards were added or removed."""
+            canvas.update_idletasks()
+            canvas.config(scrollregion=canvas.bbox("all"))
+            scroller.attach(scroll_frame)
+            scroller.scroll_to(self.current_item_index * 200)
 
         def scroll_left():
-            if self.current_item_index > 0:
-                self.current_item_index -= 1
-                canvas.xview_moveto((self.current_item_index * 200) / scroll_region[2])
-                update_button_states()
+            scroller.stop()
+            scroller.scroll_to(scroller.offset() - 200)
 
         def scroll_right():
-            if self.current_item_index < total_items - items_per_page:
-                self.current_item_index += 1
-                canvas.xview_moveto((self.current_item_index * 200) / scroll_region[2])
-                update_button_states()
+            scroller.stop()
+            scroller.scroll_to(scroller.offset() + 200)
 
         scroll_buttons_frame = tk.Frame(self.root, bg="#1e1e2f")
         scroll_buttons_frame.pack(side="bottom", fill="x", pady=10)
@@ -607,61 +681,76 @@ class SmartFryerGUI:
         scroll_right_button.bind("<ButtonPress-1>", lambda e: on_scroll_button_press(scroll_right_button))
         scroll_right_button.bind("<ButtonRelease-1>", lambda e: on_scroll_button_release(scroll_right_button))
 
-        update_button_states()
-
-    def start_frying(self, item_name, target_temp, fry_time):
-        self.target_temperature = target_temp
-        self.frying_time = fry_time
-        self.frying_active = True
-        self.show_frying_screen(item_name)
-        threading.Thread(target=self.frying_process, args=(item_name, fry_time), daemon=True).start()
-
-    def frying_process(self, item, total_time):
-        self.update_frying_status(f"Heating Oil to {self.target_temperature}°C...")
-        while self.current_temp < self.target_temperature - 5 and self.frying_active:
-            time.sleep(1)
-            self.update_frying_status(f"Heating... {self.current_temp:.1f}°C")
-
-        if self.frying_active:
-            self.update_frying_status("Lowering the basket...")
-            if not self.send_serial_command("LOWER_BASKET"):
-                self.update_frying_status("Error: Failed to lower basket")
-                self.frying_active = False
-                return
+        refresh()
+        # Lets a menu file reload patch this screen in place (see reload_menu)
+        self.menu_view = {"category": category, "frame": scroll_frame, "cards": cards, "refresh": refresh}
+
+    def build_menu_card(self, parent, category, item, data, column):
+        card = tk.Frame(parent, bd=5, relief=tk.RIDGE, bg="#2e2e40", width=200, height=360)
+        card.grid(row=0, column=column, padx=10, pady=10)
+        card.grid_propagate(False)
+
+        image_filename = item.replace(" ", "_") + ".png"
+        image_path = os.path.join(self.image_dir, image_filename)
+        try:
+            photo = self.image_cache.get(image_path, (150, 150))
+            image_label = tk.Label(card, image=photo, bg="#2e2e40")
+            image_label.image = photo
+            image_label.pack(pady=3)
+        except Exception as e:
+            log.warning("Failed to load image %s: %s", image_path, e)
+            placeholder_label = tk.Label( card, text="[No Image]", font=("Arial", 10), bg="#2e2e40", fg="white")
+            placeholder_label.pack(pady=100)
+
+        tk.Label(card, text=item, font=("Arial", 20, "bold"), fg="white", bg="#2e2e40", wraplength=160).pack(pady=2)
+        temp_label = tk.Label(card, font=("Arial", 16), fg="white", bg="#2e2e40")
+        temp_label.pack(pady=1)
+        time_label = tk.Label(card, font=("Arial", 16), fg="white", bg="#2e2e40")
+        time_label.pack(pady=1)
+
+        button_frame = tk.Frame(card, bg="#2e2e40")
+        button_frame.pack(pady=2)
+        start_button = tk.Button(button_frame, text="Start", font=("Arial", 16), bg="#00cc66", fg="white",
+                                activebackground="#009900", width=6, height=1)
+        start_button.pack(side="left", padx=2)
+        custom_button = tk.Button(button_frame, text="Customize", font=("Arial", 16), bg="#3366cc", fg="white",
+                                 activebackground="#224488", width=7, height=1)
+        custom_button.pack(side="left", padx=2)
+
+        def on_button_press(button, original_bg, pressed_bg):
+            button.config(bg=pressed_bg)
+        def on_button_release(button, original_bg):
+            button.config(bg=original_bg)
+
+        start_button.bind("<ButtonPress-1>", lambda e: on_button_press(start_button, "#00cc66", "#009900"))
+        start_button.bind("<ButtonRelease-1>", lambda e: on_button_release(start_button, "#00cc66"))
+        custom_button.bind("<ButtonPress-1>", lambda e: on_button_press(custom_button, "#3366cc", "#224488"))
+        custom_button.bind("<ButtonRelease-1>", lambda e: on_button_release(custom_button, "#3366cc"))
+
+        entry = {"card": card, "temp": temp_label, "time": time_label, "start": start_button, "custom": custom_button}
+        self.fill_menu_card(entry, category, item, data)
+        return entry
+
+    def fill_menu_card(self, entry, category, item, data):
+        """Set the parts of a card that come from the menu entry."""
+        temps = "/".join(str(stage['temp']) for stage in stages_from_params(data))
+        entry["temp"].config(text=f"TEMP: {temps}°C")
+        minutes, seconds = divmod(data['time'], 60)
+        entry["time"].config(text=f"Time: {minutes}m {seconds}s")
+        schedule = self.schedules.get((category, item))
+        entry["start"].config(command=lambda i=item, t=data['temp'], d=data['time'], s=schedule: self.start_frying(i, t, d, s, category))
+        entry["custom"].config(command=lambda i=item, t=data['temp'], d=data['time'], st=data.get('stages'): self.custom_settings(i, t, d, st, category))
+
+    def start_frying(self, item_name, target_temp, fry_time, schedule=None, category=None):
+        # The controller puts the cook in the first free basket; a repeated Start joins it.
+        if not self.controller.start_frying(item_name, target_temp, fry_time, schedule, category):
+            messagebox.showwarning("Fryer busy", "Every basket is cooking, or the oil is held at a different "
+                                   "temperature for the cook in progress. Wait for it to finish before "
+                                   "starting this one.")
+            return
+        self.show_frying_screen()
 
-            start_time = time.time()
-            while time.time() - start_time < 30 and self.frying_active:
-                self.send_serial_command("LOWER_BASKET")
-                self.send_serial_command("LOWER_BASKET")
-                self.update_frying_status("Lowering the basket...")
-                time.sleep(1)
-
-            if self.frying_active:
-                self.update_frying_status(f"{item}\nFrying...")
-                start_time = time.time()
-                while time.time() - start_time < total_time and self.frying_active:
-                    remaining = total_time - int(time.time() - start_time)
-                    mins, secs = divmod(remaining, 60)
-                    self.update_frying_status(f"{item}\n{mins:02}:{secs:02}\nTemp: {self.current_temp:.1f}°C")
-                    time.sleep(1)
-
-                self.frying_active = False
-                self.update_frying_status("Frying Done! Raising the basket...")
-                if not self.send_serial_command("RAISE_BASKET"):
-                    self.update_frying_status("Error: Failed to raise basket")
-                    return
-
-                start_time = time.time()
-                while time.time() - start_time < 30:
-                    self.send_serial_command("RAISE_BASKET")
-                    self.send_serial_command("RAISE_BASKET")
-                    self.update_frying_status("Raising the basket...")
-                    time.sleep(1)
-                self.update_frying_status("Process Complete!")
-                self.send_serial_command("HEATING_1_OFF")
-                self.send_serial_command("HEATING_2_OFF")
-
-    def show_frying_screen(self, item_name):
+    def show_frying_screen(self):
         self.clear_root()
         self.create_taskbar(self.show_category, show_emergency=True)
         self.root.configure(bg="black")
@@ -670,62 +759,198 @@ class SmartFryerGUI:
         main_frame = tk.Frame(self.root, bg="black")
         main_frame.pack(fill="both", expand=True)
 
-        image_filename = item_name.replace(" ", "_") + ".png"
+        # One status card per basket; they share the oil, so the taskbar temperature covers all of them.
+        baskets = self.controller.basket_states()
+        self.basket_cards = []
+        for index, basket in enumerate(baskets):
+            card = tk.Frame(main_frame, bg="black", highlightbackground="#444", highlightthickness=1)
+            card.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+            if len(baskets) > 1:
+                tk.Label(card, text=f"Basket {index + 1}", font=("Arial", 14), fg="#aaaaaa", bg="black").pack(pady=(5, 0))
+            self.basket_cards.append(self.create_basket_card(card, basket, single=len(baskets) == 1))
+
+    def create_basket_card(self, card, basket, single):
+        if not basket["item"]:
+            tk.Label(card, text="Free", font=("Arial", 24, "bold"), fg="#666666", bg="black").pack(pady=40)
+            status_label = tk.Label(card, text="", font=("Arial", 16), fg="white", bg="black")
+            status_label.pack(pady=10)
+            return {"status": status_label}
+
+        size, side = ((200, 200), "left") if single else ((120, 120), "top")
+        image_filename = basket["item"].replace(" ", "_") + ".png"
         image_path = os.path.join(self.image_dir, image_filename)
         try:
-            img = Image.open(image_path)
-            img = img.resize((200, 200), Image.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            image_label = tk.Label(main_frame, image=photo, bg="black")
+            photo = self.image_cache.get(image_path, size)
+            image_label = tk.Label(card, image=photo, bg="black")
             image_label.image = photo
-            image_label.pack(side="left", padx=20)
-            self.images.append(photo)
+            image_label.pack(side=side, padx=20)
         except Exception as e:
-            print(f"Failed to load image {image_path}: {e}")
-            placeholder_label = tk.Label(main_frame, text="[Image Missing]", font=("Arial", 12), bg="black", fg="white")
-            placeholder_label.pack(side="left", padx=20)
+            log.warning("Failed to load image %s: %s", image_path, e)
+            placeholder_label = tk.Label(card, text="[Image Missing]", font=("Arial", 12), bg="black", fg="white")
+            placeholder_label.pack(side=side, padx=20)
 
-        info_frame = tk.Frame(main_frame, bg="black")
-        info_frame.pack(side="left", fill="both", expand=True)
+        info_frame = tk.Frame(card, bg="black")
+        info_frame.pack(side=side, fill="both", expand=True)
 
-        self.frying_label = tk.Label(info_frame, text=item_name,
-                                     font=("Arial", 24, "bold"), fg="white", bg="black")
-        self.frying_label.pack(pady=10)
+        tk.Label(info_frame, text=basket["item"],
+                 font=("Arial", 24 if single else 18, "bold"), fg="white", bg="black").pack(pady=10 if single else 5)
 
-        minutes, seconds = divmod(self.frying_time, 60)
-        tk.Label(info_frame, text=f"Target Temp: {self.target_temperature}°C",
-                 font=("Arial", 16), fg="white", bg="black").pack(pady=5)
+        minutes, seconds = divmod(basket["frying_time"], 60)
+        target = basket["setpoint"] if basket["setpoint"] is not None else self.controller.target_temperature
+        tk.Label(info_frame, text=f"Target Temp: {target:.0f}°C",
+                 font=("Arial", 16 if single else 14), fg="white", bg="black").pack(pady=5 if single else 2)
         tk.Label(info_frame, text=f"Time: {minutes}m {seconds}s",
-                 font=("Arial", 16), fg="white", bg="black").pack(pady=5)
+                 font=("Arial", 16 if single else 14), fg="white", bg="black").pack(pady=5 if single else 2)
 
-        self.status_label = tk.Label(info_frame, text="",
-                                     font=("Arial", 18), fg="white", bg="black")
-        self.status_label.pack(pady=20)
+        status_label = tk.Label(info_frame, text=basket["status"],
+                                font=("Arial", 18 if single else 15), fg="white", bg="black")
+        status_label.pack(pady=20 if single else 10)
+        return {"status": status_label}
 
-    def update_frying_status(self, message):
+    def update_frying_status(self, message, basket=0):
         try:
-            if hasattr(self, 'status_label') and self.status_label.winfo_exists():
-                self.status_label.config(text=message)
+            cards = getattr(self, 'basket_cards', [])
+            if basket < len(cards) and cards[basket]["status"].winfo_exists():
+                cards[basket]["status"].config(text=message)
         except tk.TclError:
             pass
 
-    def custom_settings(self, item_name, default_temp, default_time):
-        win = tk.Toplevel(self.root)
-        win.geometry("800x480")
-        win.attributes('-fullscreen', True)
-        win.config(cursor="none")
-        win.configure(bg="black")
+    def show_manual_controls(self, item_name="Manual", default_temp=180, default_time=300):
+        self.clear_root()
+        self.create_taskbar(self.leave_manual_controls)
+        self.root.configure(bg="black")
+
+        main_frame = tk.Frame(self.root, bg="black")
+        main_frame.pack(fill="both", expand=True)
+
+        button_frame = tk.Frame(main_frame, bg="black")
+        button_frame.pack(pady=10)
+
+        # Raise/lower for each basket in its own column, the vat's heating in the last one.
+        baskets = len(self.controller.basket_states())
+        for index in range(baskets):
+            name = f"Basket {index + 1}" if baskets > 1 else "Basket"
+            tk.Button(button_frame, text=f"Raise {name}", font=("Arial", 14),
+                    bg="#3366cc", fg="white", activebackground="#224488", width=15, height=2,
+                    command=lambda b=index: self.controller.driver.raise_basket(basket=b)).grid(row=0, column=index, padx=5, pady=5)
+
+            tk.Button(button_frame, text=f"Lower {name}", font=("Arial", 14),
+                    bg="#3366cc", fg="white", activebackground="#224488", width=15, height=2,
+                    command=lambda b=index: self.controller.driver.lower_basket(basket=b)).grid(row=1, column=index, padx=5, pady=5)
+
+        tk.Button(button_frame, text="Heating On", font=("Arial", 14),
+                bg="#ff6600", fg="white", activebackground="#cc5200",
+                width=15, height=2,
+                command=self.manual_heat_on).grid(row=0, column=baskets, padx=5, pady=5)
+
+        tk.Button(button_frame, text="Heating Off", font=("Arial", 14),
+                bg="#ff6600", fg="white", activebackground="#cc5200",
+                width=15, height=2,
+                command=lambda: self.controller.set_manual_heat(False)).grid(row=1, column=baskets, padx=5, pady=5)
+
+        right_frame = tk.Frame(main_frame, bg="black")
+        right_frame.pack(side="left", fill="both", expand=True)
+
+        tk.Label(right_frame, text=f"Custom Settings: {item_name}",
+                font=("Arial", 18, "bold"), bg="black", fg="white").pack(pady=10)
+
+        input_frame = tk.Frame(right_frame, bg="black")
+        input_frame.pack(pady=10)
+
+        temp_frame = tk.Frame(input_frame, bg="black")
+        temp_frame.pack(side="left", padx=20)
+
+        tk.Label(temp_frame, text="Temp (°C)", font=("Arial", 14), bg="black", fg="white").pack(pady=5)
+        self.temp_entry = tk.Entry(temp_frame, font=("Arial", 16), width=5, justify='center')
+        self.temp_entry.insert(0, str(default_temp))
+        self.temp_entry.pack()
+
+        time_frame = tk.Frame(input_frame, bg="black")
+        time_frame.pack(side="left", padx=20)
+
+        tk.Label(time_frame, text="Time (Min:Sec)", font=("Arial", 14), bg="black", fg="white").pack(pady=5)
+        time_input_frame = tk.Frame(time_frame, bg="black")
+        time_input_frame.pack()
+
+        self.min_entry = tk.Entry(time_input_frame, font=("Arial", 16), width=3, justify='center')
+        self.min_entry.insert(0, str(default_time // 60))
+        self.min_entry.pack(side="left")
+
+        tk.Label(time_input_frame, text=":", font=("Arial", 16), bg="black", fg="white").pack(side="left")
+
+        self.sec_entry = tk.Entry(time_input_frame, font=("Arial", 16), width=3, justify='center')
+        self.sec_entry.insert(0, str(default_time % 60).zfill(2))
+        self.sec_entry.pack(side="left")
+
+        control_frame = tk.Frame(right_frame, bg="black")
+        control_frame.pack(pady=10)
+
+        self.keypad.show(control_frame, [self.temp_entry, self.min_entry, self.sec_entry], side="left", padx=10)
+
+        action_frame = tk.Frame(control_frame, bg="black")
+        action_frame.pack(side="left", padx=10)
+
+        tk.Button(action_frame, text="Start Manual Fry", font=("Arial", 16),
+                bg="#00cc66", fg="white", activebackground="#009900",
+                width=15, height=2, command=self.start_manual_frying).pack(pady=10)
+
+    def leave_manual_controls(self):
+        self.controller.set_manual_heat(False)
+        self.show_category()
+
+    def manual_heat_on(self):
+        # The thermostat holds the oil at the entered temperature until Heating Off.
+        try:
+            temp = int(self.temp_entry.get())
+        except ValueError:
+            temp = self.controller.target_temperature
+        self.controller.set_manual_heat(True, min(max(temp, 100), 250))
+
+    def start_manual_frying(self):
+        try:
+            temp = int(self.temp_entry.get())
+            minutes = int(self.min_entry.get())
+            seconds = int(self.sec_entry.get())
+            if temp < 100 or temp > 250:
+                messagebox.showerror("Invalid Input", "Temperature must be between 100 and 250°C")
+                return
+            if minutes < 0 or seconds < 0 or seconds > 59:
+                messagebox.showerror("Invalid Input", "Time must have valid minutes and seconds (0-59)")
+                return
+            total_time = minutes * 60 + seconds
+            if total_time < 30 or total_time > 600:
+                messagebox.showerror("Invalid Input", "Total time must be between 30 and 600 seconds")
+                return
+            self.controller.set_manual_heat(False)
+            self.start_frying("Manual Frying", temp, total_time)
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter valid numbers for temperature and time")
+
+    def custom_settings(self, item_name, default_temp, default_time, stages=None, category=None):
+        # Multi-stage items keep their earlier stages; the finishing stage is what gets customised.
+        if stages:
+            default_temp, default_time = stages[-1]["temp"], stages[-1]["time"]
+        # An item has been picked, so an order is on its way: boost towards its first setpoint.
+        # Browsing a category alone does not, or every look at the menu would run the elements flat out.
+        self.controller.order_tapped(category, stages[0]["temp"] if stages else default_temp)
+        win = self.open_overlay()
+        menu_temp_label = self.temp_label
+
+        def close():
+            # The menu screen underneath gets its live temperature back
+            self.temp_label = menu_temp_label
+            self.close_overlay(win)
 
         taskbar = tk.Frame(win, bg="#111")
         taskbar.pack(side="top", fill="x")
 
-        self.temp_label = tk.Label(taskbar, text=f"Current Temp: {self.current_temp:.1f}°C",
+        self.temp_label = tk.Label(taskbar, text=f"Current Temp: {self.controller.current_temp:.1f}°C",
                                    font=("Arial", 14), bg="#111", fg="white")
         self.temp_label.pack(side="left", padx=10)
 
         tk.Button(taskbar, text="Back", font=("Arial", 12),
                   bg="orange", fg="black", activebackground="#cc8400",
-                  command=win.destroy).pack(side="right", padx=10)
+                  command=close).pack(side="right", padx=10)
 
         main_frame = tk.Frame(win, bg="black")
         main_frame.pack(fill="both", expand=True)
@@ -733,15 +958,12 @@ class SmartFryerGUI:
         image_filename = item_name.replace(" ", "_") + ".png"
         image_path = os.path.join(self.image_dir, image_filename)
         try:
-            img = Image.open(image_path)
-            img = img.resize((200, 200), Image.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
+            photo = self.image_cache.get(image_path, (200, 200))
             image_label = tk.Label(main_frame, image=photo, bg="black")
             image_label.image = photo
             image_label.pack(side="left", padx=20)
-            self.images.append(photo)
         except Exception as e:
-            print(f"Failed to load image {image_path}: {e}")
+            log.warning("Failed to load image %s: %s", image_path, e)
             placeholder_label = tk.Label(main_frame, text="[Image Missing]", font=("Arial", 12), bg="black", fg="white")
             placeholder_label.pack(side="left", padx=20)
 
@@ -777,47 +999,10 @@ class SmartFryerGUI:
         self.sec_entry.insert(0, str(default_time % 60).zfill(2))
         self.sec_entry.pack(side="left")
 
-        self.active_entry = self.temp_entry
-        self.temp_entry.bind("<FocusIn>", lambda e: setattr(self, 'active_entry', self.temp_entry))
-        self.min_entry.bind("<FocusIn>", lambda e: setattr(self, 'active_entry', self.min_entry))
-        self.sec_entry.bind("<FocusIn>", lambda e: setattr(self, 'active_entry', self.sec_entry))
-
         control_frame = tk.Frame(right_frame, bg="black")
         control_frame.pack(pady=10)
 
-        keypad_frame = tk.Frame(control_frame, bg="black")
-        keypad_frame.pack(side="left", padx=10)
-
-        buttons = [
-            '1', '2', '3',
-            '4', '5', '6',
-            '7', '8', '9',
-            'Clear', '0', 'Del'
-        ]
-
-        def on_keypad_click(value):
-            if value == 'Clear':
-                self.active_entry.delete(0, tk.END)
-            elif value == 'Del':
-                current = self.active_entry.get()
-                self.active_entry.delete(0, tk.END)
-                self.active_entry.insert(0, current[:-1])
-            else:
-                self.active_entry.insert(tk.END, value)
-
-        row = 0
-        col = 0
-        for button in buttons:
-            btn = tk.Button(keypad_frame, text=button, font=("Arial", 14),
-                            width=5, height=2, bg="#333", fg="white",
-                            activebackground="#555", command=lambda val=button: on_keypad_click(val))
-            btn.grid(row=row, column=col, padx=3, pady=3)
-            btn.bind("<ButtonPress-1>", lambda e, b=btn: b.config(bg="#555"))
-            btn.bind("<ButtonRelease-1>", lambda e, b=btn: b.config(bg="#333"))
-            col += 1
-            if col > 2:
-                col = 0
-                row += 1
+        self.keypad.show(control_frame, [self.temp_entry, self.min_entry, self.sec_entry], side="left", padx=10)
 
         action_frame = tk.Frame(control_frame, bg="black")
         action_frame.pack(side="left", padx=10)
@@ -830,8 +1015,14 @@ class SmartFryerGUI:
                 if temp < 100 or temp > 250 or minutes < 0 or seconds < 0 or seconds > 59:
                     raise ValueError("Invalid input range")
                 total_time = minutes * 60 + seconds
-                win.destroy()
-                self.start_frying(item_name, temp, total_time)
+                close()
+                if stages:
+                    custom_stages = stages[:-1] + [dict(stages[-1], temp=temp, time=total_time)]
+                    schedule = compile_stages(custom_stages)
+                    total_time = sum(stage["time"] + stage.get("rest", 0) for stage in custom_stages)
+                    self.start_frying(item_name, temp, total_time, schedule, category)
+                else:
+                    self.start_frying(item_name, temp, total_time, category=category)
             except ValueError as e:
                 messagebox.showerror("Invalid Input", f"Please enter valid numbers: {e}")
 
@@ -844,21 +1035,16 @@ class SmartFryerGUI:
 
         cancel_btn = tk.Button(action_frame, text="Cancel", font=("Arial", 14),
                                width=12, height=2, bg="red", fg="white",
-                               activebackground="#990000", command=win.destroy)
+                               activebackground="#990000", command=close)
         cancel_btn.pack(pady=5)
         cancel_btn.bind("<ButtonPress-1>", lambda e: cancel_btn.config(bg="#990000"))
         cancel_btn.bind("<ButtonRelease-1>", lambda e: cancel_btn.config(bg="red"))
 
     def cleanup(self):
         self.running = False
-        try:
-            if self.ser and self.ser.is_open:
-                self.send_serial_command("HEATING_1_OFF")
-                self.send_serial_command("HEATING_2_OFF")
-                self.send_serial_command("RAISE_BASKET")
-                self.ser.close()
-        except serial.SerialException as e:
-            print(f"Error during cleanup: {e}")
+        self.menu_watcher.close()
+        self.controller.shutdown()
+        self.logs.stop()
 
 if __name__ == "__main__":
     root = tk.Tk()
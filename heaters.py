@@ -0,0 +1,169 @@
+import fcntl
+import json
+import os
+import socket
+import threading
+import time
+
+
+class PowerBudget:
+    """Peak-power budget shared by every heater on one electrical feed (one process).
+
+    Times come from the caller's clock (HeaterScheduler.plan's now), so the
+    budget runs on virtual time under replay.
+    """
+
+    def __init__(self, limit_watts, wait_ttl=5.0):
+        self.limit = limit_watts
+        self.wait_ttl = wait_ttl
+        self.lock = threading.Lock()
+        self.leases = {}
+        self.waiting = {}
+
+    def request(self, owner, watts, now):
+        """Reserve watts for owner, replacing its previous lease. False if it would exceed the limit."""
+        with self.lock:
+            others = sum(w for o, w in self.leases.items() if o != owner)
+            if others + watts > self.limit:
+                self.waiting[owner] = now
+                return False
+            self.leases[owner] = watts
+            self.waiting.pop(owner, None)
+            return True
+
+    def release(self, owner):
+        with self.lock:
+            self.leases.pop(owner, None)
+
+    def others_waiting(self, owner, now):
+        with self.lock:
+            cutoff = now - self.wait_ttl
+            return any(o != owner and t > cutoff for o, t in self.waiting.items())
+
+    def used(self):
+        with self.lock:
+            return sum(self.leases.values())
+
+
+class SharedFileBudget:
+    """Same budget, coordinated through a locked JSON file so separate
+    fryer processes (or hosts on a shared mount) on one feed can share it.
+    Leases expire after lease_ttl seconds so a crashed fryer frees its share.
+    The file is read by other processes, so leases are in wall time and the
+    caller's now is not used.
+    """
+
+    def __init__(self, path, limit_watts, lease_ttl=5.0):
+        self.path = path
+        self.limit = limit_watts
+        self.lease_ttl = lease_ttl
+
+    def _update(self, fn):
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                leases = {o: l for o, l in state.get("leases", {}).items() if l[1] > now}
+                waiting = {o: t for o, t in state.get("waiting", {}).items() if t > now}
+                result = fn(leases, waiting, now)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"leases": leases, "waiting": waiting}))
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def request(self, owner, watts, now=None):
+        def apply(leases, waiting, now):
+            others = sum(l[0] for o, l in leases.items() if o != owner)
+            if others + watts > self.limit:
+                waiting[owner] = now + self.lease_ttl
+                return False
+            leases[owner] = [watts, now + self.lease_ttl]
+            waiting.pop(owner, None)
+            return True
+        return self._update(apply)
+
+    def release(self, owner):
+        self._update(lambda leases, waiting, now: leases.pop(owner, None))
+
+    def others_waiting(self, owner, now=None):
+        return self._update(lambda leases, waiting, now: any(o != owner for o in waiting))
+
+    def used(self):
+        return self._update(lambda leases, waiting, now: sum(l[0] for l in leases.values()))
+
+
+_budgets = {}
+
+
+def make_power_budget(config):
+    """Budgets are shared by feed name, so every fryer on one feed draws from the same pool."""
+    if config.get("shared_budget_file"):
+        return SharedFileBudget(config["shared_budget_file"], config["peak_budget_watts"],
+                                config.get("lease_ttl", 5.0))
+    feed = config.get("feed", "default")
+    if feed not in _budgets:
+        _budgets[feed] = PowerBudget(config["peak_budget_watts"])
+    return _budgets[feed]
+
+
+def proportional_demand(target, temp, band):
+    """Requested fraction of full heater power: 1 below target - band, 0 at target."""
+    if band <= 0:
+        return 1.0 if temp < target else 0.0
+    return min(max((target - temp) / band, 0.0), 1.0)
+
+
+class HeaterScheduler:
+    """Decides which heating elements run on each control tick.
+
+    Elements are picked in an order that rotates every period/len(elements)
+    seconds, so when the budget only admits some of them the elements take
+    turns (staggered duty cycles) instead of all drawing at once. A fryer
+    that has held its share for a full slot while another fryer on the feed
+    is waiting sits out one tick, so fryers on a shared budget take turns too.
+    """
+
+    def __init__(self, elements, budget, period=10.0, owner=None):
+        self.elements = list(elements.items())
+        self.budget = budget
+        self.period = period
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        self.total_watts = sum(w for _, w in self.elements)
+        self.slot_length = period / max(len(self.elements), 1)
+        self.held_since = None
+
+    def plan(self, demand, now):
+        chosen = []
+        if (demand > 0 and self.held_since is not None and now - self.held_since >= self.slot_length
+                and self.budget.others_waiting(self.owner, now)):
+            demand = 0
+        if demand > 0:
+            target = demand * self.total_watts
+            count = len(self.elements)
+            slot = int(now / (self.period / count)) % count
+            watts = 0
+            for name, w in self.elements[slot:] + self.elements[:slot]:
+                if watts >= target:
+                    break
+                chosen.append((name, w))
+                watts += w
+            while chosen and not self.budget.request(self.owner, watts, now):
+                watts -= chosen.pop()[1]
+        if not chosen:
+            self.budget.release(self.owner)
+            self.held_since = None
+        elif self.held_since is None:
+            self.held_since = now
+        names = {name for name, _ in chosen}
+        return {name: name in names for name, _ in self.elements}
+
+    def release(self):
+        self.budget.release(self.owner)
@@ -0,0 +1,170 @@
+import glob
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Column name -> NumPy dtype. Each flush writes one .npz chunk with an array
+# per column; chunks are only ever added (and periodically compacted).
+COLUMNS = {
+    "started_at": "f8",
+    "item": "U64",
+    "setpoint": "f4",
+    "planned_time": "f4",
+    "actual_time": "f4",
+    "preheat_time": "f4",
+    "drop_temp": "f4",
+    "temp_drop": "f4",
+    "recovery_time": "f4",
+    "aborted": "?",
+}
+
+
+class CookTracker:
+    """Collects the measurements of one cook while frying_process runs it."""
+
+    def __init__(self, item, setpoint, planned_time, now=None):
+        self.record = {
+            "started_at": now if now is not None else time.time(),
+            "item": item,
+            "setpoint": setpoint,
+            "planned_time": planned_time,
+            "actual_time": 0.0,
+            "preheat_time": 0.0,
+            "drop_temp": np.nan,
+            "temp_drop": np.nan,
+            "recovery_time": np.nan,
+            "aborted": False,
+        }
+        self.preheat_start = None
+        self.drop_at = None
+        self.min_temp = None
+        self.recovered = False
+
+    def preheat_started(self, now):
+        self.preheat_start = now
+
+    def preheat_finished(self, now):
+        if self.preheat_start is not None:
+            self.record["preheat_time"] += now - self.preheat_start
+            self.preheat_start = None
+
+    def basket_lowered(self, temp, now):
+        if self.drop_at is None:
+            self.drop_at = now
+            self.min_temp = temp
+            self.record["drop_temp"] = temp
+
+    def sample(self, temp, setpoint, now):
+        if self.drop_at is None or self.recovered:
+            return
+        self.min_temp = min(self.min_temp, temp)
+        self.record["temp_drop"] = self.record["drop_temp"] - self.min_temp
+        band = setpoint - 2
+        if self.min_temp < band and temp >= band:
+            self.record["recovery_time"] = now - self.drop_at
+            self.recovered = True
+        elif self.min_temp >= band and now - self.drop_at > 60:
+            # The load never pulled the oil out of band.
+            self.record["recovery_time"] = 0.0
+            self.recovered = True
+
+    def fried(self, seconds):
+        self.record["actual_time"] += seconds
+
+    def finish(self, aborted):
+        self.record["aborted"] = bool(aborted)
+        return self.record
+
+
+class CookHistoryStore:
+    """Append-only columnar store of completed cooks."""
+
+    def __init__(self, directory="cook_history", compact_after=64):
+        self.directory = directory
+        self.compact_after = compact_after
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _chunks(self):
+        return sorted(glob.glob(os.path.join(self.directory, "cooks-*.npz")))
+
+    def _write_chunk(self, columns, name=None):
+        name = name or f"cooks-{time.time_ns():020d}.npz"
+        path = os.path.join(self.directory, name)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **columns)
+        os.replace(tmp, path)
+        return path
+
+    def append(self, records):
+        if isinstance(records, dict):
+            records = [records]
+        if not records:
+            return
+        columns = {name: np.array([r[name] for r in records], dtype=dtype)
+                   for name, dtype in COLUMNS.items()}
+        with self.lock:
+            self._write_chunk(columns)
+            if len(self._chunks()) > self.compact_after:
+                self._compact()
+
+    def _load_columns(self, chunks):
+        parts = {name: [] for name in COLUMNS}
+        for path in chunks:
+            with np.load(path) as data:
+                for name, dtype in COLUMNS.items():
+                    if name in data:
+                        parts[name].append(data[name])
+                    else:
+                        parts[name].append(np.zeros(len(data["started_at"]), dtype=dtype))
+        return {name: np.concatenate(arrays) if arrays else np.array([], dtype=COLUMNS[name])
+                for name, arrays in parts.items()}
+
+    def _compact(self):
+        chunks = self._chunks()
+        columns = self._load_columns(chunks)
+        # Keep the oldest chunk's name so ordering by file name stays chronological.
+        self._write_chunk(columns, os.path.basename(chunks[0]))
+        for path in chunks[1:]:
+            os.remove(path)
+
+    def load(self):
+        with self.lock:
+            columns = self._load_columns(self._chunks())
+        df = pd.DataFrame(columns)
+        df["started_at"] = pd.to_datetime(df["started_at"], unit="s")
+        return df
+
+
+def throughput_report(df):
+    """Summary numbers for the admin panel, computed column-wise."""
+    if df.empty:
+        return {"cooks": 0}
+    done = df[~df["aborted"]].assign(overrun=lambda d: d["actual_time"] - d["planned_time"])
+    span_hours = max((df["started_at"].max() - df["started_at"].min()).total_seconds() / 3600.0, 1.0)
+    busy = df["preheat_time"].to_numpy() + df["actual_time"].to_numpy()
+    per_hour = df.set_index("started_at").resample("1h").size()
+    per_hour = per_hour[per_hour > 0]
+    report = {
+        "cooks": int(len(df)),
+        "aborted": int(df["aborted"].sum()),
+        "items_per_hour": float(len(done) / span_hours),
+        "peak_items_per_hour": int(per_hour.max()) if len(per_hour) else 0,
+        "mean_preheat": float(np.nanmean(df["preheat_time"].to_numpy())),
+        "preheat_share": float(df["preheat_time"].sum() / busy.sum()) if busy.sum() else 0.0,
+    }
+    by_item = done.groupby("item").agg(
+        cooks=("item", "size"),
+        mean_time=("actual_time", "mean"),
+        time_std=("actual_time", "std"),
+        overrun=("overrun", "mean"),
+        mean_drop=("temp_drop", "mean"),
+        mean_recovery=("recovery_time", "mean"),
+        recovery_std=("recovery_time", "std"),
+    ).fillna(0.0)
+    report["per_item"] = by_item.sort_values("cooks", ascending=False)
+    return report
@@ -0,0 +1,99 @@
+import itertools
+import threading
+from collections import deque
+
+
+class CancelToken:
+    """Cooperative cancellation for one job. Workers check cancelled between
+    steps and sleep through wait(), which returns early on cancel."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.event = threading.Event()
+        self.reason = None
+
+    def cancel(self, reason="cancelled"):
+        if not self.event.is_set():
+            self.reason = reason
+            self.event.set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def wait(self, seconds):
+        """Sleep up to seconds; True if the job was cancelled meanwhile."""
+        return self.clock.wait(self.event, seconds)
+
+
+class Job:
+    def __init__(self, job_id, lane, key, token, started=None):
+        self.id = job_id
+        self.lane = lane
+        self.key = key
+        self.token = token
+        self.started = started
+        self.status = "running"  # then "done", "failed" or "cancelled"
+        self.result = None
+        self.error = None
+
+    def summary(self):
+        return {"id": self.id, "lane": self.lane, "key": self.key, "status": self.status,
+                "error": self.error, "reason": self.token.reason}
+
+
+class JobManager:
+    """Single-flight worker per lane (one lane per basket).
+
+    submit() starts a job when its lane is free. Submitting the same key
+    as the running job (a double tap) returns that job; anything else
+    while the lane is busy is refused with None, so there are never two
+    workers fighting over one basket. on_finish(job) is called from the
+    worker once the job is done, failed or cancelled.
+    """
+
+    def __init__(self, clock, on_finish=None, keep=20):
+        self.clock = clock
+        self.on_finish = on_finish
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.running = {}
+        self.finished = deque(maxlen=keep)
+
+    def submit(self, lane, key, target, *args):
+        """Run target(token, *args) on the lane's worker; returns the Job or None."""
+        with self.lock:
+            current = self.running.get(lane)
+            if current is not None:
+                return current if current.key == key and not current.token.cancelled else None
+            job = Job(next(self.ids), lane, key, CancelToken(self.clock), self.clock.now())
+            self.running[lane] = job
+        self.clock.spawn(self._run, job, target, args, name=f"job-{lane}-{job.id}")
+        return job
+
+    def _run(self, job, target, args):
+        try:
+            job.result = target(job.token, *args)
+            job.status = "cancelled" if job.token.cancelled else "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            with self.lock:
+                if self.running.get(job.lane) is job:
+                    del self.running[job.lane]
+                self.finished.append(job)
+        if self.on_finish:
+            self.on_finish(job)
+
+    def active(self, lane):
+        with self.lock:
+            return self.running.get(lane)
+
+    def cancel(self, lane=None, reason="cancelled"):
+        """Cancel the job on lane, or on every lane; returns how many were told."""
+        with self.lock:
+            jobs = [job for name, job in self.running.items() if lane is None or name == lane]
+        for job in jobs:
+            job.token.cancel(reason)
+        return len(jobs)
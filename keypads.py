@@ -0,0 +1,120 @@
+import itertools
+import tkinter as tk
+
+_grid_ids = itertools.count(1)
+
+
+class KeyGrid:
+    """A touch key grid built once and shown inside whichever screen needs it.
+
+    The keys are children of the root window, so they outlive the screens
+    (clear_root leaves widgets in SmartFryerGUI.persistent alone) and
+    show() packs the grid into the screen's container with pack(in_=...).
+    Showing it in an overlay remembers where it was, and hide() puts it back
+    there when the overlay closes; reset() is for leaving the screen.
+    Keys type into the entry that has focus among the targets, falling back
+    to the first. Press feedback comes from one binding on a tag of this
+    grid's own rather than a pair of bindings per key.
+    """
+
+    keys = []
+    columns = 1
+    wide_keys = ()
+
+    def __init__(self, root, font=("Arial", 12), width=4, wide_width=8, padding=2,
+                 bg="#333", pressed_bg="#555"):
+        self.root = root
+        self.targets = []
+        self.active = None
+        self.placement = None  # (container, pack options) while shown
+        self.covered = []  # placements under overlays, innermost last
+        self.frame = tk.Frame(root, bg="black")
+        self.tag = f"KeyFeedback{next(_grid_ids)}"
+        root.bind_class(self.tag, "<ButtonPress-1>", lambda e: e.widget.config(bg=pressed_bg))
+        root.bind_class(self.tag, "<ButtonRelease-1>", lambda e: e.widget.config(bg=bg))
+        for index, key in enumerate(self.keys):
+            button = tk.Button(self.frame, text=key, font=font,
+                               width=wide_width if key in self.wide_keys else width,
+                               height=2, bg=bg, fg="white", activebackground=pressed_bg,
+                               command=lambda value=key: self.press(value))
+            button.grid(row=index // self.columns, column=index % self.columns, padx=padding, pady=padding)
+            button.bindtags((self.tag,) + button.bindtags())
+
+    def show(self, container, targets, **pack):
+        if self.placement and self.placement[0] is not container and self.placement[0].winfo_exists():
+            # Note the widget packed after the grid so it goes back in the same place.
+            slaves = self.placement[0].pack_slaves()
+            index = slaves.index(self.frame) if self.frame in slaves else len(slaves)
+            before = slaves[index + 1] if index + 1 < len(slaves) else None
+            self.covered.append(self.placement + (self.targets, before))
+        self.place(container, targets, pack)
+
+    def place(self, container, targets, pack, before=None):
+        self.targets = list(targets)
+        self.active = self.targets[0] if self.targets else None
+        self.placement = (container, pack)
+        if before is not None and before.winfo_exists():
+            pack = dict(pack, before=before)
+        self.frame.pack(in_=container, **pack)
+        self.frame.lift()
+
+    def hide(self):
+        """Off the current container, back onto the one an overlay covered."""
+        self.frame.pack_forget()
+        self.targets = []
+        self.active = None
+        self.placement = None
+        while self.covered:
+            container, pack, targets, before = self.covered.pop()
+            if container.winfo_exists():
+                self.place(container, [target for target in targets if target.winfo_exists()], pack, before)
+                return
+
+    def reset(self):
+        """Hidden everywhere, for a new screen."""
+        self.covered = []
+        self.hide()
+
+    def target(self):
+        focus = self.root.focus_get()
+        if focus in self.targets:
+            self.active = focus
+        return self.active
+
+    def press(self, value):
+        entry = self.target()
+        if entry is None or not entry.winfo_exists():
+            return
+        if value == 'Clear':
+            entry.delete(0, tk.END)
+        elif value == 'Del':
+            entry.delete(max(len(entry.get()) - 1, 0), tk.END)
+        elif value == 'Enter':
+            entry.event_generate('<Return>')
+        else:
+            entry.insert(tk.END, value)
+
+
+class OnScreenKeyboard(KeyGrid):
+    keys = [
+        '1', '2', '3', '4', '5', '6', '7', '8', '9', '0',
+        'q', 'w', 'e', 'r', 't', 'y', 'u', 'i', 'o', 'p',
+        'a', 's', 'd', 'f', 'g', 'h', 'j', 'k', 'l', '/',
+        'z', 'x', 'c', 'v', 'b', 'n', 'm', '.', '_', ' ',
+        'Clear', 'Del', 'Enter'
+    ]
+    columns = 10
+    wide_keys = ('Clear', 'Del', 'Enter')
+
+
+class NumericKeypad(KeyGrid):
+    keys = [
+        '1', '2', '3',
+        '4', '5', '6',
+        '7', '8', '9',
+        'Clear', '0', 'Del'
+    ]
+    columns = 3
+
+    def __init__(self, root):
+        super().__init__(root, font=("Arial", 14), width=5, padding=3)
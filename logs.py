@@ -0,0 +1,140 @@
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+# Every raw serial line, for serial.log_file; kept out of the console log.
+RAW_LOGGER = "serial.raw"
+
+
+def fields(**values):
+    """Structured fields for a record: log.info("Sent %s", command, extra=fields(attempt=2))."""
+    return {"fields": values}
+
+
+class StructuredFormatter(logging.Formatter):
+    """The usual line followed by the record's fields as key=value pairs."""
+
+    def format(self, record):
+        line = super().format(record)
+        values = getattr(record, "fields", None)
+        if values:
+            line += " " + " ".join(f"{key}={value}" for key, value in values.items())
+        return line
+
+
+class RepeatFilter(logging.Filter):
+    """Lets an identical message (same logger, level and text) through once
+    per window. The ones held back are counted, and the next one through
+    carries the count as repeated=N. Only records at an enabled level get
+    here, so the text is only rendered for those."""
+
+    def __init__(self, window=10.0, max_keys=1000):
+        super().__init__()
+        self.window = window
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.seen = {}  # key -> [time let through, held back since]
+
+    def filter(self, record):
+        key = (record.name, record.levelno, record.getMessage())
+        with self.lock:
+            entry = self.seen.get(key)
+            if entry and record.created - entry[0] < self.window:
+                entry[1] += 1
+                return False
+            if len(self.seen) >= self.max_keys:
+                self.seen.clear()
+            self.seen[key] = [record.created, 0]
+        if entry and entry[1]:
+            record.fields = dict(getattr(record, "fields", None) or {}, repeated=entry[1])
+        return True
+
+
+class AsyncHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread as they are, without formatting
+    them here, and never blocks: with the queue full a record is dropped
+    and counted instead."""
+
+    def __init__(self, records):
+        super().__init__(records)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread. Arguments logged in
+        # this repo are plain values, so nothing changes under it meanwhile.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """Root logger -> bounded queue -> one background listener thread.
+
+    Callers on the Tk or control thread only pay for building a record and
+    a put_nowait; formatting and the write to stdout (journald on the Pi)
+    or logging.file happen on the listener. Raw serial lines go to
+    serial_log, when given, through the same queue.
+    """
+
+    def __init__(self, config, serial_log=None):
+        self.records = queue.Queue(config["queue_size"])
+        self.handler = AsyncHandler(self.records)
+        self.handler.addFilter(RepeatFilter(config["repeat_window"]))
+        output = logging.FileHandler(config["file"]) if config.get("file") else logging.StreamHandler(sys.stdout)
+        output.setFormatter(StructuredFormatter(config["format"]))
+        output.addFilter(lambda record: record.name != RAW_LOGGER)
+        handlers = [output]
+
+        self.raw_handler = None
+        raw = logging.getLogger(RAW_LOGGER)
+        raw.propagate = False
+        if serial_log:
+            raw_output = logging.FileHandler(serial_log)
+            raw_output.setFormatter(logging.Formatter("%(message)s"))
+            raw_output.addFilter(logging.Filter(RAW_LOGGER))
+            handlers.append(raw_output)
+            # Not filtered for repeats: the raw log keeps every line.
+            self.raw_handler = AsyncHandler(self.records)
+            raw.addHandler(self.raw_handler)
+        raw.setLevel(logging.INFO if serial_log else logging.CRITICAL)
+
+        logging.getLogger().addHandler(self.handler)
+        set_level(config["level"])
+        self.listener = logging.handlers.QueueListener(self.records, *handlers)
+        self.listener.start()
+
+    @property
+    def dropped(self):
+        return self.handler.dropped + (self.raw_handler.dropped if self.raw_handler else 0)
+
+    def stop(self):
+        logging.getLogger().removeHandler(self.handler)
+        if self.raw_handler:
+            logging.getLogger(RAW_LOGGER).removeHandler(self.raw_handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+def setup_logging(config, serial=False):
+    """Start the pipeline for this process; serial when it runs the
+    controller, so the raw lines go to serial.log_file."""
+    return LogPipeline(config["logging"], config["serial"].get("log_file") if serial else None)
+
+
+def set_level(level):
+    """Console verbosity, switchable at runtime (admin panel)."""
+    if level not in LEVELS:
+        raise ValueError(f"Unknown log level '{level}' (known: {', '.join(LEVELS)})")
+    logging.getLogger().setLevel(level)
+
+
+def get_level():
+    return logging.getLevelName(logging.getLogger().level)
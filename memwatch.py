@@ -0,0 +1,125 @@
+import gc
+import logging
+import os
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+
+from PIL import Image, ImageTk
+
+log = logging.getLogger(__name__)
+
+
+class ImageCache:
+    """Resized item photos as PhotoImages, least recently used out first.
+
+    Widgets showing a photo keep their own reference (label.image), so
+    evicting or clearing the cache never blanks a screen; the memory goes
+    once the screen does.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def get(self, path, size):
+        key = (path, size)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        img = Image.open(path)
+        img = img.resize(size, Image.LANCZOS)
+        photo = ImageTk.PhotoImage(img)
+        self.entries[key] = photo
+        self.size += size[0] * size[1] * 4
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            self.evict()
+        return photo
+
+    def evict(self):
+        (_, size), _ = self.entries.popitem(last=False)
+        self.size -= size[0] * size[1] * 4
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def resident_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+class MemoryWatchdog:
+    """Samples RSS, live Tk widgets and the image cache of a kiosk that
+    runs for weeks, and keeps the samples for the admin panel's trends.
+
+    Over memory.rss_budget_mb the image cache is emptied and a full
+    collection runs. snapshot() compares tracemalloc snapshots to find
+    what is growing; tracing starts on the first call, since it slows
+    every allocation.
+    """
+
+    def __init__(self, root, cache, config):
+        self.root = root
+        self.cache = cache
+        self.rss_budget = config["rss_budget_mb"] * 1024 * 1024
+        self.frames = config["tracemalloc_frames"]
+        self.samples = deque(maxlen=config["history"])
+        self.evictions = 0
+        self.last_snapshot = None
+
+    def sample(self):
+        rss = resident_bytes()
+        if rss > self.rss_budget:
+            self.cache.clear()
+            gc.collect()
+            self.evictions += 1
+            log.warning("Memory over budget (%.0f MB), image cache cleared", rss / 1048576)
+            rss = resident_bytes()
+        self.samples.append((time.time(), rss, count_widgets(self.root), len(self.cache), self.cache.size))
+        return self.samples[-1]
+
+    def trend(self):
+        """RSS and widget growth per hour over the kept samples."""
+        if len(self.samples) < 2:
+            return 0.0, 0.0
+        first, last = self.samples[0], self.samples[-1]
+        hours = max((last[0] - first[0]) / 3600.0, 1e-6)
+        return (last[1] - first[1]) / hours, (last[2] - first[2]) / hours
+
+    def report(self):
+        wall, rss, widgets, images, image_bytes = self.samples[-1] if self.samples else self.sample()
+        rss_rate, widget_rate = self.trend()
+        hours = (self.samples[-1][0] - self.samples[0][0]) / 3600.0 if self.samples else 0.0
+        return {"rss_mb": rss / 1048576, "rss_mb_per_hour": rss_rate / 1048576, "widgets": widgets,
+                "widgets_per_hour": widget_rate, "images": images, "image_mb": image_bytes / 1048576,
+                "budget_mb": self.rss_budget / 1048576, "evictions": self.evictions, "hours": hours}
+
+    def snapshot(self, top=8):
+        """Biggest allocation growth since the previous snapshot, as text lines."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.last_snapshot = tracemalloc.take_snapshot()
+            return ["tracemalloc started; take another snapshot later to see what grew"]
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.compare_to(self.last_snapshot, "lineno")
+        self.last_snapshot = snapshot
+        return [str(stat) for stat in stats[:top]]
+
+    def stop_tracing(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.last_snapshot = None
@@ -0,0 +1,110 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+
+log = logging.getLogger(__name__)
+
+# inotify(7) constants
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class InotifyWatcher:
+    """Reports changes to one file through inotify, without blocking.
+
+    Watches the directory rather than the file, so editors and fleet pushes
+    that write a temp file and rename it over the menu are still seen.
+    """
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.path = path
+        self.name = os.path.basename(path).encode()
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.path.dirname(os.path.abspath(path)).encode()
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, directory, mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, "inotify_add_watch failed")
+
+    def changed(self):
+        hit = False
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return hit
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = EVENT.unpack_from(data, offset)
+                offset += EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if name == self.name:
+                    hit = True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback for systems without inotify: compares the file's stat."""
+
+    def __init__(self, path):
+        self.path = path
+        self.last = self.signature()
+
+    def signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def changed(self):
+        current = self.signature()
+        if current == self.last:
+            return False
+        self.last = current
+        return True
+
+    def close(self):
+        pass
+
+
+def make_watcher(path, mode="auto"):
+    """An inotify watcher when mode allows and the kernel has it, else polling."""
+    if mode in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError) as e:
+            log.info("inotify unavailable for %s (%s), polling instead", path, e)
+    return PollingWatcher(path)
+
+
+def diff_menu(old, new):
+    """Item-level differences between two menus.
+
+    Returns (added, removed, changed), each a list of (category, item).
+    """
+    added, removed, changed = [], [], []
+    for category in set(old) | set(new):
+        old_items = old.get(category, {})
+        new_items = new.get(category, {})
+        for item in new_items:
+            if item not in old_items:
+                added.append((category, item))
+            elif new_items[item] != old_items[item]:
+                changed.append((category, item))
+        removed.extend((category, item) for item in old_items if item not in new_items)
+    return added, removed, changed
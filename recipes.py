@@ -0,0 +1,107 @@
+import logging
+from collections import namedtuple
+
+log = logging.getLogger(__name__)
+
+# A compiled schedule is a flat list of steps the frying worker executes in
+# order. Actions:
+#   preheat  wait (basket up) until the oil is within reach of setpoint
+#   lower    lower the basket
+#   fry      hold setpoint for duration with the basket down
+#   raise    raise the basket
+#   heat     hold setpoint for duration with the basket up
+#   rest     basket up for duration while the oil heads to the next setpoint
+Step = namedtuple("Step", "action setpoint duration label")
+
+TEMP_RANGE = (100, 250)
+TIME_RANGE = (30, 600)
+REST_RANGE = (0, 600)
+
+
+def stages_from_params(params):
+    """Return the stage list for a menu item, single-stage items included."""
+    if params.get("stages"):
+        return params["stages"]
+    return [{"temp": params["temp"], "time": params["time"]}]
+
+
+def validate_stage(stage):
+    temp = int(stage["temp"])
+    duration = int(stage["time"])
+    rest = int(stage.get("rest", 0))
+    basket = stage.get("basket", "down")
+    if not TEMP_RANGE[0] <= temp <= TEMP_RANGE[1]:
+        raise ValueError(f"temperature {temp}°C must be between {TEMP_RANGE[0]} and {TEMP_RANGE[1]}")
+    if not TIME_RANGE[0] <= duration <= TIME_RANGE[1]:
+        raise ValueError(f"time {duration} seconds must be between {TIME_RANGE[0]} and {TIME_RANGE[1]}")
+    if not REST_RANGE[0] <= rest <= REST_RANGE[1]:
+        raise ValueError(f"rest {rest} seconds must be between {REST_RANGE[0]} and {REST_RANGE[1]}")
+    if basket not in ("down", "up"):
+        raise ValueError(f"basket must be 'down' or 'up', not '{basket}'")
+    stage = {"temp": temp, "time": duration}
+    if rest:
+        stage["rest"] = rest
+    if basket != "down":
+        stage["basket"] = basket
+    return stage
+
+
+def compile_stages(stages):
+    """Compile stage dicts into a setpoint/actuation schedule."""
+    steps = []
+    basket_down = False
+    count = len(stages)
+    for index, stage in enumerate(stages):
+        label = f"Stage {index + 1}/{count}" if count > 1 else ""
+        setpoint = stage["temp"]
+        if stage.get("basket", "down") == "down":
+            if not basket_down:
+                steps.append(Step("preheat", setpoint, 0, label))
+                steps.append(Step("lower", setpoint, 0, label))
+                basket_down = True
+            steps.append(Step("fry", setpoint, stage["time"], label))
+        else:
+            if basket_down:
+                steps.append(Step("raise", setpoint, 0, label))
+                basket_down = False
+            steps.append(Step("heat", setpoint, stage["time"], label))
+
+        rest = stage.get("rest", 0)
+        if rest:
+            if basket_down:
+                steps.append(Step("raise", setpoint, 0, label))
+                basket_down = False
+            next_setpoint = stages[index + 1]["temp"] if index + 1 < count else setpoint
+            steps.append(Step("rest", next_setpoint, rest, label))
+    if basket_down:
+        steps.append(Step("raise", stages[-1]["temp"], 0, ""))
+    return steps
+
+
+def compile_profile(params):
+    return compile_stages(stages_from_params(params))
+
+
+def compile_menu(menu_data):
+    """Precompile every menu item; returns {(category, item): steps}."""
+    schedules = {}
+    for category, items in menu_data.items():
+        for item, params in items.items():
+            try:
+                schedules[(category, item)] = compile_profile(params)
+            except (KeyError, TypeError, ValueError) as e:
+                log.error("Failed to compile cooking profile for %s: %s", item, e)
+    return schedules
+
+
+def total_time(params):
+    return sum(s["time"] + s.get("rest", 0) for s in stages_from_params(params))
+
+
+def profile_from_stages(stages):
+    """Build a menu entry from validated stages; temp/time summarise it for the card."""
+    if len(stages) == 1 and not stages[0].get("rest") and stages[0].get("basket", "down") == "down":
+        return {"temp": stages[0]["temp"], "time": stages[0]["time"]}
+    params = {"temp": stages[0]["temp"], "stages": stages}
+    params["time"] = total_time(params)
+    return params
@@ -0,0 +1,185 @@
+"""Replay a recorded serial session through FryerController.
+
+    python replay.py session.jsonl [--speed 10] [--reference ref.jsonl] [--output out.jsonl]
+
+Sessions are either the timestamped capture written when
+serial.capture_file is set, or a plain serial_log.txt (lines are then
+spaced --line-interval seconds apart). The commands the controller sends
+are diffed against the reference: the session's own recorded commands, or
+a previous --output file.
+
+The controller runs on a VirtualClock. When the capture contains the cooks
+that were started, they are re-run through the real frying worker in
+virtual time (closed loop); otherwise the recorded frying state is applied
+as-is.
+"""
+import argparse
+import difflib
+import json
+import os
+import sys
+import tempfile
+
+from captures import load_session
+from clock import VirtualClock
+from config import load_config, merge_config
+from controller import FryerController
+from recipes import Step
+
+class ReplayTransport:
+    """Serial stand-in: serves recorded bytes and records what is written."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.pending = bytearray()
+        self.sent = []
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return len(self.pending)
+
+    def feed(self, line):
+        self.pending += line.encode("utf-8") + b"\n"
+
+    def read(self, size=1):
+        data = bytes(self.pending[:size])
+        del self.pending[:size]
+        return data
+
+    def write(self, data):
+        for line in data.decode("utf-8", errors="ignore").splitlines():
+            self.sent.append((round(self.clock.now(), 3), line))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        self.pending.clear()
+
+    def close(self):
+        self.is_open = False
+
+
+class ReplayEngine:
+    """Plays a session into a headless controller at real time (speed=1),
+    N times faster (speed=N) or as fast as possible (speed=0).
+
+    A replay leaves the kiosk alone: no serial or checkpoint files, no
+    telemetry, no shared power budget, no thermal model. The cooks it runs
+    never teach the golden curves and are recorded into a scratch directory
+    that goes away afterwards.
+    The preheat forecast is off too: the virtual wall clock starts at
+    today's time, so its windows would depend on when the replay runs.
+    """
+
+    def __init__(self, events, config, speed=0.0, tick=None):
+        self.events = events
+        self.config = merge_config(config, {"serial": {"log_file": "", "capture_file": "", "estop_log": ""},
+                                            "checkpoint": {"file": ""},
+                                            "telemetry": {"url": ""},
+                                            "heaters": {"shared_budget_file": ""},
+                                            "thermal_model": {"file": ""},
+                                            "forecast": {"file": ""},
+                                            "conformance": {"learn": False}})
+        self.speed = speed
+        self.tick = tick
+
+    def run(self):
+        with tempfile.TemporaryDirectory(prefix="replay-") as scratch:
+            config = merge_config(self.config, {"history": {"dir": os.path.join(scratch, "cook_history")},
+                                                "conformance": {"dir": os.path.join(scratch, "golden_curves")}})
+            return self.play(config)
+
+    def play(self, config):
+        clock = VirtualClock(pace=self.speed)
+        transport = ReplayTransport(clock)
+        controller = FryerController(config, transport=transport, clock=clock)
+        closed_loop = any(kind == "job" for _, kind, _ in self.events)
+        reference = []
+
+        def apply(t, kind, value):
+            if kind == "rx":
+                transport.feed(value)
+            elif kind == "tx":
+                reference.append((t, value))
+            elif kind == "job":
+                controller.start_frying(value["item"], value["temp"], value["time"],
+                                        [Step(*step) for step in value["schedule"]], value.get("category"),
+                                        value.get("basket"))
+            elif kind == "order" and closed_loop:
+                controller.order_tapped(value["category"], value["temp"])
+            elif kind == "stop" and closed_loop:
+                if value == "emergency":
+                    controller.emergency_stop()
+                else:
+                    controller.reset()
+            elif kind == "state" and not closed_loop:
+                controller.frying_active = value["frying_active"]
+                controller.target_temperature = value["target"]
+
+        for t, kind, value in self.events:
+            clock.call_at(t, lambda t=t, kind=kind, value=value: apply(t, kind, value))
+        clock.call_every(self.tick or controller.control_period, controller.control_tick)
+        end = self.events[-1][0] if self.events else 0.0
+        clock.run_until(end)
+        return transport.sent, reference
+
+
+def diff_commands(reference, produced, tolerance=1.0):
+    """Differences between two [(t, command)] streams; empty when they match."""
+    ref_cmds = [c for _, c in reference]
+    out_cmds = [c for _, c in produced]
+    report = []
+    matcher = difflib.SequenceMatcher(a=ref_cmds, b=out_cmds, autojunk=False)
+    for op, a1, a2, b1, b2 in matcher.get_opcodes():
+        if op == "equal":
+            for (ta, cmd), (tb, _) in zip(reference[a1:a2], produced[b1:b2]):
+                if abs(ta - tb) > tolerance:
+                    report.append(f"~ {cmd}: t={ta:.1f}s -> t={tb:.1f}s")
+            continue
+        for t, cmd in reference[a1:a2]:
+            report.append(f"- {t:8.1f}s {cmd}")
+        for t, cmd in produced[b1:b2]:
+            report.append(f"+ {t:8.1f}s {cmd}")
+    return report
+
+
+def load_reference(path):
+    with open(path, "r") as f:
+        return [(r["t"], r["tx"]) for r in map(json.loads, f) if "tx" in r]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded fryer serial session")
+    parser.add_argument("session")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, N = N x, 0 = as fast as possible")
+    parser.add_argument("--tick", type=float, help="fixed control tick in seconds (default: the phase-adaptive rate)")
+    parser.add_argument("--line-interval", type=float, default=0.5, help="spacing of lines in a plain text log")
+    parser.add_argument("--config", default="fryer_config.json")
+    parser.add_argument("--reference", help="command stream to diff against (default: the session's own)")
+    parser.add_argument("--output", help="write the produced command stream here")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="allowed timing difference in seconds")
+    args = parser.parse_args(argv)
+
+    events = load_session(args.session, args.line_interval)
+    produced, recorded = ReplayEngine(events, load_config(args.config), args.speed, args.tick).run()
+    if args.output:
+        with open(args.output, "w") as f:
+            for t, command in produced:
+                f.write(json.dumps({"t": t, "tx": command}) + "\n")
+
+    reference = load_reference(args.reference) if args.reference else recorded
+    if not reference and not args.reference:
+        print(f"Replayed {len(events)} events, {len(produced)} commands (no reference to diff)")
+        return 0
+    report = diff_commands(reference, produced, args.tolerance)
+    for line in report:
+        print(line)
+    print(f"Replayed {len(events)} events, {len(produced)} commands, {len(report)} differences")
+    return 1 if report else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
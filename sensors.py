@@ -0,0 +1,170 @@
+import re
+from collections import deque
+
+# "OIL:182.4°C", "T2=201C", or a bare "182.4 °C"; the degree sign may arrive
+# as UTF-8 (C2 B0) or Latin-1 (B0) depending on the firmware build.
+TEMP_PATTERN = re.compile(rb"(?:([A-Za-z][A-Za-z0-9_]*)\s*[:=]\s*)?(-?\d+(?:\.\d+)?)\s*(?:\xc2\xb0|\xb0)?C")
+
+MAX_BUFFER = 4096
+
+
+class MedianFilter:
+    def __init__(self, window=5):
+        self.samples = deque(maxlen=max(1, int(window)))
+
+    def update(self, value):
+        self.samples.append(value)
+        ordered = sorted(self.samples)
+        mid = len(ordered) // 2
+        if len(ordered) % 2:
+            return ordered[mid]
+        return (ordered[mid - 1] + ordered[mid]) / 2.0
+
+    def reset(self):
+        self.samples.clear()
+
+
+class KalmanFilter:
+    """Scalar random-walk Kalman filter."""
+
+    def __init__(self, process_variance=0.05, measurement_variance=1.0):
+        self.q = process_variance
+        self.r = measurement_variance
+        self.estimate = None
+        self.error = 1.0
+
+    def update(self, value):
+        if self.estimate is None:
+            self.estimate = value
+            self.error = self.r
+            return value
+        self.error += self.q
+        gain = self.error / (self.error + self.r)
+        self.estimate += gain * (value - self.estimate)
+        self.error *= (1 - gain)
+        return self.estimate
+
+    def reset(self):
+        self.estimate = None
+        self.error = 1.0
+
+
+class PassThroughFilter:
+    def update(self, value):
+        return value
+
+    def reset(self):
+        pass
+
+
+class OutlierRejector:
+    """Drops implausible readings and single-sample spikes.
+
+    A jump larger than max_step is rejected unless it persists for more than
+    max_rejections consecutive samples, in which case it is a real change.
+    """
+
+    def __init__(self, min_value=0, max_value=300, max_step=15.0, max_rejections=3):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.max_step = max_step
+        self.max_rejections = max_rejections
+        self.rejected = 0
+        self.total_rejected = 0
+
+    def accept(self, value, reference):
+        if value < self.min_value or value > self.max_value:
+            self.total_rejected += 1
+            return False
+        if reference is not None and abs(value - reference) > self.max_step:
+            self.rejected += 1
+            if self.rejected <= self.max_rejections:
+                self.total_rejected += 1
+                return False
+        self.rejected = 0
+        return True
+
+
+class ProbeChannel:
+    def __init__(self, name, value_filter, rejector):
+        self.name = name
+        self.filter = value_filter
+        self.rejector = rejector
+        self.value = None
+        self.raw = None
+
+    def add(self, reading):
+        self.raw = reading
+        if not self.rejector.accept(reading, self.value):
+            return False
+        if self.value is not None and abs(reading - self.value) > self.rejector.max_step:
+            # A jump that survived rejection is a real step; don't smear it.
+            self.filter.reset()
+        self.value = self.filter.update(reading)
+        return True
+
+
+def make_filter(config):
+    kind = config.get("filter", "median")
+    if kind == "kalman":
+        return KalmanFilter(config.get("kalman_process_variance", 0.05),
+                            config.get("kalman_measurement_variance", 1.0))
+    if kind == "median":
+        return MedianFilter(config.get("median_window", 5))
+    return PassThroughFilter()
+
+
+class TemperatureIngest:
+    """Parses raw serial bytes into filtered per-probe temperatures."""
+
+    def __init__(self, config):
+        self.config = config
+        self.probe_order = list(config.get("probe_order", ["oil"]))
+        self.labels = {k.upper(): v for k, v in config.get("labels", {}).items()}
+        self.buffer = b""
+        self.channels = {}
+
+    def channel(self, name):
+        if name not in self.channels:
+            low, high = self.config.get("valid_range", [0, 300])
+            max_step = self.config.get("max_step", {}).get(name, 15.0)
+            rejector = OutlierRejector(low, high, max_step, self.config.get("max_rejections", 3))
+            self.channels[name] = ProbeChannel(name, make_filter(self.config), rejector)
+        return self.channels[name]
+
+    def parse_line(self, line):
+        readings = {}
+        position = 0
+        for label, value in TEMP_PATTERN.findall(line):
+            # Unknown labels ("Temp: 182.0°C") fall back to position.
+            probe = self.labels.get(label.decode("ascii").upper()) if label else None
+            if probe is None:
+                if position >= len(self.probe_order):
+                    continue
+                probe = self.probe_order[position]
+                position += 1
+            readings[probe] = float(value)
+        return readings
+
+    def feed(self, data):
+        """Consume a chunk of bytes; return [(line, readings)] for each complete line."""
+        self.buffer += data
+        lines = self.buffer.split(b"\n")
+        self.buffer = lines.pop()[-MAX_BUFFER:]
+        parsed = []
+        for raw in lines:
+            line = raw.strip()
+            if not line:
+                continue
+            readings = self.parse_line(line)
+            for probe, reading in readings.items():
+                self.channel(probe).add(reading)
+            parsed.append((line.decode("utf-8", errors="ignore"), readings))
+        return parsed
+
+    def value(self, probe="oil"):
+        channel = self.channels.get(probe)
+        return channel.value if channel else None
+
+    def values(self):
+        return {name: ch.value for name, ch in self.channels.items() if ch.value is not None}
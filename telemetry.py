@@ -0,0 +1,186 @@
+import glob
+import gzip
+import json
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from logs import fields
+
+log = logging.getLogger(__name__)
+
+
+def _clean(value):
+    """JSON-safe copy: NaN/inf become null, NumPy scalars become plain numbers."""
+    if isinstance(value, dict):
+        return {k: _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class TelemetrySpool:
+    """Bounded on-disk queue of compressed batches; the oldest go first when full."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        self.bytes = sum(os.path.getsize(path) for path in self.files())
+
+    def files(self):
+        return sorted(glob.glob(os.path.join(self.directory, "batch-*.json.gz")))
+
+    def fill(self):
+        return self.bytes / self.max_bytes if self.max_bytes else 0.0
+
+    def put(self, body):
+        path = os.path.join(self.directory, f"batch-{time.time_ns():020d}.json.gz")
+        with open(path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)
+        self.bytes += len(body)
+        files = self.files()
+        while self.bytes > self.max_bytes and len(files) > 1:
+            oldest = files.pop(0)
+            self.remove(oldest)
+            self.dropped += 1
+            log.warning("Telemetry spool full, dropped %s", os.path.basename(oldest))
+
+    def remove(self, path):
+        size = os.path.getsize(path)
+        os.remove(path)
+        self.bytes = max(self.bytes - size, 0)
+
+    def oldest(self):
+        files = self.files()
+        return files[0] if files else None
+
+
+class TelemetryShipper:
+    """Batches cook records, metrics and alarms and ships them to an HTTP
+    collector as gzip-compressed JSON.
+
+    emit() only appends to memory and never blocks the control loop. A
+    background thread seals a batch into the spool every flush_interval (or
+    sooner once batch_size records are waiting), then uploads spooled
+    batches oldest first, backing off exponentially while the collector is
+    unreachable. Alarms are flushed straight away. While the spool is more
+    than backpressure_fill full, metrics are refused so the space left goes
+    to cook records and alarms.
+    """
+
+    def __init__(self, config, clock):
+        self.config = config
+        self.clock = clock
+        self.url = config["url"]
+        self.site = config.get("site") or ""
+        self.fryer = config.get("fryer") or socket.gethostname()
+        self.spool = TelemetrySpool(config["spool_dir"], config["spool_max_bytes"])
+        self.pending = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.urgent = False
+        self.running = False
+        self.backoff = 0.0
+        self.retry_at = 0.0
+        self.last_flush = clock.now()
+        self.sent_batches = 0
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._run, name="telemetry", daemon=True).start()
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+
+    def emit(self, kind, payload):
+        if kind == "metrics" and self.spool.fill() > self.config["backpressure_fill"]:
+            return False
+        record = {"kind": kind, "t": self.clock.wall(), "data": _clean(payload)}
+        with self.lock:
+            self.pending.append(record)
+            full = len(self.pending) >= self.config["batch_size"]
+        if full or kind == "alarm":
+            self.urgent = True
+            self.wake.set()
+        return True
+
+    def seal(self):
+        """Move pending records into the spool as one compressed batch."""
+        with self.lock:
+            records, self.pending = self.pending, []
+        self.last_flush = self.clock.now()
+        if not records:
+            return
+        envelope = {"site": self.site, "fryer": self.fryer, "sealed_at": self.clock.wall(), "records": records}
+        body = gzip.compress(json.dumps(envelope, separators=(",", ":")).encode("utf-8"))
+        try:
+            self.spool.put(body)
+        except OSError as e:
+            log.error("Failed to spool telemetry batch: %s", e)
+
+    def upload(self, path):
+        with open(path, "rb") as f:
+            body = f.read()
+        request = urllib.request.Request(self.url, data=body, method="POST", headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        })
+        try:
+            with urllib.request.urlopen(request, timeout=self.config["timeout"]) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            if 400 <= e.code < 500 and e.code not in (408, 429):
+                # The collector will never take this batch; don't block the queue on it.
+                log.error("Telemetry collector rejected %s (%s), discarding", os.path.basename(path), e.code)
+                self.spool.remove(path)
+                return
+            raise
+        self.spool.remove(path)
+        self.sent_batches += 1
+
+    def ship(self):
+        """Upload spooled batches until the spool is empty or an upload fails."""
+        while self.running and self.clock.now() >= self.retry_at:
+            path = self.spool.oldest()
+            if path is None:
+                return
+            try:
+                self.upload(path)
+                self.backoff = 0.0
+            except (urllib.error.URLError, OSError) as e:
+                self.backoff = min(max(self.backoff * 2, self.config["initial_backoff"]), self.config["max_backoff"])
+                self.retry_at = self.clock.now() + self.backoff
+                log.warning("Telemetry upload failed (%s)", e, extra=fields(retry_in=round(self.backoff, 1)))
+                return
+
+    def _run(self):
+        while self.running:
+            self.wake.wait(1.0)
+            self.wake.clear()
+            if self.urgent or self.clock.now() - self.last_flush >= self.config["flush_interval"]:
+                self.urgent = False
+                self.seal()
+            self.ship()
+        self.seal()
+
+
+def make_telemetry(config, clock):
+    """A shipper when telemetry.url is set, otherwise None."""
+    if not config.get("url"):
+        return None
+    shipper = TelemetryShipper(config, clock)
+    shipper.start()
+    return shipper
@@ -0,0 +1,73 @@
+"""Minimal stand-in for the fleet telemetry collector.
+
+    python telemetry_collector.py [--port 8750] [--out telemetry_received.jsonl] [--fail-rate 0.2]
+
+Accepts the gzip-compressed batches TelemetryShipper POSTs, appends every
+record (tagged with site and fryer) to --out as JSON lines and prints a
+line per batch. --fail-rate answers that fraction of requests with 503,
+to exercise the shipper's spooling and retry.
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if random.random() < server.fail_rate:
+            self.send_error(503, "Collector busy (simulated)")
+            return
+        try:
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            batch = json.loads(body)
+            records = batch["records"]
+        except (OSError, ValueError, KeyError) as e:
+            self.send_error(400, f"Bad batch: {e}")
+            return
+        with server.lock:
+            with open(server.out, "a") as f:
+                for record in records:
+                    f.write(json.dumps(dict(record, site=batch.get("site"), fryer=batch.get("fryer"))) + "\n")
+            server.batches += 1
+        kinds = {}
+        for record in records:
+            kinds[record["kind"]] = kinds.get(record["kind"], 0) + 1
+        print(f"batch {server.batches} from {batch.get('site')}/{batch.get('fryer')}: "
+              f"{len(records)} records {kinds}, {len(body)} bytes uncompressed")
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the fleet telemetry collector")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8750)
+    parser.add_argument("--out", default="telemetry_received.jsonl")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), CollectorHandler)
+    server.out = args.out
+    server.fail_rate = args.fail_rate
+    server.lock = threading.Lock()
+    server.batches = 0
+    print(f"Collecting on http://{args.host}:{args.port}/ingest into {args.out}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+from checkpoint import CookCheckpoint, basket_checkpoint_path
+from clock import VirtualClock
+from recipes import compile_stages
+from test_controller import make_controller
+
+
+def fry_checkpoint(path, clock, remaining=40):
+    schedule = compile_stages([{"temp": 175, "time": 60}])
+    index = next(i for i, step in enumerate(schedule) if step.action == "fry")
+    CookCheckpoint(path, clock).save(item="Fries", schedule=[list(step) for step in schedule], step=index,
+                                     remaining=remaining, target=175, frying_time=60, basket="lowered",
+                                     started_at=clock.wall() - 30)
+
+
+def test_save_load_clear(tmp_path):
+    clock = VirtualClock(wall_start=1000.0)
+    checkpoint = CookCheckpoint(str(tmp_path / "cook.json"), clock)
+    assert checkpoint.load() is None
+    checkpoint.save(item="Fries", schedule=[["fry", 175, 60, ""]], step=0)
+    state = checkpoint.load()
+    assert state["item"] == "Fries" and state["updated_at"] == 1000.0
+    checkpoint.clear()
+    assert checkpoint.load() is None
+
+
+def test_heartbeat_is_throttled(tmp_path):
+    clock = VirtualClock()
+    checkpoint = CookCheckpoint(str(tmp_path / "cook.json"), clock, heartbeat_interval=5.0)
+    checkpoint.save(schedule=[], remaining=60)
+    clock.run_until(2.0)
+    checkpoint.heartbeat(remaining=58)
+    assert checkpoint.load()["remaining"] == 60
+    clock.run_until(6.0)
+    checkpoint.heartbeat(remaining=54)
+    assert checkpoint.load()["remaining"] == 54
+
+
+def test_unreadable_checkpoint_is_ignored(tmp_path):
+    path = tmp_path / "cook.json"
+    path.write_text("{not json")
+    assert CookCheckpoint(str(path), VirtualClock()).load() is None
+
+
+def test_basket_paths():
+    assert basket_checkpoint_path("cook.json", 0) == "cook.json"
+    assert basket_checkpoint_path("cook.json", 1) == "cook.basket2.json"
+
+
+def test_recent_cook_resumes_and_is_sampled_from_the_start(tmp_path):
+    clock = VirtualClock(wall_start=5000.0)
+    path = str(tmp_path / "cook.json")
+    fry_checkpoint(path, clock)
+    controller = make_controller(tmp_path, clock=clock, checkpoint={"file": path})
+    controller.current_temp = 175
+    assert [entry["action"] for entry in controller.recover()] == ["resumed"]
+    clock.run_until(1.0)
+    basket = controller.baskets[0]
+    assert basket.active and basket.position == "lowered"
+    assert basket.tracker.drop_at is not None
+    assert basket.conformance.started is not None
+
+
+def test_stale_cook_is_finished_safely(tmp_path):
+    clock = VirtualClock(wall_start=5000.0)
+    path = str(tmp_path / "cook.json")
+    fry_checkpoint(path, clock)
+    clock.run_until(600.0)
+    controller = make_controller(tmp_path, clock=clock, checkpoint={"file": path})
+    assert [entry["action"] for entry in controller.recover()] == ["finished"]
+    assert not controller.baskets[0].active
+    assert controller.baskets[0].position == "raised"
+    assert CookCheckpoint(path, clock).load() is None
@@ -0,0 +1,39 @@
+from clock import TkScheduler, VirtualClock
+
+
+class Root:
+    """The after()/after_cancel() part of a Tk root, driven by a VirtualClock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def after(self, ms, fn):
+        return self.clock.call_at(self.clock.now() + ms / 1000.0, fn)
+
+    def after_cancel(self, after_id):
+        self.clock.cancel(after_id)
+
+
+def test_tk_job_keeps_running_after_a_callback_raises():
+    clock = VirtualClock()
+    scheduler = TkScheduler(Root(clock), clock)
+    calls = []
+
+    def flaky():
+        calls.append(clock.now())
+        if len(calls) == 2:
+            raise KeyError("menu item without a temp")
+
+    scheduler.call_every(1.0, flaky)
+    clock.run_until(5.0)
+    assert calls == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_finished_workers_are_forgotten():
+    clock = VirtualClock()
+    for _ in range(3):
+        clock.spawn(clock.sleep, 1.0)
+    clock.run_until(0.5)
+    assert len(clock.workers) == 3
+    clock.run_until(2.0)
+    assert clock.workers == {}
@@ -0,0 +1,54 @@
+from clock import VirtualClock
+from connection import SerialSupervisor
+
+
+class Stop:
+    """Stands in for the supervisor's stop event: records each wait and ends the loop after a few."""
+
+    def __init__(self, clock, waits):
+        self.clock = clock
+        self.waits = []
+        self.limit = waits
+
+    def is_set(self):
+        return len(self.waits) >= self.limit
+
+    def set(self):
+        self.limit = 0
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        self.clock.run_until(self.clock.now() + timeout)
+        return self.is_set()
+
+
+def test_reconnects_back_off_up_to_the_limit(tmp_path):
+    clock = VirtualClock()
+    supervisor = SerialSupervisor(str(tmp_path / "ttyACM0"), 9600,
+                                  {"initial_backoff": 0.5, "max_backoff": 4.0}, clock=clock)
+    supervisor._stop = Stop(clock, waits=6)
+    supervisor._run()
+    assert supervisor._stop.waits == [0.5, 1.0, 2.0, 4.0, 4.0, 4.0]
+    assert not supervisor.connected and supervisor.last_error
+
+
+def test_missing_device_node_is_polled_without_backoff():
+    clock = VirtualClock()
+    supervisor = SerialSupervisor("/dev/ttyNOSUCHPORT", 9600, {"poll_interval": 0.25}, clock=clock)
+    supervisor._stop = Stop(clock, waits=3)
+    supervisor._run()
+    assert supervisor._stop.waits == [0.25, 0.25, 0.25]
+
+
+def test_silent_link_is_dropped_after_the_stale_timeout():
+    clock = VirtualClock()
+    dropped = []
+    supervisor = SerialSupervisor("loop://", 9600, {"settle_time": 0.0, "poll_interval": 1.0, "stale_timeout": 5.0},
+                                  on_disconnect=dropped.append, clock=clock)
+    supervisor._stop = Stop(clock, waits=5)
+    supervisor._run()
+    assert supervisor.connected and dropped == []
+    supervisor._stop.limit = 9
+    supervisor._run()
+    assert dropped == ["no data for 5s"]
+    assert supervisor.disconnects == 1 and supervisor.restored_at > 0
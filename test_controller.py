@@ -0,0 +1,82 @@
+from clock import VirtualClock
+from config import DEFAULT_CONFIG, merge_config
+from controller import FryerController
+
+
+class Port:
+    """Serial stand-in that keeps what is written."""
+
+    is_open = True
+    in_waiting = 0
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines.extend(data.decode().splitlines())
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def make_controller(tmp_path, transport=None, clock=None, **overrides):
+    config = merge_config(DEFAULT_CONFIG, {
+        "serial": {"log_file": "", "capture_file": "", "estop_log": "", "command_delay": 0},
+        "checkpoint": {"file": ""},
+        "heaters": {"feed": str(tmp_path)},  # budgets are shared per feed across controllers
+        "history": {"dir": str(tmp_path / "history")},
+        "conformance": {"dir": str(tmp_path / "curves"), "learn": False},
+        "forecast": {"file": ""},
+        "thermal_model": {"file": ""},
+    })
+    return FryerController(merge_config(config, overrides), transport=transport or Port(), clock=clock or VirtualClock())
+
+
+def frying(controller, setpoint, temp, dropped=()):
+    controller.frying_active = True
+    controller.target_temperature = setpoint
+    controller.current_temp = temp
+    for basket, at in zip(controller.baskets, dropped):
+        basket.active = True
+        basket.dropped_at = at
+
+
+def heaters_on(controller):
+    return [controller.heating1_state, controller.heating2_state].count(True)
+
+
+def test_no_feedforward_above_setpoint(tmp_path):
+    controller = make_controller(tmp_path)
+    frying(controller, 170, 185, dropped=[0.0, 1.0])
+    controller.control_heaters(now=5.0)
+    assert heaters_on(controller) == 0
+
+
+def test_no_feedforward_for_a_single_basket(tmp_path):
+    controller = make_controller(tmp_path)
+    frying(controller, 170, 169, dropped=[0.0])
+    assert controller.drop_feedforward(5.0) == 0.0
+    controller.control_heaters(now=5.0)
+    assert heaters_on(controller) == 1
+
+
+def test_feedforward_for_a_second_basket(tmp_path):
+    controller = make_controller(tmp_path)
+    frying(controller, 170, 169, dropped=[0.0, 100.0])
+    feedforward = DEFAULT_CONFIG["baskets"]["drop_feedforward"]
+    assert controller.drop_feedforward(110.0) == feedforward
+    assert controller.drop_feedforward(200.0) == 0.0
+    controller.control_heaters(now=110.0)
+    assert heaters_on(controller) == 2
+
+
+def test_oil_above_setpoint_is_not_heating(tmp_path):
+    controller = make_controller(tmp_path)
+    frying(controller, 170, 150)
+    assert controller.classify_phase(0.0) == "heating"
+    controller.current_temp = 185
+    assert controller.classify_phase(1.0) == "approach"
+    controller.current_temp = 171
+    controller.classify_phase(2.0)
+    assert controller.classify_phase(2.0 + controller.config["control"]["stable_hold"]) == "stable"
@@ -0,0 +1,112 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from config import DEFAULT_CONFIG
+from controlproc import SEQ, ControllerClient, StateBoard
+
+
+def test_read_gives_up_on_a_board_left_mid_publish():
+    board = StateBoard()
+    try:
+        last = board.read()
+        SEQ.pack_into(board.shm.buf, 0, 7)  # writer died between its two sequence updates
+        started = time.monotonic()
+        assert board.read() is last
+        assert time.monotonic() - started < 1.0
+        board.reset()
+        assert SEQ.unpack_from(board.shm.buf)[0] == 8
+        assert board.read() is not last
+    finally:
+        board.close(unlink=True)
+
+
+class FakeController:
+    """The controller process end of the pipe: reset takes a while to answer."""
+
+    def __init__(self, conn, reset_time):
+        self.conn = conn
+        self.reset_time = reset_time
+        self.send_lock = threading.Lock()
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def reply(self, request_id, result, delay=0.0):
+        time.sleep(delay)
+        with self.send_lock:
+            self.conn.send(("reply", request_id, result))
+
+    def serve(self):
+        while True:
+            try:
+                request_id, name, args = self.conn.recv()
+            except (EOFError, OSError):
+                return
+            if name == "reset":
+                threading.Thread(target=self.reply, args=(request_id, True, self.reset_time), daemon=True).start()
+            else:
+                self.reply(request_id, name)
+
+
+def make_client():
+    client = ControllerClient(DEFAULT_CONFIG)
+    client.conn, other_end = multiprocessing.Pipe()
+    client.listen(client.conn)
+    return client, other_end
+
+
+def test_emergency_stop_is_not_held_behind_a_slow_reset():
+    client, other_end = make_client()
+    FakeController(other_end, reset_time=1.0)
+    results = {}
+    resetting = threading.Thread(target=lambda: results.update(reset=client.reset()))
+    resetting.start()
+    time.sleep(0.1)
+    started = time.monotonic()
+    assert client.emergency_stop() == "emergency_stop"
+    assert time.monotonic() - started < 0.5
+    resetting.join()
+    assert results["reset"] is True
+    other_end.close()
+    client.board.close(unlink=True)
+
+
+def test_call_fails_fast_when_the_process_goes_away():
+    client, other_end = make_client()
+    threading.Timer(0.1, other_end.close).start()
+    started = time.monotonic()
+    assert client.call("reset", timeout=5.0) is False
+    assert time.monotonic() - started < 1.0
+    client.board.close(unlink=True)
+
+
+def test_history_is_read_through_the_controller_process():
+    client, other_end = make_client()
+    FakeController(other_end, reset_time=0.0)
+    assert client.history.load() == "history"
+    other_end.close()
+    with pytest.raises(OSError):
+        client.history.load()
+    client.board.close(unlink=True)
+
+
+class DeadProcess:
+    exitcode = -9
+
+    def is_alive(self):
+        return False
+
+
+def test_restart_does_not_wait_for_the_new_process():
+    client = ControllerClient(DEFAULT_CONFIG)
+    client.ready.set()
+    client.process = DeadProcess()
+    launched = []
+    client.launch = lambda: (launched.append(True), client.ready.clear())
+    started = time.monotonic()
+    client.control_tick()
+    assert time.monotonic() - started < 1.0
+    assert launched == [True]
+    assert client.link_status()["text"] == "CONTROLLER NOT RESPONDING"
+    client.board.close(unlink=True)
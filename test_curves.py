@@ -0,0 +1,70 @@
+import numpy as np
+
+from config import DEFAULT_CONFIG
+from curves import ConformanceMonitor, GoldenCurves
+
+LENGTH = 200
+SETPOINT = 175.0
+
+
+def usual(seconds=LENGTH):
+    """Oil minus setpoint: a 10°C dip at drop, back at setpoint after two minutes."""
+    t = np.arange(seconds, dtype=float)
+    return np.interp(t, [0, 20, 120], [0.0, -10.0, 0.0])
+
+
+def learned(tmp_path, cooks=5):
+    curves = GoldenCurves(str(tmp_path), keep=5, max_length=LENGTH)
+    for _ in range(cooks):
+        curves.append("Chicken Wings", usual())
+    return curves
+
+
+def run(monitor, trace, full_heat=False, every=1):
+    monitor.start(0.0)
+    fired = {}
+    for second in range(0, len(trace), every):
+        for alert in monitor.sample(SETPOINT + trace[second], SETPOINT, float(second), full_heat):
+            fired[alert] = second
+    return fired
+
+
+def test_golden_curve_needs_enough_cooks(tmp_path):
+    curves = learned(tmp_path, cooks=4)
+    assert curves.golden("Chicken Wings") is None
+    curves.append("Chicken Wings", np.concatenate([usual(100), np.full(LENGTH - 100, np.nan)]))
+    median, spread = curves.golden("Chicken Wings")
+    assert np.allclose(median[:100], usual(100)) and not spread[:100].any()
+    assert np.isnan(median[100:]).all()  # only four cooks got that far
+    assert curves.golden("Fries") is None
+
+
+def test_only_the_last_cooks_are_kept(tmp_path):
+    curves = learned(tmp_path)
+    curves.append("Chicken Wings", usual() - 1.0)
+    assert len(curves.load("Chicken Wings")) == 5
+    assert curves.golden("Chicken Wings", min_cooks=1)[0][LENGTH - 1] == 0.0
+
+
+def test_a_usual_cook_raises_nothing(tmp_path):
+    golden = learned(tmp_path).golden("Chicken Wings")
+    monitor = ConformanceMonitor("Chicken Wings", golden, DEFAULT_CONFIG["conformance"], LENGTH)
+    assert run(monitor, usual() - 1.0, full_heat=True, every=2) == {}
+    assert np.allclose(monitor.curve()[:LENGTH - 1], usual()[:LENGTH - 1] - 1.0)
+
+
+def test_a_cook_that_drops_deep_and_stays_low(tmp_path):
+    golden = learned(tmp_path).golden("Chicken Wings")
+    monitor = ConformanceMonitor("Chicken Wings", golden, DEFAULT_CONFIG["conformance"], LENGTH)
+    trace = np.interp(np.arange(LENGTH), [0, 20, LENGTH], [0.0, -25.0, -20.0])
+    fired = run(monitor, trace, full_heat=True)
+    assert set(fired) == {"drop", "element", "recovery"}
+    assert fired["drop"] < DEFAULT_CONFIG["conformance"]["drop_window"]
+    # The usual cook is within the recovery band from second 91; this one is held low 30s past that.
+    assert fired["recovery"] == 91 + DEFAULT_CONFIG["conformance"]["recovery_hold"]
+
+
+def test_no_golden_curve_only_records(tmp_path):
+    monitor = ConformanceMonitor("Fries", None, DEFAULT_CONFIG["conformance"], LENGTH)
+    assert run(monitor, usual() - 30.0) == {}
+    assert monitor.curve()[50] == usual()[50] - 30.0
@@ -0,0 +1,115 @@
+"""Emergency stop: preemption of resends, and press-to-wire latency
+against a pty standing in for the serial port."""
+import os
+import random
+import threading
+import time
+
+import pytest
+import serial
+
+from clock import MonotonicClock
+from test_controller import Port, make_controller
+
+TRIALS = 10
+BOUND_MS = 50.0
+
+
+class StopMidRetries(Port):
+    """Latches the emergency stop right after the first write, the way a
+    stop lands between a sender picking up the generation and its resends."""
+
+    def __init__(self):
+        super().__init__()
+        self.controller = None
+
+    def write(self, data):
+        written = super().write(data)
+        self.controller.estopped = True
+        return written
+
+
+def test_resends_stop_once_the_latch_is_set(tmp_path):
+    controller = make_controller(tmp_path)
+    port = controller.ser = StopMidRetries()
+    port.controller = controller
+    assert controller.send_serial_command("LOWER_BASKET", retries=3) is False
+    assert port.lines == ["LOWER_BASKET"]
+
+
+class WireListener:
+    """Reads the far end of the pty and timestamps every line on arrival."""
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.lines = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        buffer = b""
+        while True:
+            try:
+                data = os.read(self.fd, 1024)
+            except OSError:
+                return
+            now = time.monotonic()
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            with self.lock:
+                self.lines.extend((now, line.decode(errors="ignore").strip()) for line in lines)
+
+    def since(self, t):
+        with self.lock:
+            return [(ts, line) for ts, line in self.lines if ts >= t]
+
+
+def run_trial(controller, listener, rng):
+    """Keep a worker resending LOWER_BASKET, press stop at a random moment;
+    returns the press-to-wire latency (None if the frame never came) and
+    whatever unsafe command arrived after it."""
+    controller.reset()
+    stop_hammer = threading.Event()
+
+    def hammer():
+        while not stop_hammer.is_set():
+            if not controller.driver.lower_basket():
+                time.sleep(0.05)
+
+    worker = threading.Thread(target=hammer, daemon=True)
+    worker.start()
+    time.sleep(rng.uniform(0.05, 0.3))
+    pressed_at = time.monotonic()
+    controller.emergency_stop(pressed_at=pressed_at)
+    first = controller.driver.stop_commands()[0]
+    arrived = None
+    deadline = time.monotonic() + 2.0
+    while arrived is None and time.monotonic() < deadline:
+        arrived = next((ts for ts, line in listener.since(pressed_at) if line == first), None)
+        time.sleep(0.001)
+    time.sleep(0.2)
+    stop_hammer.set()
+    worker.join(timeout=2)
+    safe = controller.driver.safe_commands()
+    leaked = [line for _, line in listener.since(arrived or pressed_at) if line not in safe]
+    return (arrived - pressed_at if arrived else None), leaked
+
+
+@pytest.mark.parametrize("driver", ["text", "numeric"])
+def test_stop_reaches_the_wire_within_bound(tmp_path, driver):
+    master, slave = os.openpty()
+    port = serial.Serial(os.ttyname(slave), 9600, timeout=0, write_timeout=1)
+    controller = make_controller(tmp_path, transport=port, clock=MonotonicClock(),
+                                 serial={"driver": driver, "command_delay": 0.02})
+    listener = WireListener(master)
+    rng = random.Random(0)
+    try:
+        for _ in range(TRIALS):
+            latency, leaked = run_trial(controller, listener, rng)
+            assert latency is not None, "stop frame never arrived"
+            assert latency * 1000 < BOUND_MS
+            assert leaked == []
+    finally:
+        controller.shutdown()
+        port.close()
+        os.close(master)
@@ -0,0 +1,25 @@
+import json
+
+from clock import VirtualClock
+from forecast import PreheatSchedule
+
+
+def write_schedule(path, temp):
+    windows = [{"weekday": day, "start": 0, "end": 1440, "mode": "preheat", "temp": temp} for day in range(7)]
+    with open(path, "w") as f:
+        json.dump({"windows": windows}, f)
+
+
+def test_schedule_is_rechecked_once_a_minute_of_clock_time(tmp_path):
+    path = tmp_path / "preheat_schedule.json"
+    write_schedule(path, 170)
+    clock = VirtualClock()
+    schedule = PreheatSchedule(str(path), clock)
+    assert schedule.target(clock.wall(), lambda temp: 0) == ("preheat", 170)
+
+    write_schedule(path, 185)
+    schedule.mtime = None  # the rewrite may land within the same mtime tick
+    clock.run_until(30)
+    assert schedule.target(clock.wall(), lambda temp: 0) == ("preheat", 170)
+    clock.run_until(61)
+    assert schedule.target(clock.wall(), lambda temp: 0) == ("preheat", 185)
@@ -0,0 +1,60 @@
+"""Static checks on the GUI, which needs Tk and PIL to import.
+
+The GUI has been split from the controller, and the controller split
+again into a process with a client; an attribute the GUI reads but no
+longer sets, or one it reads off the controller that only one of the two
+controller classes has, only shows up when that screen is opened.
+"""
+import ast
+import os
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def class_node(path, name):
+    with open(os.path.join(HERE, path)) as f:
+        tree = ast.parse(f.read())
+    return next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == name)
+
+
+def self_attributes(cls, ctx):
+    return {node.attr for node in ast.walk(cls)
+            if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+            and node.value.id == "self" and isinstance(node.ctx, ctx)}
+
+
+def defined_attributes(cls):
+    """Methods, class attributes and everything assigned on self."""
+    names = self_attributes(cls, ast.Store)
+    for node in cls.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.Assign):
+            names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+    return names
+
+
+def controller_attributes(gui):
+    """Attributes the GUI reads or sets on self.controller."""
+    return {node.attr for node in ast.walk(gui)
+            if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Attribute)
+            and isinstance(node.value.value, ast.Name) and node.value.value.id == "self"
+            and node.value.attr == "controller"}
+
+
+def test_gui_reads_only_attributes_it_sets():
+    gui = class_node("fryer.py", "SmartFryerGUI")
+    assert self_attributes(gui, ast.Load) - defined_attributes(gui) == set()
+
+
+def test_gui_uses_only_attributes_both_controllers_have():
+    used = controller_attributes(class_node("fryer.py", "SmartFryerGUI"))
+    for path, name in (("controller.py", "FryerController"), ("controlproc.py", "ControllerClient")):
+        assert used - defined_attributes(class_node(path, name)) == set(), name
+
+
+def test_boost_starts_only_when_an_item_is_picked():
+    gui = class_node("fryer.py", "SmartFryerGUI")
+    callers = {method.name for method in gui.body if isinstance(method, ast.FunctionDef)
+               if "order_tapped" in controller_attributes(method)}
+    assert callers == {"custom_settings"}
@@ -0,0 +1,23 @@
+from heaters import HeaterScheduler, PowerBudget, proportional_demand
+
+
+def test_waiting_expires_on_the_callers_clock():
+    budget = PowerBudget(2000, wait_ttl=5.0)
+    assert budget.request("a", 1500, now=100.0)
+    assert not budget.request("b", 1500, now=100.0)
+    assert budget.others_waiting("a", now=104.0)
+    assert not budget.others_waiting("a", now=106.0)
+
+
+def test_elements_take_turns_under_a_tight_budget():
+    scheduler = HeaterScheduler({"H1": 1500, "H2": 1500}, PowerBudget(1500), period=10.0, owner="fryer")
+    assert scheduler.plan(1.0, 0.0) == {"H1": True, "H2": False}
+    assert scheduler.plan(1.0, 5.0) == {"H1": False, "H2": True}
+    assert scheduler.plan(0.0, 6.0) == {"H1": False, "H2": False}
+
+
+def test_proportional_demand():
+    assert proportional_demand(170, 160, 2.0) == 1.0
+    assert proportional_demand(170, 169, 2.0) == 0.5
+    assert proportional_demand(170, 175, 2.0) == 0.0
+    assert proportional_demand(170, 169.9, 0) == 1.0
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+
+from history import CookHistoryStore, CookTracker, throughput_report
+
+HOUR = 3600.0
+
+
+def cook(item, started_at, setpoint=175, planned=180, actual=180, aborted=False):
+    tracker = CookTracker(item, setpoint, planned, now=started_at)
+    tracker.preheat_started(started_at)
+    tracker.preheat_finished(started_at + 30)
+    tracker.basket_lowered(setpoint, started_at + 30)
+    tracker.sample(setpoint - 12, setpoint, started_at + 40)
+    tracker.sample(setpoint - 1, setpoint, started_at + 95)
+    tracker.fried(actual)
+    return tracker.finish(aborted)
+
+
+def test_tracker_measures_the_drop_and_recovery():
+    record = cook("Fries", 0.0)
+    assert record["preheat_time"] == 30
+    assert record["temp_drop"] == 12
+    assert record["recovery_time"] == 65
+
+
+def test_records_round_trip_through_chunks(tmp_path):
+    store = CookHistoryStore(str(tmp_path))
+    store.append([cook("Fries", 1000.0), cook("Wings", 1200.0, aborted=True)])
+    store.append(cook("Fries", 1400.0, actual=190))
+    df = store.load()
+    assert list(df["item"]) == ["Fries", "Wings", "Fries"]
+    assert list(df["aborted"]) == [False, True, False]
+    assert df["actual_time"].iloc[2] == np.float32(190)
+    assert df["started_at"].iloc[0].timestamp() == 1000.0
+
+
+def test_compaction_keeps_every_cook_in_order(tmp_path):
+    store = CookHistoryStore(str(tmp_path), compact_after=3)
+    for index in range(5):
+        store.append(cook(f"Item {index}", 1000.0 + index))
+    assert len(os.listdir(tmp_path)) == 2  # four chunks compacted into one, then one more
+    assert list(store.load()["item"]) == [f"Item {index}" for index in range(5)]
+
+
+def test_empty_store_and_report(tmp_path):
+    df = CookHistoryStore(str(tmp_path)).load()
+    assert df.empty
+    assert throughput_report(df) == {"cooks": 0}
+
+
+def test_throughput_report(tmp_path):
+    store = CookHistoryStore(str(tmp_path))
+    store.append([cook("Fries", 0.0), cook("Fries", 600.0, actual=200), cook("Wings", 1200.0, aborted=True),
+                  cook("Wings", 2 * HOUR)])
+    report = throughput_report(store.load())
+    assert (report["cooks"], report["aborted"]) == (4, 1)
+    assert report["items_per_hour"] == 1.5
+    assert report["peak_items_per_hour"] == 3
+    fries = report["per_item"].loc["Fries"]
+    assert (fries["cooks"], fries["overrun"]) == (2, 10.0)
+    assert list(report["per_item"].index) == ["Fries", "Wings"]
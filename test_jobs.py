@@ -0,0 +1,62 @@
+from clock import VirtualClock
+from jobs import JobManager
+
+
+def fry(token, seconds, log):
+    for second in range(seconds):
+        if token.wait(1.0):
+            return second
+        log.append(second)
+    return seconds
+
+
+def make_jobs():
+    clock = VirtualClock()
+    clock.call_every(0.5, lambda: None)  # the control tick, which wakes waiting workers
+    finished = []
+    return clock, JobManager(clock, on_finish=finished.append), finished
+
+
+def test_one_job_per_lane():
+    clock, jobs, finished = make_jobs()
+    log = []
+    job = jobs.submit(0, "Fries", fry, 3, log)
+    assert jobs.submit(0, "Fries", fry, 3, log) is job  # a double tap
+    assert jobs.submit(0, "Wings", fry, 3, log) is None
+    assert jobs.submit(1, "Wings", fry, 3, []) is not None
+    clock.run_until(10)
+    assert log == [0, 1, 2]
+    assert job.status == "done" and job.result == 3
+    assert jobs.active(0) is None and len(finished) == 2
+    assert jobs.submit(0, "Wings", fry, 1, []) is not None
+
+
+def test_cancel_ends_the_wait_early():
+    clock, jobs, finished = make_jobs()
+    job = jobs.submit(0, "Fries", fry, 100, [])
+    clock.run_until(2.2)
+    assert jobs.cancel(reason="emergency stop") == 1
+    clock.run_until(3.0)
+    assert job.status == "cancelled" and job.result == 2
+    assert job.summary()["reason"] == "emergency stop"
+    assert finished == [job] and jobs.cancel() == 0
+
+
+def test_a_cancelled_job_is_not_rejoined():
+    clock, jobs, finished = make_jobs()
+    job = jobs.submit(0, "Fries", fry, 100, [])
+    clock.run_until(1.0)
+    job.token.cancel()
+    assert jobs.submit(0, "Fries", fry, 100, []) is None
+
+
+def test_a_failing_job_frees_its_lane():
+    clock, jobs, finished = make_jobs()
+
+    def broken(token):
+        raise RuntimeError("basket jammed")
+
+    job = jobs.submit(0, "Fries", broken)
+    clock.run_until(1.0)
+    assert (job.status, job.error) == ("failed", "basket jammed")
+    assert jobs.active(0) is None and finished == [job]
@@ -0,0 +1,43 @@
+import tkinter as tk
+
+import pytest
+
+from keypads import NumericKeypad, OnScreenKeyboard
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    yield root
+    root.destroy()
+
+
+def test_closing_an_overlay_gives_the_keyboard_back(root):
+    keyboard = OnScreenKeyboard(root)
+    panel = tk.Frame(root)
+    panel.pack()
+    entry = tk.Entry(panel)
+    entry.pack()
+    footer = tk.Label(panel)
+    keyboard.show(panel, [entry])
+    footer.pack()
+    prompt = tk.Toplevel(root)
+    password = tk.Entry(prompt)
+    keyboard.show(prompt, [password])
+    assert keyboard.targets == [password]
+    keyboard.hide()
+    prompt.destroy()
+    assert keyboard.targets == [entry]
+    assert panel.pack_slaves() == [entry, keyboard.frame, footer]
+    keyboard.reset()
+    assert keyboard.targets == [] and panel.pack_slaves() == [entry, footer]
+
+
+def test_each_grid_has_its_own_key_feedback(root):
+    keyboard, keypad = OnScreenKeyboard(root), NumericKeypad(root)
+    assert keyboard.tag != keypad.tag
+    for grid in (keyboard, keypad):
+        assert all(key.bindtags()[0] == grid.tag for key in grid.frame.winfo_children())
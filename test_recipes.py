@@ -0,0 +1,48 @@
+import pytest
+
+from recipes import Step, compile_menu, compile_stages, profile_from_stages, stages_from_params, total_time, validate_stage
+
+
+def test_single_stage_item():
+    assert stages_from_params({"temp": 175, "time": 180}) == [{"temp": 175, "time": 180}]
+    assert compile_stages([{"temp": 175, "time": 180}]) == [
+        Step("preheat", 175, 0, ""), Step("lower", 175, 0, ""), Step("fry", 175, 180, ""), Step("raise", 175, 0, ""),
+    ]
+
+
+def test_blanch_rest_and_finish():
+    stages = [{"temp": 150, "time": 240, "rest": 60}, {"temp": 190, "time": 90}]
+    assert [(s.action, s.setpoint, s.duration) for s in compile_stages(stages)] == [
+        ("preheat", 150, 0), ("lower", 150, 0), ("fry", 150, 240), ("raise", 150, 0),
+        ("rest", 190, 60),  # the oil heads for the next stage while the basket is up
+        ("preheat", 190, 0), ("lower", 190, 0), ("fry", 190, 90), ("raise", 190, 0),
+    ]
+    assert compile_stages(stages)[0].label == "Stage 1/2"
+
+
+def test_basket_up_stage_holds_without_lowering():
+    steps = compile_stages([{"temp": 170, "time": 60}, {"temp": 180, "time": 30, "basket": "up"}])
+    assert [s.action for s in steps] == ["preheat", "lower", "fry", "raise", "heat"]
+
+
+def test_validate_stage_normalises_and_bounds():
+    assert validate_stage({"temp": "175", "time": "120", "rest": "0", "basket": "down"}) == {"temp": 175, "time": 120}
+    assert validate_stage({"temp": 175, "time": 120, "basket": "up", "rest": 30}) == {
+        "temp": 175, "time": 120, "rest": 30, "basket": "up"}
+    for bad in ({"temp": 90, "time": 120}, {"temp": 175, "time": 10}, {"temp": 175, "time": 120, "rest": 700},
+                {"temp": 175, "time": 120, "basket": "sideways"}):
+        with pytest.raises(ValueError):
+            validate_stage(bad)
+
+
+def test_profile_round_trip():
+    stages = [{"temp": 150, "time": 240, "rest": 60}, {"temp": 190, "time": 90}]
+    params = profile_from_stages(stages)
+    assert params["time"] == total_time(params) == 390
+    assert stages_from_params(params) == stages
+    assert profile_from_stages([{"temp": 175, "time": 180}]) == {"temp": 175, "time": 180}
+
+
+def test_bad_menu_item_is_skipped():
+    schedules = compile_menu({"Sides": {"Fries": {"temp": 175, "time": 180}, "Broken": {"time": 60}}})
+    assert list(schedules) == [("Sides", "Fries")]
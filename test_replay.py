@@ -0,0 +1,42 @@
+import json
+import os
+
+from config import DEFAULT_CONFIG, merge_config
+from recipes import compile_stages
+from replay import ReplayEngine
+
+
+def session(seconds=120):
+    """Oil settling at 175°C with one 60 s cook started at t=5."""
+    events = [(t * 0.5, "rx", f"Temperature: {min(150 + t, 175)}.0C") for t in range(seconds * 2)]
+    schedule = [list(step) for step in compile_stages([{"temp": 175, "time": 60}])]
+    events.append((5.0, "job", {"item": "Fries", "category": "VEG", "temp": 175, "time": 60,
+                                "schedule": schedule}))
+    return sorted(events, key=lambda event: event[0])
+
+
+def test_replay_leaves_cwd_untouched(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    produced, _ = ReplayEngine(session(), DEFAULT_CONFIG).run()
+    assert produced
+    assert os.listdir(tmp_path) == []
+
+
+def test_replay_ignores_preheat_schedule(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    without, _ = ReplayEngine(session(), DEFAULT_CONFIG).run()
+    # A window covering the whole week, so it is on whenever the replay runs.
+    windows = [{"weekday": day, "start": 0, "end": 1440, "mode": "preheat", "temp": 190} for day in range(7)]
+    with open(DEFAULT_CONFIG["forecast"]["file"], "w") as f:
+        json.dump({"windows": windows}, f)
+    with_schedule, _ = ReplayEngine(session(), DEFAULT_CONFIG).run()
+    assert with_schedule == without
+
+
+def test_replayed_cooks_do_not_learn_golden_curves(tmp_path):
+    engine = ReplayEngine(session(seconds=200), DEFAULT_CONFIG)
+    curves = tmp_path / "golden_curves"
+    engine.play(merge_config(engine.config, {"history": {"dir": str(tmp_path / "cook_history")},
+                                             "conformance": {"dir": str(curves)}}))
+    assert os.listdir(tmp_path / "cook_history")
+    assert os.listdir(curves) == []
@@ -0,0 +1,50 @@
+from config import DEFAULT_CONFIG, merge_config
+from sensors import KalmanFilter, MedianFilter, TemperatureIngest
+
+
+def make_ingest(**overrides):
+    return TemperatureIngest(merge_config(DEFAULT_CONFIG["sensors"], overrides))
+
+
+def test_labels_units_and_positions():
+    ingest = make_ingest()
+    assert ingest.parse_line("OIL:182.4\xb0C T2=201C".encode("latin-1")) == {"oil": 182.4, "element": 201.0}
+    assert ingest.parse_line("182.4 °C".encode()) == {"oil": 182.4}
+    assert ingest.parse_line(b"Temp: 170.0C 250C 21.5C 99C") == {"oil": 170.0, "element": 250.0, "ambient": 21.5}
+    assert ingest.parse_line(b"OK") == {}
+
+
+def test_lines_split_across_chunks():
+    ingest = make_ingest(filter="none")
+    assert ingest.feed(b"OIL:17") == []
+    assert ingest.feed(b"0.5C\r\n\nAMB:2") == [("OIL:170.5C", {"oil": 170.5})]
+    assert ingest.values() == {"oil": 170.5}
+    assert ingest.value("ambient") is None
+
+
+def test_median_filter_drops_a_spike():
+    median = MedianFilter(window=3)
+    assert [median.update(v) for v in (170, 171, 190, 172)] == [170, 170.5, 171, 172]
+
+
+def test_kalman_filter_settles_on_a_constant():
+    kalman = KalmanFilter()
+    assert kalman.update(170.0) == 170.0
+    for _ in range(50):
+        estimate = kalman.update(180.0)
+    assert abs(estimate - 180.0) < 0.5
+
+
+def test_spike_is_rejected_but_a_lasting_step_is_taken_unsmeared():
+    ingest = make_ingest(filter="median", max_rejections=2)
+    ingest.feed(b"OIL:170C\n")
+    ingest.feed(b"OIL:240C\n")
+    assert ingest.value() == 170.0
+    ingest.feed(b"OIL:171C\n")
+    assert ingest.value() == 170.5
+    ingest.feed(b"OIL:100C\nOIL:100C\n")
+    assert ingest.value() == 170.5
+    ingest.feed(b"OIL:100C\n")
+    assert ingest.value() == 100.0
+    ingest.feed(b"OIL:400C\n")
+    assert ingest.channel("oil").rejector.total_rejected == 4
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from config import DEFAULT_CONFIG, merge_config
+from thermalid import ThermalModel, fit_thermal_model, load_model, session_series
+
+TRUE = ThermalModel(tau=600.0, gain=180.0, ambient=25.0, dead_time=8.0, load_rate=0.05)
+
+
+def inputs(seconds=3000):
+    t = np.arange(seconds)
+    power = ((t < 1500) | (t >= 2500)).astype(float)  # preheat, idle cooling, reheat
+    basket = (((t >= 1000) & (t < 1200)) | ((t >= 2000) & (t < 2200))).astype(float)
+    return power, basket
+
+
+def test_fit_recovers_a_synthetic_fryer():
+    power, basket = inputs()
+    temp = TRUE.simulate(25.0, power, basket, 1.0)
+    model = fit_thermal_model([(temp, power, basket)], step=1.0, max_dead_time=20.0)
+    assert model.dead_time == TRUE.dead_time
+    for name in ("tau", "gain", "ambient", "load_rate"):
+        assert getattr(model, name) == pytest.approx(getattr(TRUE, name), rel=1e-3), name
+    assert model.info["temp_rmse"] < 0.01
+
+
+def test_fit_from_a_captured_session():
+    power, basket = inputs()
+    temp = TRUE.simulate(25.0, power, basket, 1.0)
+    events = [(float(t), "rx", f"OIL:{value:.2f}C") for t, value in enumerate(temp)]
+    for t, on in ((0.0, True), (1500.0, False), (2500.0, True)):
+        events += [(t - 0.5, "tx", f"HEATING_{n}_{'ON' if on else 'OFF'}") for n in (1, 2)]
+    for t, lowered in ((1000.0, True), (1200.0, False), (2000.0, True), (2200.0, False)):
+        events.append((t - 0.5, "tx", "LOWER_BASKET" if lowered else "RAISE_BASKET"))
+    events.sort(key=lambda e: e[0])
+    sensors = merge_config(DEFAULT_CONFIG["sensors"], {"filter": "none", "max_step": {"oil": 300.0}})
+    series = session_series(events, sensors, DEFAULT_CONFIG["heaters"]["elements"])
+    assert np.array_equal(series[1], power[:-1]) and np.array_equal(series[2], basket[:-1])
+    model = fit_thermal_model([series], step=1.0, max_dead_time=20.0)
+    assert model.dead_time == TRUE.dead_time
+    assert model.tau == pytest.approx(TRUE.tau, rel=0.02)
+    assert model.steady_state() == pytest.approx(TRUE.steady_state(), rel=0.01)
+
+
+def test_fit_needs_the_heaters_to_switch():
+    temp = np.linspace(25.0, 60.0, 100)
+    with pytest.raises(ValueError):
+        fit_thermal_model([(temp, np.ones(100), np.zeros(100))])
+    with pytest.raises(ValueError):
+        fit_thermal_model([None])
+
+
+def test_model_file_round_trip(tmp_path):
+    path = str(tmp_path / "thermal_model.json")
+    assert load_model(path) is None
+    fitted = ThermalModel(unit="fryer-1", **TRUE.to_dict())
+    fitted.save(path)
+    model = load_model(path)
+    assert model.to_dict() == fitted.to_dict() and model.info == {"unit": "fryer-1"}
+    assert model.time_to_reach(25.0, 175.0) == pytest.approx(8.0 + 600.0 * np.log(180.0 / 30.0))
+    assert model.time_to_reach(25.0, 210.0) is None
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert load_model(path) is None
@@ -0,0 +1,237 @@
+"""Fit a thermal model of this fryer to recorded serial sessions.
+
+    python thermalid.py session.jsonl [more.jsonl ...] [--output thermal_model.json]
+
+Sessions are the timestamped captures written when serial.capture_file is
+set: they hold both the temperature lines and the heater/basket commands.
+Each session is resampled onto a uniform grid and one least-squares fit
+runs over all of them for every candidate dead time; the best fit is
+written where the controller loads it (thermal_model.file).
+
+The model is first order plus dead time, with a load term for each basket
+that is down:
+
+    dT/dt = (ambient - T + gain * u(t - dead_time)) / tau - load_rate * baskets
+
+u is the fraction of element power switched on. A useful session has the
+heaters both on and off for a while, e.g. a preheat followed by some idle
+cooling.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import socket
+import sys
+import time
+
+import numpy as np
+
+from captures import load_session
+from config import load_config
+from drivers import DRIVERS
+from sensors import TemperatureIngest
+
+log = logging.getLogger(__name__)
+
+
+class ThermalModel:
+    """Fitted per-unit parameters; times are in seconds, temperatures in °C."""
+
+    def __init__(self, tau, gain, ambient, dead_time=0.0, load_rate=0.0, **info):
+        self.tau = tau
+        self.gain = gain
+        self.ambient = ambient
+        self.dead_time = dead_time
+        self.load_rate = load_rate
+        self.info = info
+
+    def steady_state(self, power=1.0):
+        """Where the oil settles with this fraction of element power on."""
+        return self.ambient + self.gain * power
+
+    def time_to_reach(self, temp, target, power=1.0, dead_time=None):
+        """Seconds to heat from temp to target at constant power, or None if
+        that power can't get there. dead_time defaults to the model's, for
+        heaters that have only just come on."""
+        if temp >= target:
+            return 0.0
+        final = self.steady_state(power)
+        if final <= target:
+            return None
+        dead_time = self.dead_time if dead_time is None else dead_time
+        return dead_time + self.tau * math.log((final - temp) / (final - target))
+
+    def simulate(self, start_temp, power, basket, step):
+        """Temperature trace for input arrays sampled every step seconds."""
+        delay = int(round(self.dead_time / step))
+        delayed = np.concatenate([np.zeros(delay), power])[:len(power)]
+        temps = np.empty(len(power))
+        temp = start_temp
+        for k in range(len(power)):
+            temps[k] = temp
+            temp += step * ((self.ambient - temp + self.gain * delayed[k]) / self.tau
+                            - self.load_rate * basket[k])
+        return temps
+
+    def to_dict(self):
+        return dict(self.info, tau=self.tau, gain=self.gain, ambient=self.ambient,
+                    dead_time=self.dead_time, load_rate=self.load_rate)
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+        os.replace(tmp, path)
+
+
+def load_model(path):
+    """The model fitted for this unit, or None when there isn't one yet."""
+    try:
+        with open(path, "r") as f:
+            return ThermalModel(**json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError) as e:
+        log.warning("Ignoring unreadable thermal model %s: %s", path, e)
+        return None
+
+
+def command_table(elements, baskets=1):
+    """Command -> ("heater", element, on) / ("all_off",) / ("basket", index, lowered),
+    across every driver dialect; captures only hold what was on the wire."""
+    table = {}
+    for driver_class in DRIVERS.values():
+        driver = driver_class(None, baskets=baskets)
+        for element, (on, off) in driver.heater_commands.items():
+            if element in elements:
+                table[on] = ("heater", element, True)
+                table[off] = ("heater", element, False)
+        if driver.all_off_command:
+            table[driver.all_off_command] = ("all_off",)
+        for command, (basket, position) in driver.basket_lookup.items():
+            table[command] = ("basket", basket, position == "lowered")
+    return table
+
+
+def session_series(events, sensor_config, elements, step=1.0, baskets=1):
+    """Resample one session onto a uniform grid.
+
+    Returns (temp, power, baskets) arrays, or None when the session has too
+    few temperature readings. Temperatures are interpolated between
+    readings; heater power and the number of baskets down hold their last
+    command.
+    """
+    ingest = TemperatureIngest(sensor_config)
+    table = command_table(elements, baskets)
+    total_watts = float(sum(elements.values()))
+    heaters = {element: False for element in elements}
+    lowered = set()
+    temp_times, temps = [], []
+    switch_times, powers, loads = [-math.inf], [0.0], [0.0]
+    for t, kind, value in events:
+        if kind == "rx":
+            ingest.feed(value.encode("utf-8") + b"\n")
+            oil = ingest.value("oil")
+            if oil is not None:
+                temp_times.append(t)
+                temps.append(oil)
+        elif kind == "tx" and value in table:
+            action = table[value]
+            if action[0] == "heater":
+                heaters[action[1]] = action[2]
+            elif action[0] == "all_off":
+                heaters = dict.fromkeys(heaters, False)
+            elif action[2]:
+                lowered.add(action[1])
+            else:
+                lowered.discard(action[1])
+            switch_times.append(t)
+            powers.append(sum(elements[e] for e, on in heaters.items() if on) / total_watts)
+            loads.append(float(len(lowered)))
+    if len(temps) < 3:
+        return None
+    grid = np.arange(temp_times[0], temp_times[-1], step)
+    held = np.searchsorted(np.array(switch_times), grid, side="right") - 1
+    return (np.interp(grid, temp_times, temps), np.array(powers)[held], np.array(loads)[held])
+
+
+def fit_thermal_model(series, step=1.0, max_dead_time=30.0):
+    """Least-squares fit over every session at each candidate dead time.
+
+    For a given delay the model is linear in its coefficients,
+        dT/dt = c0 + c1 * T + c2 * u(t - delay) + c3 * baskets,
+    so each candidate is one lstsq over the stacked sessions; the delay
+    with the smallest residual wins.
+    """
+    series = [s for s in series if s is not None and len(s[0]) > 2]
+    if not series:
+        raise ValueError("no session has enough temperature readings")
+    if not any(np.ptp(power) > 0 for _, power, _ in series):
+        raise ValueError("the heaters never switched in these sessions")
+    best = None
+    for delay in range(int(max_dead_time / step) + 1):
+        rows, targets = [], []
+        for temp, power, basket in series:
+            if len(temp) <= delay + 1:
+                continue
+            rate = np.diff(temp) / step
+            k = np.arange(delay, len(temp) - 1)
+            rows.append(np.column_stack([np.ones(len(k)), temp[k], power[k - delay], basket[k]]))
+            targets.append(rate[k])
+        if not rows:
+            break
+        X = np.concatenate(rows)
+        y = np.concatenate(targets)
+        coef = np.linalg.lstsq(X, y, rcond=None)[0]
+        rmse = float(np.sqrt(np.mean((X @ coef - y) ** 2)))
+        if best is None or rmse < best[0]:
+            best = (rmse, delay, coef, len(y))
+    rmse, delay, (c0, c1, c2, c3), samples = best
+    if c1 >= 0:
+        raise ValueError("no cooling trend in the data; record a session where the oil cools with the heaters off")
+    tau = -1.0 / c1
+    model = ThermalModel(tau=float(tau), gain=float(c2 * tau), ambient=float(-c0 / c1),
+                         dead_time=float(delay * step), load_rate=float(-c3))
+    simulated = np.concatenate([model.simulate(temp[0], power, basket, step) - temp
+                                for temp, power, basket in series])
+    model.info = {"rate_rmse": rmse, "temp_rmse": float(np.sqrt(np.mean(simulated ** 2))),
+                  "samples": samples, "sessions": len(series)}
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit a thermal model to recorded fryer sessions")
+    parser.add_argument("sessions", nargs="+", help="timestamped session captures (serial.capture_file)")
+    parser.add_argument("--config", default="fryer_config.json")
+    parser.add_argument("--output", help="model file (default: thermal_model.file from the config)")
+    parser.add_argument("--step", type=float, help="resampling interval in seconds")
+    parser.add_argument("--max-dead-time", type=float, help="longest dead time to try, in seconds")
+    parser.add_argument("--unit", default=socket.gethostname(), help="unit name stored with the model")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    model_config = config["thermal_model"]
+    step = args.step or model_config["resample"]
+    max_dead_time = args.max_dead_time if args.max_dead_time is not None else model_config["max_dead_time"]
+    elements = config["heaters"]["elements"]
+    series = [session_series(load_session(path), config["sensors"], elements, step, config["baskets"]["count"])
+              for path in args.sessions]
+    try:
+        model = fit_thermal_model(series, step, max_dead_time)
+    except ValueError as e:
+        print(f"Cannot fit a thermal model: {e}")
+        return 1
+    model.info.update(unit=args.unit, fitted_at=time.time())
+    output = args.output or model_config["file"]
+    model.save(output)
+    print(f"tau {model.tau:.0f}s  gain {model.gain:.1f}°C  ambient {model.ambient:.1f}°C  "
+          f"dead time {model.dead_time:.0f}s  load {model.load_rate:.3f}°C/s")
+    print(f"Full power settles at {model.steady_state():.0f}°C; fit error {model.info['temp_rmse']:.2f}°C rms "
+          f"over {model.info['samples']} samples -> {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import tkinter as tk
+
+SWIPE_TAG = "MenuSwipe"
+
+
+class SwipeScroller:
+    """Drag-to-scroll with inertia for a horizontal canvas strip.
+
+    Every widget on the strip carries the SWIPE_TAG bindtag, placed before
+    its class bindings. A press only becomes a drag once the finger has
+    moved swipe_threshold pixels, which keeps the jitter of a resistive
+    panel from turning taps into drags; a drag that started on a button
+    swallows the release so the button doesn't fire. On release the strip
+    keeps gliding with the finger's speed, decaying each frame, stepped at
+    a fixed frame_rate on the Tk scheduler. Scrolling only moves the canvas
+    view; the cards are never re-laid out.
+    """
+
+    def __init__(self, canvas, scheduler, config, on_scroll=None):
+        self.canvas = canvas
+        self.scheduler = scheduler
+        self.threshold = config["swipe_threshold"]
+        self.frame = 1.0 / config["frame_rate"]
+        self.decay = config["swipe_decay"]
+        self.min_speed = config["min_fling_speed"]
+        self.on_scroll = on_scroll
+        self.press_x = 0
+        self.press_offset = 0.0
+        self.dragging = False
+        self.samples = []
+        self.velocity = 0.0
+        self.glide_job = None
+        self.last_frame = None
+        canvas.bind_class(SWIPE_TAG, "<ButtonPress-1>", self.on_press)
+        canvas.bind_class(SWIPE_TAG, "<B1-Motion>", self.on_motion)
+        canvas.bind_class(SWIPE_TAG, "<ButtonRelease-1>", self.on_release)
+        self.attach(canvas)
+
+    def attach(self, widget):
+        """Make widget and everything inside it draggable."""
+        tags = widget.bindtags()
+        if SWIPE_TAG not in tags:
+            widget.bindtags(tags[:1] + (SWIPE_TAG,) + tags[1:])
+        for child in widget.winfo_children():
+            self.attach(child)
+
+    def offset(self):
+        return self.canvas.canvasx(0)
+
+    def max_offset(self):
+        bbox = self.canvas.bbox("all")
+        return max((bbox[2] if bbox else 0) - self.canvas.winfo_width(), 0)
+
+    def scroll_to(self, offset):
+        """Move the view so its left edge is offset pixels into the strip; returns the clamped offset."""
+        bbox = self.canvas.bbox("all")
+        total = bbox[2] if bbox else 0
+        offset = min(max(offset, 0), self.max_offset())
+        if total:
+            self.canvas.xview_moveto(offset / total)
+        if self.on_scroll:
+            self.on_scroll(offset)
+        return offset
+
+    def on_press(self, event):
+        self.stop()
+        self.press_x = event.x_root
+        self.press_offset = self.offset()
+        self.dragging = False
+        self.samples = [(event.time, event.x_root)]
+
+    def on_motion(self, event):
+        dx = event.x_root - self.press_x
+        if not self.dragging and abs(dx) < self.threshold:
+            return None
+        self.dragging = True
+        self.scroll_to(self.press_offset - dx)
+        self.samples.append((event.time, event.x_root))
+        # Speed comes from the last ~100 ms of movement, smoothing touch noise.
+        while len(self.samples) > 2 and event.time - self.samples[0][0] > 100:
+            self.samples.pop(0)
+        return "break"
+
+    def on_release(self, event):
+        if not self.dragging:
+            return None
+        self.dragging = False
+        if isinstance(event.widget, tk.Button):
+            event.widget.config(relief=tk.RAISED)
+        (t0, x0), (t1, x1) = self.samples[0], self.samples[-1]
+        if t1 > t0 and event.time - t1 < 100:
+            self.velocity = -(x1 - x0) * 1000.0 / (t1 - t0)
+            if abs(self.velocity) >= self.min_speed:
+                self.last_frame = self.scheduler.clock.now()
+                self.glide_job = self.scheduler.call_every(self.frame, self.glide)
+        return "break"
+
+    def glide(self):
+        if not self.canvas.winfo_exists():
+            self.stop()
+            return
+        now = self.scheduler.clock.now()
+        dt, self.last_frame = now - self.last_frame, now
+        target = self.offset() + self.velocity * dt
+        self.velocity *= self.decay ** dt
+        if self.scroll_to(target) != target or abs(self.velocity) < self.min_speed / 4:
+            self.stop()
+
+    def stop(self):
+        if self.glide_job is not None:
+            self.scheduler.cancel(self.glide_job)
+            self.glide_job = None
+        self.velocity = 0.0